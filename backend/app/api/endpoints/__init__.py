@@ -1,5 +1,7 @@
 from .rooms import router as rooms_router
 from .players import router as players_router
 from .game import router as game_router
+from .history import router as history_router
+from .matchmaking import router as matchmaking_router
 
-__all__ = ["rooms_router", "players_router", "game_router"]
\ No newline at end of file
+__all__ = ["rooms_router", "players_router", "game_router", "history_router", "matchmaking_router"]
@@ -1,16 +1,38 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from app.services.room_service import room_service
+from app.services.game_service import game_service
+from app.services.phase_service import phase_manager
 
 router = APIRouter()
 
-# Endpoints básicos para el juego
-@router.post("/start")
-async def start_game():
-    return {"message": "Juego iniciado - placeholder"}
+@router.post("/{room_code}/start")
+async def start_game(room_code: str):
+    """Iniciar el juego en una sala"""
+    room_code = room_code.upper()
+    print(f"🎯 [API] Solicitando inicio de juego para sala: {room_code}")
+    
+    if not room_service.get_room(room_code):
+        raise HTTPException(status_code=404, detail="Sala no encontrada")
+    
+    try:
+        await phase_manager.begin_game(room_code)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return {
+        "success": True,
+        "message": "Juego iniciado",
+        "room": room_service.get_room(room_code).dict()
+    }
 
 @router.get("/state/{room_code}")
 async def get_game_state(room_code: str):
-    return {"room_code": room_code, "state": "waiting", "message": "Estado del juego"}
-
-@router.post("/{room_code}/vote")
-async def cast_vote(room_code: str):
-    return {"room_code": room_code, "message": "Voto registrado - placeholder"}
\ No newline at end of file
+    """Estado completo del juego para sincronización"""
+    game_state = await game_service.get_game_state(room_code.upper())
+    if not game_state:
+        raise HTTPException(status_code=404, detail="Sala no encontrada")
+    
+    return {
+        "success": True,
+        "gameState": game_state
+    }
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+import asyncio
+from app.services.history_service import history_service
+
+router = APIRouter()
+
+@router.get("/games")
+async def list_game_history(limit: int = 20, offset: int = 0, room_code: Optional[str] = None):
+    """Listar partidas terminadas (más recientes primero)"""
+    try:
+        games = await asyncio.to_thread(
+            history_service.list_games, min(limit, 100), offset, room_code.upper() if room_code else None
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        "success": True,
+        "count": len(games),
+        "games": games
+    }
+
+@router.get("/games/{game_id}")
+async def get_game_history(game_id: str):
+    """Detalle de una partida con sus rondas, votos y respuestas"""
+    try:
+        game = await asyncio.to_thread(history_service.get_game, game_id)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not game:
+        raise HTTPException(status_code=404, detail="Partida no encontrada")
+    
+    return {
+        "success": True,
+        "game": game
+    }
@@ -0,0 +1,71 @@
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.services.matchmaking_service import matchmaking_service
+from app.services.connection_manager import manager
+from app.services.admission_service import admission
+
+router = APIRouter()
+
+class MatchmakingJoin(BaseModel):
+    player_name: str
+
+def _enqueue(player_name: str):
+    try:
+        return matchmaking_service.enqueue(player_name)
+    except OverflowError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+@router.post("/join")
+async def join_queue(data: MatchmakingJoin):
+    """Entrar en la cola de partida rápida (consultar el ticket hasta que esté 'matched')"""
+    admission.admit_room()
+    ticket = _enqueue(data.player_name)
+    print(f"🎯 [MATCHMAKING] {data.player_name} en cola ({matchmaking_service.queued} esperando)")
+    return JSONResponse({"success": True, **ticket.to_dict()})
+
+@router.get("/{ticket_id}")
+async def get_ticket(ticket_id: str):
+    """Estado de un ticket: queued, matched (con room_code y player_id) o cancelled"""
+    ticket = matchmaking_service.get_ticket(ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket no encontrado")
+    return JSONResponse({"success": True, **ticket.to_dict()})
+
+@router.delete("/{ticket_id}")
+async def leave_queue(ticket_id: str):
+    """Salir de la cola"""
+    if not matchmaking_service.cancel(ticket_id):
+        raise HTTPException(status_code=404, detail="Ticket no encontrado o ya resuelto")
+    return JSONResponse({"success": True, "ticket_id": ticket_id, "status": "cancelled"})
+
+@router.websocket("/ws")
+async def matchmaking_ws(websocket: WebSocket, player_name: str):
+    """Cola por WebSocket: recibe 'match_found' en cuanto se forma la sala y se cierra"""
+    if not await admission.admit_socket(websocket, "matchmaking"):
+        return
+    await websocket.accept()
+    if matchmaking_service.queued >= matchmaking_service.max_queue:
+        await websocket.close(code=1013, reason="Cola llena")
+        return
+
+    ticket = matchmaking_service.enqueue(player_name)
+
+    async def notify(data: dict):
+        await manager.send_personal(websocket, {"type": "match_found", **data})
+        await websocket.close()
+
+    ticket.notify = notify
+    await manager.send_personal(websocket, {"type": "queued", **ticket.to_dict()})
+
+    try:
+        # El cliente no necesita mandar nada; solo se escucha para detectar la desconexión
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"❌ [MATCHMAKING] WebSocket error: {e}")
+    finally:
+        matchmaking_service.cancel(ticket.id)
@@ -1,36 +1,84 @@
 # backend/app/api/endpoints/players.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+import random
 from app.services.football_api import football_api_service
+from app.core.catalog import card_catalog
+from app.services.search_index import player_index, SEARCH_FIELDS
 
 router = APIRouter()
 
+@router.get("/football/players")
+async def get_football_players():
+    """Obtener jugadores de fútbol REALES de The Sports DB"""
+    players = await football_api_service.get_players()
+    return {
+        "success": True,
+        "count": len(players),
+        "players": players
+    }
+
+@router.get("/football/players/random")
+async def get_random_players(count: int = 10):
+    """Obtener jugadores aleatorios"""
+    cards = await football_api_service.get_card_indices()
+    selected_players = [card_catalog.card(i) for i in random.sample(cards, min(count, len(cards)))]
+    
+    return {
+        "success": True,
+        "count": len(selected_players),
+        "players": selected_players
+    }
+
+@router.get("/football/players/{player_id}")
+async def get_football_player(player_id: str):
+    """Carta completa de un jugador, con la biografía (se pide a la API solo al consultarla)"""
+    card = card_catalog.card_by_id(player_id)
+    if card is None:
+        raise HTTPException(status_code=404, detail="Jugador no encontrado en el catálogo")
+    
+    card["description"] = await football_api_service.get_player_description(player_id)
+    return {
+        "success": True,
+        "player": card
+    }
+
 @router.get("/players/popular")
 async def get_popular_players():
-    """Obtener jugadores populares para el juego"""
-    try:
-        players = await football_api_service.get_popular_players_for_game()
-        
-        if not players:
-            raise HTTPException(
-                status_code=404, 
-                detail="No se pudieron cargar jugadores"
-            )
-        
-        return {
-            "success": True,
-            "count": len(players),
-            "players": players
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Error obteniendo jugadores: {str(e)}"
-        )
+    """Obtener jugadores populares para el juego (con respaldo si la API falla)"""
+    players = await football_api_service.get_players()
+    
+    return {
+        "success": True,
+        "count": len(players),
+        "players": players
+    }
+
+@router.get("/players/search")
+async def search_players(q: str, field: Optional[str] = None, limit: int = Query(20, ge=1, le=100)):
+    """Búsqueda local (sin red) por nombre, equipo, nacionalidad o posición; tolera tildes y erratas"""
+    if field is not None and field not in SEARCH_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Campo no válido, usa uno de: {', '.join(SEARCH_FIELDS)}")
+    
+    players = player_index.search(q, fields=(field,) if field else None, limit=limit)
+    return {
+        "success": True,
+        "count": len(players),
+        "players": players
+    }
 
 @router.get("/players/search/{team_name}")
 async def search_players_by_team(team_name: str):
-    """Buscar jugadores por nombre de equipo"""
+    """Buscar jugadores por nombre de equipo (índice local; la API solo si el equipo no está en el catálogo)"""
+    local = player_index.search(team_name, fields=("team",), limit=100)
+    if local:
+        return {
+            "success": True,
+            "team": local[0]["team"],
+            "count": len(local),
+            "players": local
+        }
+    
     try:
         teams = await football_api_service.search_teams(team_name)
         
@@ -41,21 +89,10 @@ async def search_players_by_team(team_name: str):
                 "players": []
             }
         
-        # Obtener jugadores del primer equipo encontrado
+        # Obtener jugadores del primer equipo encontrado (y dejarlos indexados)
         team_id = teams[0]["idTeam"]
         players = await football_api_service.get_team_players(team_id)
-        
-        formatted_players = []
-        for player in players:
-            if player.get("strPlayer"):
-                formatted_players.append({
-                    "id": player.get("idPlayer"),
-                    "name": player.get("strPlayer"),
-                    "team": player.get("strTeam"),
-                    "position": player.get("strPosition", "Jugador"),
-                    "nationality": player.get("strNationality", "Desconocida"),
-                    "thumb": player.get("strThumb")
-                })
+        formatted_players = football_api_service.index_players(players)
         
         return {
             "success": True,
@@ -68,4 +105,4 @@ async def search_players_by_team(team_name: str):
         raise HTTPException(
             status_code=500, 
             detail=f"Error buscando jugadores: {str(e)}"
-        )
\ No newline at end of file
+        )
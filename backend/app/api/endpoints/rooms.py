@@ -1,54 +1,86 @@
-from fastapi import APIRouter, HTTPException
-from app.models.room import Room, RoomCreate, RoomJoin
-from app.services.room_service import RoomService
-import random
-import string
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from app.models.room import RoomCreate, RoomJoin
+from app.services.room_service import room_service
+from app.services.connection_manager import manager
+from app.services.lobby_service import lobby_index
+from app.services.admission_service import admission
 
 router = APIRouter()
-room_service = RoomService()
 
-@router.post("/create", response_model=dict)
+# Las respuestas ya son dicts JSON-serializables (room.dict()), así que se devuelven
+# como JSONResponse para saltarse el jsonable_encoder recursivo de FastAPI
+
+@router.get("")
+async def list_rooms(offset: int = Query(0, ge=0), limit: int = Query(20, ge=1, le=50)):
+    """Listado paginado de salas abiertas (esperando jugadores y con plazas libres)"""
+    return JSONResponse({"success": True, **lobby_index.page(offset, limit)})
+
+@router.post("/create")
 async def create_room(room_data: RoomCreate):
     """Crear una nueva sala de juego"""
-    try:
-        # Generar código único de 6 caracteres
-        code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-        
-        # Crear sala
-        room = await room_service.create_room(code, room_data)
-        
-        return {
-            "success": True,
-            "room_code": code,
-            "message": f"Sala {code} creada exitosamente"
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    admission.admit_room()
+    code = room_service.generate_code()
+    room = await room_service.create_room(code, room_data)
+    
+    print(f"✅ [API] Sala creada: {code} por {room_data.player_name}")
+    
+    return JSONResponse({
+        "success": True,
+        "room_code": code,
+        "message": f"Sala {code} creada exitosamente",
+        "room": room.dict(),
+        "player_id": room.players[0].id
+    })
 
-@router.post("/join", response_model=dict)
+@router.post("/join")
 async def join_room(join_data: RoomJoin):
     """Unirse a una sala existente"""
-    room = room_service.get_room(join_data.room_code)
+    room_code = join_data.room_code.upper()
+    room = room_service.get_room(room_code)
     if not room:
         raise HTTPException(status_code=404, detail="Sala no encontrada")
     
+    if room.game_started:
+        raise HTTPException(status_code=400, detail="El juego ya comenzó en esta sala")
+    
     if len(room.players) >= room.max_players:
         raise HTTPException(status_code=400, detail="Sala llena")
     
+    # Verificar si el nombre ya existe
+    if any(player.name.lower() == join_data.player_name.lower() for player in room.players):
+        raise HTTPException(status_code=400, detail="Nombre ya existe en la sala")
+    
     # Agregar jugador a la sala
-    await room_service.add_player(join_data.room_code, join_data.player_name)
+    new_player = await room_service.add_player(room_code, join_data.player_name)
+    
+    print(f"✅ [API] {join_data.player_name} se unió a la sala {room_code}")
+    
+    room_data = room.dict()
+    
+    # Notificar a todos via WebSocket
+    await manager.broadcast_to_room(room_code, {
+        "type": "player_joined",
+        "message": f"{join_data.player_name} se unió a la sala",
+        "room": room_data,
+        "player": new_player.dict()
+    })
     
-    return {
+    return JSONResponse({
         "success": True,
-        "room": room.dict(),
-        "message": f"{join_data.player_name} se unió a la sala"
-    }
+        "room": room_data,
+        "player_id": new_player.id,
+        "message": f"Te uniste a la sala {room_code}"
+    })
 
 @router.get("/{room_code}")
 async def get_room(room_code: str):
     """Obtener información de una sala"""
-    room = room_service.get_room(room_code)
+    room = room_service.get_room(room_code.upper())
     if not room:
         raise HTTPException(status_code=404, detail="Sala no encontrada")
     
-    return room
\ No newline at end of file
+    return JSONResponse({
+        "success": True,
+        "room": room.dict()
+    })
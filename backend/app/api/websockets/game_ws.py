@@ -1,78 +1,62 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from typing import Dict, List
+from datetime import datetime
 import json
-import asyncio
 import time
 
+from app.core.rate_limit import ConnectionLimiter
 from app.services.room_service import room_service
 from app.services.game_service import game_service
+from app.services.connection_manager import manager
+from app.services.phase_service import phase_manager
+from app.services.chat_service import chat_service
+from app.services.spectator_service import spectator_feed
+from app.services.admission_service import admission
 
 router = APIRouter()
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, room_code: str):
-        await websocket.accept()
-
-        if room_code not in self.active_connections:
-            self.active_connections[room_code] = []
-
-        self.active_connections[room_code].append(websocket)
-        print(f"🔗 Cliente conectado en sala {room_code} ({len(self.active_connections[room_code])} jugadores).")
-
-        # Enviar estado actual de la sala al conectar
-        room = room_service.get_room(room_code)
-        await self.broadcast_to_room(room_code, {
-            "type": "player_joined",
-            "message": "Nuevo jugador conectado",
-            "room": room.dict() if room else None
-        })
-
-    def disconnect(self, websocket: WebSocket, room_code: str):
-        if room_code in self.active_connections:
-            try:
-                self.active_connections[room_code].remove(websocket)
-            except:
-                pass
-
-            if len(self.active_connections[room_code]) == 0:
-                del self.active_connections[room_code]
-
-        print(f"🔌 Cliente desconectado en sala {room_code}")
-
-    async def send_personal(self, websocket: WebSocket, message: dict):
-        try:
-            await websocket.send_json(message)
-        except:
-            pass
-
-    async def broadcast_to_room(self, room_code: str, message: dict):
-        if room_code not in self.active_connections:
-            return
-
-        disconnected = []
-        for ws in self.active_connections[room_code]:
-            try:
-                await ws.send_json(message)
-            except:
-                disconnected.append(ws)
-
-        # Limpiar desconectados
-        for ws in disconnected:
-            self.disconnect(ws, room_code)
-
-manager = ConnectionManager()
 
 @router.websocket("/ws/{room_code}")
-async def websocket_endpoint(websocket: WebSocket, room_code: str):
+async def websocket_endpoint(websocket: WebSocket, room_code: str, spectator: bool = False):
+    room_code = room_code.upper()
+    if not await admission.admit_socket(websocket, "spectators" if spectator else "sockets", room_code):
+        return
+    if spectator:
+        await spectator_endpoint(websocket, room_code)
+        return
+
     await manager.connect(websocket, room_code)
+    limiter = ConnectionLimiter()
+
+    # Los que llegan tarde o se reconectan reciben la última página del chat
+    history = chat_service.get_page(room_code)
+    if history["messages"]:
+        await manager.send_personal(websocket, {"type": "chat_history", **history})
 
     try:
         while True:
             raw_data = await websocket.receive_text()
-            message = json.loads(raw_data)
+            manager.touch(websocket)
+            
+            # Rechazo barato antes de parsear JSON
+            rejection = limiter.check(raw_data)
+            if rejection:
+                if not limiter.notified:
+                    limiter.notified = True
+                    await manager.send_personal(websocket, {"type": "error", "code": rejection, "message": "Demasiados mensajes"})
+                continue
+            
+            try:
+                message = json.loads(raw_data)
+            except json.JSONDecodeError:
+                await manager.send_personal(websocket, {"type": "error", "message": "Mensaje JSON inválido"})
+                continue
+            
+            # Claves "type" duplicadas: json.loads se queda con la última
+            if not isinstance(message, dict) or message.get("type") != limiter.last_type:
+                continue
+            player_id = message.get("player_id") or message.get("playerId")
+            if isinstance(player_id, str):
+                manager.touch(websocket, player_id)
             await handle_message(room_code, message, websocket)
 
     except WebSocketDisconnect:
@@ -83,6 +67,32 @@ async def websocket_endpoint(websocket: WebSocket, room_code: str):
             "message": "Un jugador ha salido de la sala",
             "room": room.dict() if room else None
         })
+    except Exception as e:
+        print(f"❌ [WS] WebSocket error en {room_code}: {e}")
+        manager.disconnect(websocket, room_code)
+
+async def spectator_endpoint(websocket: WebSocket, room_code: str):
+    """Espectador (?spectator=true): solo recibe spectator_update, lo que envíe se ignora"""
+    room = room_service.get_room(room_code)
+    if not await spectator_feed.connect(websocket, room_code, room.dict() if room else None):
+        return
+
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        print(f"❌ [WS] WebSocket error de espectador en {room_code}: {e}")
+    finally:
+        spectator_feed.disconnect(websocket, room_code)
+
+async def send_errors(websocket: WebSocket, events) -> bool:
+    """Mandar al jugador los errores del motor; True si el comando fue rechazado"""
+    errors = [e for e in events if e["type"] == "error"]
+    for error in errors:
+        await manager.send_personal(websocket, {"type": "error", "message": error["message"]})
+    return bool(errors)
 
 # ============================
 # 👥 PLAYER JOIN/LEAVE
@@ -124,22 +134,13 @@ async def handle_player_leave(room_code: str, message: dict, websocket: WebSocke
 
 async def handle_start_game(room_code: str, message: dict, websocket: WebSocket):
     player_id = message.get("playerId") or message.get("player_id")
-    room = room_service.get_room(room_code)
     
     print(f"🎮 Start game by: {player_id}")
     
-    if not room:
-        await manager.send_personal(websocket, {"type": "error", "message": "Sala no existe"})
-        return
-
-    game_data = await game_service.start_game(room_code)
-
-    await manager.broadcast_to_room(room_code, {
-        "type": "game_started",
-        "message": "El juego ha comenzado",
-        "gameState": game_data,
-        "currentPhase": "role_assignment"
-    })
+    try:
+        await phase_manager.begin_game(room_code)
+    except ValueError as e:
+        await manager.send_personal(websocket, {"type": "error", "message": str(e)})
 
 # ============================
 # 📝 ANSWER SUBMIT
@@ -148,16 +149,29 @@ async def handle_start_game(room_code: str, message: dict, websocket: WebSocket)
 async def handle_submit_answer(room_code: str, message: dict, websocket: WebSocket):
     player_id = message.get("playerId") or message.get("player_id")
     answer = message.get("answer")
-    round_id = message.get("roundId")
+    if answer is not None and not isinstance(answer, str):
+        answer = str(answer)  # un número o un objeto no debe llegar a la corrección ni al análisis
+    round_id = message.get("roundId") or message.get("round_id")
+    question_id = message.get("questionId") or message.get("question_id")
 
-    await game_service.save_player_answer(room_code, player_id, round_id, answer)
+    events, correct = await game_service.submit_answer(room_code, player_id, question_id, answer, round_id=round_id)
+    if await send_errors(websocket, events):
+        return
+    if correct is not None:
+        # La corrección solo la ve quien responde: al resto le daría pistas sobre su carta
+        await manager.send_personal(websocket, {"type": "answer_graded", "roundId": round_id, "correct": correct})
 
+    # Nombres de evento y campos que espera el cliente (useWebSocket.ts)
+    submitted = next(e for e in events if e["type"] == "player_answer")
+    room = room_service.get_room(room_code)
     await manager.broadcast_to_room(room_code, {
-        "type": "player_answer",
+        "type": "answer_submitted",
+        "player_id": player_id,
         "playerId": player_id,
         "answer": answer,
         "roundId": round_id,
-        "allAnswersReceived": await game_service.all_answers_received(room_code)
+        "allAnswersReceived": submitted["all_answers_received"],
+        "room": room.dict() if room else None
     })
 
 # ============================
@@ -165,49 +179,27 @@ async def handle_submit_answer(room_code: str, message: dict, websocket: WebSock
 # ============================
 
 async def handle_cast_vote(room_code: str, message: dict, websocket: WebSocket):
-    player_id = message.get("playerId") or message.get("player_id")
-    voted_player_id = message.get("votedPlayerId") or message.get("voted_player_id")
-    round_id = message.get("roundId")
+    player_id = message.get("playerId") or message.get("player_id") or message.get("voter_id")
+    voted_player_id = message.get("votedPlayerId") or message.get("voted_player_id") or message.get("voted_id")
+    round_id = message.get("roundId") or message.get("round_id")
 
-    success = await game_service.cast_vote(room_code, player_id, voted_player_id)
-    
-    if not success:
-        await manager.send_personal(websocket, {
-            "type": "error", 
-            "message": "Error procesando voto"
-        })
+    events = await game_service.cast_vote(room_code, player_id, voted_player_id)
+    if await send_errors(websocket, events):
         return
 
-    current_votes = game_service.get_current_votes(room_code)
-    all_votes_received = await game_service.all_votes_received(room_code)
-
+    # Con todos los votos el motor ya resolvió la votación: los votos de la ronda van en el resultado
+    result = next((e for e in events if e["type"] == "voting_complete"), None)
     await manager.broadcast_to_room(room_code, {
         "type": "vote_submitted",
         "playerId": player_id,
         "votedPlayerId": voted_player_id,
         "roundId": round_id,
-        "currentVotes": current_votes,
-        "allVotesReceived": all_votes_received
+        "currentVotes": dict(result["votes"]) if result else game_service.get_current_votes(room_code),
+        "allVotesReceived": result is not None
     })
 
-    # ✅ SOLO avanzar si TODOS han votado
-    if all_votes_received:
-        print("🗳️ Todos han votado, calculando resultados...")
-        result = await game_service.calculate_voting_result(room_code)
-        
-        # ✅ ELIMINAR AL JUGADO VOTADO
-        if result.get("eliminated_player"):
-            eliminated_id = result["eliminated_player"]["id"]
-            await game_service.eliminate_player(room_code, eliminated_id)
-
-        await manager.broadcast_to_room(room_code, {
-            "type": "voting_complete",
-            "votingResults": result.get("results", []),
-            "eliminatedPlayer": result.get("eliminated_player"),
-            "wasImpostor": result.get("was_impostor", False),
-            "nextPhase": "results",
-            "room": room_service.get_room(room_code).dict()  # ✅ Enviar room actualizado
-        })
+    # voting_complete y el paso a results
+    await phase_manager.publish(room_code, events)
 
 # ============================
 # 💬 CHAT
@@ -215,15 +207,25 @@ async def handle_cast_vote(room_code: str, message: dict, websocket: WebSocket):
 
 async def handle_chat_message(room_code: str, message: dict, websocket: WebSocket):
     player_id = message.get("playerId") or message.get("player_id")
+    player_name = message.get("playerName") or message.get("player_name")
     chat_message = message.get("message")
-    
-    print(f"💬 Chat message from {player_id}: {chat_message}")
-    
-    await manager.broadcast_to_room(room_code, {
-        "type": "chat_message",
-        "playerId": player_id,
-        "message": chat_message,
-        "timestamp": time.time()
+    if not isinstance(chat_message, str) or not chat_message.strip():
+        return
+
+    entry = chat_service.add_message(room_code, player_id, player_name, chat_message)
+    await manager.broadcast_to_room(room_code, {"type": "chat_message", **entry})
+
+async def handle_chat_history(room_code: str, message: dict, websocket: WebSocket):
+    """Página de historial anterior a `before` (id del mensaje más antiguo que ya tiene el cliente)"""
+    before = message.get("before")
+    limit = message.get("limit")
+    await manager.send_personal(websocket, {
+        "type": "chat_history",
+        **chat_service.get_page(
+            room_code,
+            before if isinstance(before, int) else None,
+            limit if isinstance(limit, int) else None
+        )
     })
 
 # ============================
@@ -236,8 +238,6 @@ async def handle_player_ready(room_code: str, message: dict, websocket: WebSocke
     is_ready = message.get("is_ready", True)
     phase = message.get("phase")
     
-    print(f"🎯 Player {player_id} ready for phase {phase}. Data: {message}")
-
     if not player_id or not phase:
         await manager.send_personal(websocket, {
             "type": "error", 
@@ -245,61 +245,28 @@ async def handle_player_ready(room_code: str, message: dict, websocket: WebSocke
         })
         return
 
-    # Marcar jugador como listo en esta fase
-    success = await game_service.mark_player_ready(room_code, player_id, phase, is_ready)
-    
-    if not success:
-        await manager.send_personal(websocket, {
-            "type": "error", 
-            "message": "Error marcando jugador como listo"
-        })
-        return
-
-    # Obtener estado actualizado
+    # Marcar jugador como listo en esta fase; con todos listos el motor pasa a la siguiente
+    events = await game_service.mark_player_ready(room_code, player_id, phase, is_ready)
     room = room_service.get_room(room_code)
     if not room:
         return
 
-    # ✅ ACTUALIZAR EL PLAYER EN EL ROOM
-    for player in room.players:
-        if player.id == player_id:
-            player.is_ready = is_ready
-            break
-
     # Notificar a todos que un jugador está listo
+    marked = next((e for e in events if e["type"] == "player_ready"), None)
     await manager.broadcast_to_room(room_code, {
-        "type": "player_ready_update",
+        "type": "player_ready",
+        "player_id": player_id,
         "playerId": player_id,
         "phase": phase,
+        "is_ready": is_ready,
         "isReady": is_ready,
-        "readyPlayers": await game_service.get_ready_players(room_code, phase),
+        "readyPlayers": marked["ready_players"] if marked else game_service.get_ready_players(room_code, phase),
         "totalPlayers": len(room.players),
         "room": room.dict()
     })
 
-    # ✅ VERIFICAR SI TODOS ESTÁN LISTOS PARA AVANZAR FASE
-    all_ready = await game_service.all_players_ready(room_code, phase)
-    
-    if all_ready:
-        print(f"🚀 Todos listos en fase {phase}, avanzando...")
-        
-        # Avanzar a la siguiente fase
-        next_phase_data = await game_service.advance_game_phase(room_code)
-        
-        if next_phase_data:
-            # ✅ ACTUALIZAR EL ROOM con la nueva fase
-            room.current_phase = next_phase_data.get("current_phase")
-            room.current_round = next_phase_data.get("current_round", room.current_round)
-            
-            await manager.broadcast_to_room(room_code, {
-                "type": "phase_advanced",
-                "previousPhase": phase,
-                "currentPhase": next_phase_data.get("current_phase"),
-                "currentRound": next_phase_data.get("current_round"),
-                "message": f"Avanzando a {next_phase_data.get('current_phase')}",
-                "room": room.dict(),  # ✅ Room ACTUALIZADO
-                "gameState": next_phase_data
-            })
+    # phase_changed lleva el room y gameState actualizados
+    await phase_manager.publish(room_code, events)
 
 # ============================
 # 🔄 SYNC HANDLERS
@@ -333,37 +300,45 @@ async def handle_get_game_state(room_code: str, message: dict, websocket: WebSoc
         "gameState": game_state
     })
 
+# ============================
+# 💓 HEARTBEAT
+# ============================
+
+async def handle_pong(room_code: str, message: dict, websocket: WebSocket):
+    # El latido ya quedó registrado al recibir el mensaje
+    pass
+
 # ============================================================
 # 🎯 HANDLER PRINCIPAL - DEBE IR AL FINAL
 # ============================================================
 
+HANDLERS = {
+    # 👥 Jugadores
+    "player_join": handle_player_join,
+    "player_leave": handle_player_leave,
+    "player_ready": handle_player_ready,
+    
+    # 🎮 Juego (incluye los nombres del protocolo antiguo de main.py)
+    "game_start": handle_start_game,
+    "start_game": handle_start_game,
+    "player_answer": handle_submit_answer,
+    "submit_answer": handle_submit_answer,
+    "player_vote": handle_cast_vote,
+    "submit_vote": handle_cast_vote,
+    
+    # 💬 Chat
+    "chat_message": handle_chat_message,
+    "chat_history": handle_chat_history,
+    
+    # 🔄 Sincronización
+    "pong": handle_pong,
+    "sync_game_state": handle_sync_game_state,
+    "get_game_state": handle_get_game_state
+}
+
 async def handle_message(room_code: str, message: dict, websocket: WebSocket):
     msg_type = message.get("type")
-    
-    # ✅ DEBUG MEJORADO
-    print(f"📨 Mensaje recibido - Tipo: {msg_type}, Room: {room_code}")
-    print(f"📨 Datos completos: {message}")
-
-    handlers = {
-        # 👥 Jugadores
-        "player_join": handle_player_join,
-        "player_leave": handle_player_leave,
-        "player_ready": handle_player_ready,
-        
-        # 🎮 Juego
-        "game_start": handle_start_game,
-        "player_answer": handle_submit_answer,
-        "player_vote": handle_cast_vote,
-        
-        # 💬 Chat
-        "chat_message": handle_chat_message,
-        
-        # 🔄 Sincronización
-        "sync_game_state": handle_sync_game_state,
-        "get_game_state": handle_get_game_state
-    }
-
-    handler = handlers.get(msg_type)
+    handler = HANDLERS.get(msg_type)
 
     if handler:
         await handler(room_code, message, websocket)
@@ -0,0 +1,143 @@
+# backend/app/cluster.py
+# Modo multi-proceso: N workers (uno por shard de salas) + router frontal
+#
+#   python -m app.cluster --workers 4 --port 10000
+#
+# Cada worker es un uvicorn normal de app.main escuchando en un socket Unix.
+# El router (app/router.py) envía cada sala siempre al mismo worker, así que
+# el estado en memoria de cada sala vive en un único proceso y no hace falta broker.
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import uvicorn
+
+from app.core.config import settings
+from app.core.sharding import shard_socket_path
+from app.router import ShardRouter, misrouted_paths
+
+
+def spawn_workers(count: int, socket_dir: str) -> list:
+    """Lanzar un proceso uvicorn por shard"""
+    os.makedirs(socket_dir, exist_ok=True)
+    workers = []
+
+    for index in range(count):
+        path = shard_socket_path(index, socket_dir)
+        if os.path.exists(path):
+            os.remove(path)
+
+        env = {
+            **os.environ,
+            "SHARD_INDEX": str(index),
+            "SHARD_COUNT": str(count),
+            "SHARD_SOCKET_DIR": socket_dir,
+        }
+        workers.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--uds", path, "--ws-max-size", "65536"],
+            env=env,
+        ))
+        print(f"🧩 [CLUSTER] Worker {index} lanzado (pid {workers[-1].pid}) en {path}")
+
+    return workers
+
+
+def wait_for_sockets(paths: list, timeout: float = 30.0):
+    """Esperar a que todos los workers estén escuchando"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if all(os.path.exists(path) for path in paths):
+            return
+        time.sleep(0.1)
+    missing = [path for path in paths if not os.path.exists(path)]
+    raise RuntimeError(f"Workers sin arrancar: {missing}")
+
+
+def stop_workers(workers: list):
+    for worker in workers:
+        if worker.poll() is None:
+            worker.send_signal(signal.SIGTERM)
+    for worker in workers:
+        try:
+            worker.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+
+class RouterShutdown:
+    """SIGTERM en modo cluster (redeploy de Render): relevo de los workers antes que el router.
+
+    La señal llega al router. Si su uvicorn se apagara primero, cortaría los
+    WebSockets de los clientes con un 1012 pelado antes de llegar a
+    stop_workers(), y el relevo de cada worker (server_moving con su retraso
+    de reconexión) no le llegaría a nadie. Por eso el router engancha SIGTERM:
+    primero para los workers, cuyos mensajes y cierres pasan por el proxy, luego
+    espera a que se cierren los sockets reenviados y solo entonces se relanza
+    con SIGINT el apagado normal de uvicorn, como ShutdownCoordinator.
+    """
+
+    def __init__(self, router: ShardRouter, workers: list, drain_timeout: float = 5.0):
+        self.router = router
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self._task = None
+
+    def install(self):
+        """Anteponerse al handler de SIGTERM de uvicorn (desde el arranque del lifespan del router)"""
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Windows: sin relevo, stop_workers() al salir
+
+    def _on_sigterm(self):
+        if self._task is not None:
+            return  # relevo ya en marcha
+        print("🛑 [CLUSTER] SIGTERM recibido, relevando workers antes que el router")
+        self._task = asyncio.get_running_loop().create_task(self._handoff_then_exit())
+
+    async def _handoff_then_exit(self):
+        try:
+            await asyncio.to_thread(stop_workers, self.workers)
+            if not await self.router.drain_websockets(self.drain_timeout):
+                print(f"⚠️ [CLUSTER] {self.router.open_websockets} WebSockets seguían abiertos al salir")
+        finally:
+            signal.raise_signal(signal.SIGINT)  # devolver el control al apagado de uvicorn
+
+
+def check_routes():
+    """Toda ruta de sala de la app debe enrutarse por su código, o su sala acabaría en otro shard"""
+    from app.main import app
+
+    misrouted = misrouted_paths([route.path for route in app.routes])
+    if misrouted:
+        raise RuntimeError(f"Rutas de sala sin patrón en app/router.py: {misrouted}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor del juego con shards por sala")
+    parser.add_argument("--workers", type=int, default=max(settings.SHARD_COUNT, os.cpu_count() or 1))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "10000")))
+    parser.add_argument("--socket-dir", default=settings.SHARD_SOCKET_DIR)
+    args = parser.parse_args()
+
+    check_routes()
+    workers = spawn_workers(args.workers, args.socket_dir)
+    paths = [shard_socket_path(i, args.socket_dir) for i in range(args.workers)]
+
+    try:
+        wait_for_sockets(paths)
+        print(f"🚀 [CLUSTER] Router escuchando en {args.host}:{args.port} con {args.workers} shards")
+        router = ShardRouter(paths)
+        router.on_startup = [RouterShutdown(router, workers).install]
+        uvicorn.run(router, host=args.host, port=args.port, lifespan="on")
+    finally:
+        stop_workers(workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+from array import array
+from typing import Dict, List, Optional
+import sys
+
+
+class StringTable:
+    """Tabla de strings internadas: cada valor distinto se guarda una vez y se referencia por índice"""
+
+    __slots__ = ("values", "_lookup")
+
+    def __init__(self):
+        self.values: List[Optional[str]] = [None]  # 0 = sin valor
+        self._lookup: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if not value:
+            return 0
+        index = self._lookup.get(value)
+        if index is None:
+            index = self._lookup[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return index
+
+    def __getitem__(self, index: int) -> Optional[str]:
+        return self.values[index]
+
+
+class CardCatalog:
+    """Catálogo de cartas en columnas, solo-añadir.
+
+    Cada carta es una posición en arrays paralelos: equipo, nacionalidad,
+    posición y lugar de nacimiento son índices a tablas internadas, y la foto se
+    guarda como (prefijo internado, nombre de fichero). Las descripciones largas
+    no se guardan: se piden a la API cuando alguien las necesita.
+
+    Los índices son estables durante toda la vida del proceso (un refresco
+    actualiza o añade, nunca borra), así que salas y partidas guardan el índice
+    de su carta y el dict completo solo se construye al enviarlo por la red.
+    """
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.birth_dates: List[str] = []
+        self.thumb_files: List[Optional[str]] = []
+        # "I" (32 bits): la tabla de strings es compartida y pasa de 65535 valores con lugares y prefijos
+        self.teams = array("I")
+        self.nationalities = array("I")
+        self.positions = array("I")
+        self.birth_places = array("I")
+        self.thumb_prefixes = array("I")
+        self.strings = StringTable()  # equipos, nacionalidades, posiciones, lugares y prefijos de URL
+        self._by_id: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def index_of(self, card_id) -> Optional[int]:
+        return self._by_id.get(str(card_id))
+
+    def add(self, card: Dict) -> int:
+        """Añadir o actualizar una carta (dict con el formato de FootballAPIService.format_player)"""
+        card_id = str(card.get("id") or "")
+        thumb = card.get("thumb") or ""
+        prefix, _, filename = thumb.rpartition("/")
+        columns = (
+            self.strings.add(card.get("team")),
+            self.strings.add(card.get("nationality")),
+            self.strings.add(card.get("position")),
+            self.strings.add(card.get("birth_place")),
+            self.strings.add(prefix + "/" if thumb else None),
+        )
+
+        index = self._by_id.get(card_id)
+        if index is None:
+            index = self._by_id[card_id] = len(self.ids)
+            self.ids.append(sys.intern(card_id))
+            self.names.append(card.get("name") or "")
+            self.birth_dates.append(card.get("birth_date") or "")
+            self.thumb_files.append(filename or None)
+            for column, value in zip(self._columns(), columns):
+                column.append(value)
+        else:
+            self.names[index] = card.get("name") or ""
+            self.birth_dates[index] = card.get("birth_date") or ""
+            self.thumb_files[index] = filename or None
+            for column, value in zip(self._columns(), columns):
+                column[index] = value
+        return index
+
+    def _columns(self):
+        return (self.teams, self.nationalities, self.positions, self.birth_places, self.thumb_prefixes)
+
+    def card(self, index: int) -> Dict:
+        """Materializar la carta completa para enviarla (sin descripción)"""
+        strings = self.strings
+        thumb_file = self.thumb_files[index]
+        return {
+            "id": self.ids[index],
+            "name": self.names[index],
+            "team": strings[self.teams[index]],
+            "position": strings[self.positions[index]],
+            "nationality": strings[self.nationalities[index]],
+            "thumb": strings[self.thumb_prefixes[index]] + thumb_file if thumb_file else None,
+            "birth_date": self.birth_dates[index],
+            "birth_place": strings[self.birth_places[index]]
+        }
+
+    def card_by_id(self, card_id) -> Optional[Dict]:
+        index = self.index_of(card_id)
+        return self.card(index) if index is not None else None
+
+    def resolve(self, value) -> Optional[int]:
+        """Índice de carta a partir de un índice, o de un dict (p. ej. uno restaurado de un checkpoint)"""
+        if value is None or isinstance(value, int):
+            return value
+        if isinstance(value, dict) and value.get("id"):
+            return self.add(value)
+        return None
+
+    def memory_bytes(self) -> int:
+        """Tamaño aproximado de las columnas (sin contar las strings internadas compartidas)"""
+        lists = (self.ids, self.names, self.birth_dates, self.thumb_files)
+        total = sum(sys.getsizeof(column) for column in lists + self._columns())
+        total += sum(sys.getsizeof(value) for column in lists for value in column if value)
+        return total + sum(sys.getsizeof(value) for value in self.strings.values if value)
+
+# Instancia global compartida por todas las salas
+card_catalog = CardCatalog()
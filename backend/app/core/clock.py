@@ -0,0 +1,87 @@
+import asyncio
+import heapq
+import time
+from typing import List, Optional, Tuple
+
+
+class RealClock:
+    """Reloj de producción: hora del sistema y asyncio.sleep"""
+
+    def now(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, delay: float):
+        await asyncio.sleep(delay)
+
+
+class VirtualClock:
+    """Reloj simulado para pruebas y simulaciones.
+
+    `sleep` no espera de verdad: deja la corrutina aparcada hasta que alguien
+    avanza el reloj. `advance()` salta directamente al siguiente vencimiento,
+    despierta a quien tocaba y deja correr el loop hasta que se estabiliza, así
+    que una partida de varias rondas con sus timers reales dura milisegundos.
+    """
+
+    def __init__(self, start: Optional[float] = None):
+        self._now = time.time() if start is None else start
+        self._sleepers: List[Tuple[float, int, asyncio.Future]] = []
+        self._seq = 0
+
+    def now(self) -> float:
+        return self._now
+
+    def monotonic(self) -> float:
+        return self._now
+
+    async def sleep(self, delay: float):
+        if delay <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._seq += 1
+        heapq.heappush(self._sleepers, (self._now + delay, self._seq, future))
+        await future
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for _, _, future in self._sleepers if not future.done())
+
+    async def settle(self, rounds: int = 20):
+        """Ceder el loop varias veces para que las tareas despertadas terminen su trabajo"""
+        for _ in range(rounds):
+            await asyncio.sleep(0)
+
+    async def advance(self, seconds: Optional[float] = None) -> bool:
+        """Avanzar `seconds` (o hasta el siguiente vencimiento); False si no había nada esperando"""
+        await self.settle()
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)  # sleeps cancelados
+        if seconds is None:
+            if not self._sleepers:
+                return False
+            target = self._sleepers[0][0]
+        else:
+            target = self._now + seconds
+
+        self._now = max(self._now, target)
+        while self._sleepers and self._sleepers[0][0] <= self._now:
+            _, _, future = heapq.heappop(self._sleepers)
+            if not future.done():
+                future.set_result(None)
+        await self.settle()
+        return True
+
+    async def run_until_idle(self, max_steps: int = 100000) -> int:
+        """Saltar de vencimiento en vencimiento hasta que no quede nadie durmiendo"""
+        steps = 0
+        while steps < max_steps and await self.advance():
+            steps += 1
+        return steps
+
+
+# Reloj por defecto del proceso
+real_clock = RealClock()
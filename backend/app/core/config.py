@@ -7,6 +7,39 @@ class Settings:
     # API Football
     API_FOOTBALL_KEY: str = os.getenv("API_FOOTBALL_KEY", "")
     API_FOOTBALL_HOST: str = "api-football-v1.p.rapidapi.com"
+    # TheSportsDB (apuntar a scripts/mock_sportsdb.py para pruebas de carga sin red)
+    SPORTSDB_BASE_URL: str = os.getenv("SPORTSDB_BASE_URL", "https://www.thesportsdb.com/api/v1/json")
+    SPORTSDB_API_KEY: str = os.getenv("SPORTSDB_API_KEY", "1")  # Clave gratuita
+    # Catálogo de jugadores cacheado (segundos)
+    CATALOG_TTL: float = float(os.getenv("CATALOG_TTL", "3600"))
+    CATALOG_FALLBACK_TTL: float = float(os.getenv("CATALOG_FALLBACK_TTL", "60"))
+    # Ingesta del catálogo por ligas completas
+    CATALOG_LEAGUES: list = [l.strip() for l in os.getenv(
+        "CATALOG_LEAGUES",
+        "English Premier League,Spanish La Liga,German Bundesliga,Italian Serie A,French Ligue 1"
+    ).split(",") if l.strip()]
+    CATALOG_INGEST_WORKERS: int = int(os.getenv("CATALOG_INGEST_WORKERS", "4"))
+    CATALOG_MAX_PLAYERS: int = int(os.getenv("CATALOG_MAX_PLAYERS", "5000"))
+    CATALOG_DESCRIPTION_CACHE: int = int(os.getenv("CATALOG_DESCRIPTION_CACHE", "256"))
+    # No repetir cartas en partidas sucesivas de la misma sala hasta agotar el catálogo
+    DEAL_NO_REPEAT: bool = os.getenv("DEAL_NO_REPEAT", "true").lower() == "true"
+    # Salas con al menos este número de respuestas se analizan en el pool de hilos
+    ANSWER_ANALYSIS_THREAD_MIN: int = int(os.getenv("ANSWER_ANALYSIS_THREAD_MIN", "8"))
+    # Mínimos para señalar una respuesta atípica: diferencia de parecido con el resto y desviaciones
+    ANSWER_OUTLIER_MIN_MARGIN: float = float(os.getenv("ANSWER_OUTLIER_MIN_MARGIN", "0.25"))
+    ANSWER_OUTLIER_MIN_GAP: float = float(os.getenv("ANSWER_OUTLIER_MIN_GAP", "1.5"))
+    # Peticiones simultáneas máximas por host de la API externa
+    UPSTREAM_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "4"))
+    # Resiliencia frente a la API externa
+    UPSTREAM_TIMEOUT: float = float(os.getenv("UPSTREAM_TIMEOUT", "3.0"))
+    UPSTREAM_MAX_RETRIES: int = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+    UPSTREAM_RETRY_BASE: float = float(os.getenv("UPSTREAM_RETRY_BASE", "0.2"))
+    UPSTREAM_RETRY_RATIO: float = float(os.getenv("UPSTREAM_RETRY_RATIO", "0.2"))  # reintentos por llamada
+    UPSTREAM_HEDGE_AFTER: float = float(os.getenv("UPSTREAM_HEDGE_AFTER", "0"))  # 0 = sin hedge
+    UPSTREAM_BREAKER_FAILURES: int = int(os.getenv("UPSTREAM_BREAKER_FAILURES", "5"))
+    UPSTREAM_BREAKER_RESET: float = float(os.getenv("UPSTREAM_BREAKER_RESET", "30"))
+    # Lo máximo que espera una partida al catálogo antes de usar caché o fallback
+    CATALOG_SLO: float = float(os.getenv("CATALOG_SLO", "2.0"))
     
     # Database (por ahora en memoria, luego PostgreSQL)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
@@ -15,5 +48,67 @@ class Settings:
     MAX_PLAYERS: int = 15
     MIN_PLAYERS: int = 4
     DEFAULT_ROUNDS: int = 5
+    
+    # Sharding (modo multi-proceso, ver app/cluster.py)
+    SHARD_COUNT: int = int(os.getenv("SHARD_COUNT", "1"))
+    SHARD_INDEX: int = int(os.getenv("SHARD_INDEX", "0"))
+    SHARD_SOCKET_DIR: str = os.getenv("SHARD_SOCKET_DIR", "/tmp/impostor-shards")
+    
+    # Checkpoints de salas (journal append-only para reinicio en caliente)
+    CHECKPOINT_DIR: str = os.getenv("CHECKPOINT_DIR", "./checkpoints")
+    CHECKPOINT_INTERVAL: float = float(os.getenv("CHECKPOINT_INTERVAL", "2.0"))
+    
+    # Límites de entrada WebSocket (por conexión)
+    WS_MAX_FRAME_BYTES: int = int(os.getenv("WS_MAX_FRAME_BYTES", "8192"))
+    WS_RATE_PER_SECOND: float = float(os.getenv("WS_RATE_PER_SECOND", "10"))
+    WS_RATE_BURST: float = float(os.getenv("WS_RATE_BURST", "20"))
+    # tipo de mensaje -> (tokens por segundo, ráfaga)
+    WS_TYPE_RATE_LIMITS: dict = {
+        "chat_message": (float(os.getenv("WS_CHAT_RATE", "2")), float(os.getenv("WS_CHAT_BURST", "5"))),
+        "player_ready": (float(os.getenv("WS_READY_RATE", "2")), float(os.getenv("WS_READY_BURST", "4"))),
+        "sync_game_state": (1.0, 3.0),
+        "get_game_state": (1.0, 3.0),
+        "chat_history": (2.0, 5.0),
+    }
+    
+    # Historial de chat por sala (ring buffer en memoria)
+    CHAT_HISTORY_SIZE: int = int(os.getenv("CHAT_HISTORY_SIZE", "200"))
+    CHAT_HISTORY_MAX_BYTES: int = int(os.getenv("CHAT_HISTORY_MAX_BYTES", "65536"))
+    CHAT_MESSAGE_MAX_CHARS: int = int(os.getenv("CHAT_MESSAGE_MAX_CHARS", "500"))
+    CHAT_PAGE_SIZE: int = int(os.getenv("CHAT_PAGE_SIZE", "50"))
+    
+    # Espectadores (vista redactada y diferida)
+    SPECTATOR_DELAY: float = float(os.getenv("SPECTATOR_DELAY", "2.0"))
+    SPECTATOR_MAX_PER_ROOM: int = int(os.getenv("SPECTATOR_MAX_PER_ROOM", "500"))
+    SPECTATOR_MAX_STACKED: int = 20  # eventos acumulables por tipo en cada envío
+    
+    # Partida rápida (cola de matchmaking)
+    MATCHMAKING_ROOM_SIZE: int = int(os.getenv("MATCHMAKING_ROOM_SIZE", "6"))
+    MATCHMAKING_MIN_PLAYERS: int = int(os.getenv("MATCHMAKING_MIN_PLAYERS", str(MIN_PLAYERS)))
+    MATCHMAKING_MAX_WAIT: float = float(os.getenv("MATCHMAKING_MAX_WAIT", "15"))
+    MATCHMAKING_INTERVAL: float = float(os.getenv("MATCHMAKING_INTERVAL", "0.5"))
+    MATCHMAKING_MAX_QUEUE: int = int(os.getenv("MATCHMAKING_MAX_QUEUE", "10000"))
+    
+    # Latido WebSocket: ping a los sockets callados, cierre de los que no responden
+    HEARTBEAT_INTERVAL: float = float(os.getenv("HEARTBEAT_INTERVAL", "5"))
+    HEARTBEAT_TIMEOUT: float = float(os.getenv("HEARTBEAT_TIMEOUT", "15"))
+    HEARTBEAT_SEND_TIMEOUT: float = 1.0
+    
+    # Apagado ordenado (SIGTERM): plazo para drenar broadcasts y ventana de reconexión de los clientes
+    SHUTDOWN_DRAIN_TIMEOUT: float = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "5"))
+    SHUTDOWN_RECONNECT_MIN_MS: int = int(os.getenv("SHUTDOWN_RECONNECT_MIN_MS", "1000"))
+    SHUTDOWN_RECONNECT_MAX_MS: int = int(os.getenv("SHUTDOWN_RECONNECT_MAX_MS", "15000"))
+    
+    # Salas abandonadas (sin ningún socket): se desalojan tras este tiempo esperando jugadores o ya terminadas
+    ROOM_IDLE_TTL: float = float(os.getenv("ROOM_IDLE_TTL", "600"))
+    ROOM_FINISHED_TTL: float = float(os.getenv("ROOM_FINISHED_TTL", "120"))
+    ROOM_SWEEP_INTERVAL: float = float(os.getenv("ROOM_SWEEP_INTERVAL", "30"))
+    
+    # Control de admisión: por encima de estos límites se rechazan salas y sockets nuevos
+    ADMISSION_MAX_CONNECTIONS: int = int(os.getenv("ADMISSION_MAX_CONNECTIONS", "5000"))
+    ADMISSION_MAX_ROOMS: int = int(os.getenv("ADMISSION_MAX_ROOMS", "2000"))
+    ADMISSION_MAX_LOOP_LAG: float = float(os.getenv("ADMISSION_MAX_LOOP_LAG", "0.25"))
+    ADMISSION_LAG_INTERVAL: float = float(os.getenv("ADMISSION_LAG_INTERVAL", "0.5"))
+    ADMISSION_RETRY_AFTER: int = int(os.getenv("ADMISSION_RETRY_AFTER", "5"))
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
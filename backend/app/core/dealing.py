@@ -0,0 +1,58 @@
+from typing import List, Optional, Sequence
+import random
+
+
+class CardDealer:
+    """Reparto de cartas de una sala sobre el catálogo compartido.
+
+    `deal` elige k cartas distintas de una secuencia inmutable (la tupla de
+    índices del catálogo) por muestreo con rechazo: cuesta O(k) y no copia ni
+    baraja el catálogo. Cada sala tiene su propio RNG (reproducible con `seed`)
+    y, con `no_repeat`, recuerda lo ya repartido para no repetir cartas entre
+    partidas; cuando no quedan suficientes cartas nuevas empieza otro ciclo.
+    """
+
+    def __init__(self, seed: Optional[int] = None, no_repeat: bool = True):
+        self.rng = random.Random(seed)
+        self.no_repeat = no_repeat
+        self.dealt = set()  # cartas ya repartidas en este ciclo (siempre dentro del último pool)
+        self._pool: Optional[Sequence[int]] = None
+
+    def _sync_pool(self, pool: Sequence[int]):
+        """Quitar de lo repartido las cartas que ya no están en el pool (el catálogo se refresca)"""
+        if pool is not self._pool:
+            self._pool = pool
+            if self.dealt:
+                self.dealt &= set(pool)  # O(n), solo la primera partida tras un refresco
+
+    def deal(self, pool: Sequence[int], k: int) -> List[int]:
+        size = len(pool)
+        k = min(k, size)
+        if self.no_repeat:
+            self._sync_pool(pool)
+            if size - len(self.dealt) < k:
+                self.dealt.clear()
+        excluded = self.dealt if self.no_repeat else ()
+        free = size - len(excluded)
+
+        # Con `free` cartas libres, cada intento acierta con probabilidad (free - elegidas) / size,
+        # así que el muestreo con rechazo cuesta como mucho k·size/(free - k) intentos. Eso es
+        # menos que recorrer el pool entero (size) justo cuando free > 2k: por debajo se recorre.
+        if free < 2 * k:
+            cards = self.rng.sample([card for card in pool if card not in excluded], k)
+        else:
+            chosen = set()
+            cards = []
+            while len(cards) < k:
+                card = pool[self.rng.randrange(size)]
+                if card in chosen or card in excluded:
+                    continue
+                chosen.add(card)
+                cards.append(card)
+
+        if self.no_repeat:
+            self.dealt.update(cards)
+        return cards
+
+    def choice(self, items: Sequence):
+        return self.rng.choice(items)
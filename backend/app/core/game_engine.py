@@ -0,0 +1,213 @@
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+import random
+
+# Reglas de la partida como máquina de estados pura y síncrona: sin red, sin timers, sin prints.
+# apply(estado, comando) -> (estado nuevo, eventos). El estado es inmutable (los dicts no se
+# modifican nunca, se sustituyen), así que un snapshot es guardar la referencia y una partida
+# se reproduce exactamente volviendo a aplicar su lista de comandos.
+# GameService aplica los comandos a cada sala y PhaseManager traduce los eventos a mensajes y timers.
+
+PHASE_DURATIONS = {
+    "role_assignment": 10,
+    "question": 30,
+    "debate": 60,
+    "voting": 30,
+    "results": 15,
+}
+NEXT_PHASE = {
+    "role_assignment": "question",
+    "question": "debate",
+    "debate": "voting",
+    "voting": "results",
+}
+
+
+class EngineState(NamedTuple):
+    phase: str = "waiting"
+    round: int = 0
+    total_rounds: int = 5
+    players: Tuple[str, ...] = ()  # en orden de llegada
+    names: Dict[str, str] = {}
+    alive: FrozenSet[str] = frozenset()
+    impostor_id: Optional[str] = None
+    cards: Dict[str, int] = {}  # player_id -> índice en card_catalog
+    ready: FrozenSet[str] = frozenset()
+    answers: Dict[str, str] = {}  # respuestas de la ronda en curso
+    votes: Dict[str, str] = {}  # votos de la ronda en curso
+    deadline: Optional[float] = None  # fin de la fase en curso
+    winner: Optional[str] = None
+    version: int = 0  # comandos aplicados
+
+    def to_dict(self) -> Dict:
+        data = self._asdict()
+        data.update(players=list(self.players), alive=sorted(self.alive), ready=sorted(self.ready))
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EngineState":
+        data = dict(data)
+        data.update(players=tuple(data.get("players", ())), alive=frozenset(data.get("alive", ())),
+                    ready=frozenset(data.get("ready", ())))
+        return cls(**data)
+
+
+def _error(command: Dict, message: str) -> List[Dict]:
+    return [{"type": "error", "to": command.get("player_id"), "message": message}]
+
+
+def _enter(state: EngineState, phase: str, now: float, durations: Dict[str, float]):
+    """Entrar en una fase: limpia los listos y fija el vencimiento"""
+    previous = state.phase
+    state = state._replace(phase=phase, ready=frozenset(),
+                           deadline=now + durations[phase] if phase in durations else None)
+    return state, [{"type": "phase_changed", "phase": phase, "previous": previous, "round": state.round,
+                    "deadline": state.deadline}]
+
+
+def _finish(state: EngineState) -> Optional[str]:
+    """Ganador si la partida terminó: sin impostor ganan los jugadores; con él vivo y en mayoría, o sin rondas, el impostor"""
+    impostor_alive = state.impostor_id in state.alive
+    players_alive = len(state.alive) - impostor_alive
+    if not impostor_alive:
+        return "players"
+    if impostor_alive >= players_alive or state.round >= state.total_rounds:
+        return "impostor"
+    return None
+
+
+def _resolve_votes(state: EngineState):
+    """Eliminar al más votado (el primero en llegar a ese número si hay empate)"""
+    count: Dict[str, int] = {}
+    for voted in state.votes.values():
+        if voted:
+            count[voted] = count.get(voted, 0) + 1
+    eliminated = max(count, key=count.get) if count else None
+    alive = state.alive - {eliminated} if eliminated else state.alive
+    event = {
+        "type": "voting_complete",
+        "round": state.round,
+        "votes": state.votes,
+        "vote_count": count,
+        "eliminated_id": eliminated,
+        "was_impostor": eliminated is not None and eliminated == state.impostor_id,
+    }
+    return state._replace(alive=alive, votes={}), [event]
+
+
+def _advance(state: EngineState, now: float, durations: Dict[str, float]):
+    """Pasar a la fase siguiente; desde results se decide entre otra ronda o el final"""
+    events: List[Dict] = []
+    if state.phase == "voting":
+        state, events = _resolve_votes(state)
+
+    if state.phase == "results":
+        winner = _finish(state)
+        if winner:
+            state = state._replace(phase="finished", winner=winner, deadline=None)
+            return state, events + [{"type": "game_over", "winner": winner, "round": state.round,
+                                     "impostor_id": state.impostor_id}]
+        state = state._replace(round=state.round + 1, answers={}, votes={})
+        state, entered = _enter(state, "question", now, durations)
+        return state, events + entered
+
+    state, entered = _enter(state, NEXT_PHASE[state.phase], now, durations)
+    return state, events + entered
+
+
+# ========== COMANDOS ==========
+def _join(state, command, durations):
+    player_id = command["player_id"]
+    if state.phase != "waiting":
+        return state, _error(command, "El juego ya comenzó")
+    if player_id in state.names:
+        return state, []
+    state = state._replace(players=state.players + (player_id,),
+                           names={**state.names, player_id: command.get("name", player_id)})
+    return state, [{"type": "player_joined", "player_id": player_id, "name": state.names[player_id]}]
+
+
+def _start(state, command, durations):
+    if state.phase != "waiting":
+        return state, _error(command, "El juego ya comenzó")
+    if len(state.players) < 2:
+        return state, _error(command, "Se necesitan al menos 2 jugadores")
+
+    # El impostor sale de la semilla del comando: reaplicar el comando da el mismo impostor
+    impostor_id = random.Random(command.get("seed")).choice(state.players)
+    state = state._replace(round=1, total_rounds=command.get("total_rounds", state.total_rounds),
+                           alive=frozenset(state.players), impostor_id=impostor_id,
+                           cards=dict(command.get("cards", {})))
+    state, entered = _enter(state, "role_assignment", command["now"], durations)
+    started = {"type": "game_started", "impostor_id": impostor_id, "cards": state.cards,
+               "total_rounds": state.total_rounds}
+    return state, [started] + entered
+
+
+def _ready(state, command, durations):
+    player_id, is_ready = command["player_id"], command.get("ready", True)
+    # Un "listo" de una fase que ya terminó no cuenta para la siguiente
+    if player_id not in state.alive or command.get("phase", state.phase) != state.phase:
+        return state, []
+    if state.phase in ("waiting", "finished") or (player_id in state.ready) == is_ready:
+        return state, []
+    state = state._replace(ready=state.ready | {player_id} if is_ready else state.ready - {player_id})
+    events = [{"type": "player_ready", "player_id": player_id, "phase": state.phase, "ready": is_ready,
+               "ready_players": [pid for pid in state.players if pid in state.ready]}]
+    if is_ready and state.ready >= state.alive:
+        state, advanced = _advance(state, command["now"], durations)
+        events += advanced
+    return state, events
+
+
+def _answer(state, command, durations):
+    player_id = command["player_id"]
+    if state.phase != "question" or player_id not in state.alive:
+        return state, _error(command, "Ahora no se puede responder")
+    state = state._replace(answers={**state.answers, player_id: command.get("answer", "")})
+    return state, [{"type": "player_answer", "player_id": player_id, "answer": state.answers[player_id],
+                    "round": state.round, "all_answers_received": len(state.answers) >= len(state.alive)}]
+
+
+def _vote(state, command, durations):
+    voter, voted = command["player_id"], command.get("voted_id")
+    if state.phase != "voting" or voter not in state.alive:
+        return state, _error(command, "Error procesando voto")
+    if voted is not None and voted not in state.alive:
+        return state, _error(command, "Ese jugador no puede recibir votos")
+    state = state._replace(votes={**state.votes, voter: voted})
+    events = [{"type": "vote_submitted", "player_id": voter, "voted_id": voted, "round": state.round}]
+    if len(state.votes) >= len(state.alive):
+        # Con todos los votos se pasa a results sin esperar al timer
+        state, advanced = _advance(state, command["now"], durations)
+        events += advanced
+    return state, events
+
+
+def _tick(state, command, durations):
+    if state.deadline is None or command["now"] < state.deadline:
+        return state, []
+    return _advance(state, command["now"], durations)
+
+
+COMMANDS = {"join": _join, "start": _start, "ready": _ready, "answer": _answer, "vote": _vote, "tick": _tick}
+
+
+def apply(state: EngineState, command: Dict, durations: Dict[str, float] = PHASE_DURATIONS):
+    """Aplicar un comando: devuelve (estado nuevo, eventos). No modifica `state`"""
+    handler = COMMANDS.get(command.get("type"))
+    if handler is None:
+        return state, _error(command, f"Comando desconocido: {command.get('type')}")
+    new_state, events = handler(state, command, durations)
+    if new_state is not state:
+        new_state = new_state._replace(version=state.version + 1)
+    return new_state, events
+
+
+def replay(commands, state: Optional[EngineState] = None, durations: Dict[str, float] = PHASE_DURATIONS):
+    """Reconstruir el estado aplicando en orden una lista de comandos (el log de la partida)"""
+    state = state or EngineState()
+    events: List[Dict] = []
+    for command in commands:
+        state, produced = apply(state, command, durations)
+        events.extend(produced)
+    return state, events
@@ -0,0 +1,98 @@
+import re
+import time
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# Extrae el "type" de un frame sin parsear el JSON completo
+_TYPE_RE = re.compile(r'"type"\s*:\s*"([A-Za-z_]{1,40})"')
+
+
+class TokenBucket:
+    """Token bucket clásico: `rate` tokens por segundo, hasta `burst` acumulados"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def allow(self, cost: float = 1.0) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return True
+        return False
+
+
+class IngressMetrics:
+    """Contadores de frames rechazados en la entrada WebSocket"""
+
+    def __init__(self):
+        self.accepted = 0
+        self.oversized = 0
+        self.throttled: Dict[str, int] = {}  # tipo de mensaje -> frames descartados
+
+    def throttle(self, msg_type: str):
+        self.throttled[msg_type] = self.throttled.get(msg_type, 0) + 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "accepted": self.accepted,
+            "oversized": self.oversized,
+            "throttled": dict(self.throttled),
+            "throttled_total": sum(self.throttled.values())
+        }
+
+
+ingress_metrics = IngressMetrics()
+
+
+class ConnectionLimiter:
+    """Límites de una conexión: tamaño de frame, bucket global y buckets por tipo.
+
+    check() trabaja sobre el texto crudo, así que un cliente que inunda la sala
+    se descarta antes de pagar json.loads, handlers y broadcast.
+    """
+
+    def __init__(self, max_frame_bytes: int = None, rate: float = None, burst: float = None,
+                 type_limits: Dict[str, Tuple[float, float]] = None):
+        self.max_frame_bytes = max_frame_bytes or settings.WS_MAX_FRAME_BYTES
+        self.bucket = TokenBucket(rate or settings.WS_RATE_PER_SECOND, burst or settings.WS_RATE_BURST)
+        self.type_limits = type_limits if type_limits is not None else settings.WS_TYPE_RATE_LIMITS
+        self.type_buckets: Dict[str, TokenBucket] = {}
+        self.notified = False  # Ya se avisó al cliente del throttling en curso
+        self.last_type: Optional[str] = None  # Tipo detectado en el último frame aceptado
+
+    def check(self, raw: str) -> Optional[str]:
+        """Devuelve None si el frame pasa, o el motivo del rechazo"""
+        if len(raw) > self.max_frame_bytes:
+            ingress_metrics.oversized += 1
+            return "frame_too_large"
+
+        # El frame ya está acotado por max_frame_bytes, así que buscar es barato
+        match = _TYPE_RE.search(raw)
+        msg_type = match.group(1) if match else "unknown"
+
+        # Primero el bucket del tipo, para que un tipo saturado no gaste el bucket global
+        limit = self.type_limits.get(msg_type)
+        if limit:
+            bucket = self.type_buckets.get(msg_type)
+            if bucket is None:
+                bucket = self.type_buckets[msg_type] = TokenBucket(*limit)
+            if not bucket.allow():
+                ingress_metrics.throttle(msg_type)
+                return "rate_limited"
+
+        if not self.bucket.allow():
+            ingress_metrics.throttle(msg_type)
+            return "rate_limited"
+
+        ingress_metrics.accepted += 1
+        self.notified = False
+        self.last_type = msg_type
+        return None
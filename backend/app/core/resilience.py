@@ -0,0 +1,123 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """El circuito está abierto: se falla al instante sin llamar a la API"""
+
+
+class CircuitBreaker:
+    """Circuito clásico cerrado -> abierto -> semiabierto.
+
+    Tras `failure_threshold` fallos seguidos se abre y rechaza todo durante
+    `reset_timeout`; después deja pasar una sola llamada de prueba y, según
+    salga, vuelve a cerrarse o a abrirse.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures, "rejected": self.rejected}
+
+
+class RetryBudget:
+    """Presupuesto de reintentos: cada llamada aporta `ratio` tokens y cada reintento gasta uno.
+
+    Con la API caída los reintentos se agotan solos en vez de multiplicar la
+    carga; `min_per_second` garantiza algún reintento aunque haya poco tráfico.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.updated_at = time.monotonic()
+        self.spent = 0
+        self.denied = 0
+
+    def _refill(self, amount: float = 0.0):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + amount + (now - self.updated_at) * self.min_per_second)
+        self.updated_at = now
+
+    def deposit(self):
+        self._refill(self.ratio)
+
+    def try_spend(self) -> bool:
+        self._refill()
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.spent += 1
+            return True
+        self.denied += 1
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"tokens": round(self.tokens, 2), "spent": self.spent, "denied": self.denied}
+
+
+def backoff_delay(attempt: int, base: float, cap: float = 2.0) -> float:
+    """Backoff exponencial con jitter completo"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+async def hedged(call: Callable[[], Awaitable[Any]], hedge_after: float,
+                 can_hedge: Callable[[], bool] = lambda: True) -> Any:
+    """Lanzar `call`; si no termina en `hedge_after` segundos, lanzar una copia y quedarse con la primera que acierte"""
+    first = asyncio.create_task(call())
+    done, _ = await asyncio.wait({first}, timeout=hedge_after)
+    if done or not can_hedge():
+        return await first
+
+    second = asyncio.create_task(call())
+    pending = {first, second}
+    error: Optional[BaseException] = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
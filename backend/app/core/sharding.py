@@ -0,0 +1,22 @@
+import os
+import zlib
+
+from app.core.config import settings
+
+
+def shard_for_room(room_code: str, shard_count: int) -> int:
+    """Calcular el shard dueño de una sala a partir de su código"""
+    if shard_count <= 1:
+        return 0
+    # crc32 es estable entre procesos (hash() de Python no lo es)
+    return zlib.crc32(room_code.upper().encode("utf-8")) % shard_count
+
+
+def owns_room(room_code: str) -> bool:
+    """Indica si este proceso es el dueño de la sala"""
+    return shard_for_room(room_code, settings.SHARD_COUNT) == settings.SHARD_INDEX
+
+
+def shard_socket_path(index: int, socket_dir: str = None) -> str:
+    """Ruta del socket Unix donde escucha el worker de un shard"""
+    return os.path.join(socket_dir or settings.SHARD_SOCKET_DIR, f"shard-{index}.sock")
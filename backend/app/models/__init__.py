@@ -1,10 +1,4 @@
-# Importar solo lo que existe
-from .room import Room, RoomCreate, RoomJoin, Player
+from .room import Room, RoomCreate, RoomJoin, RoomStatus, Player
+from .game import GameState, GamePhase, PhaseConfig
 
-# Importar GameState solo si existe en game.py
-try:
-    from .game import GameState, GamePhase
-    __all__ = ["Room", "RoomCreate", "RoomJoin", "Player", "GameState", "GamePhase"]
-except ImportError:
-    # Si GameState no existe, no lo incluyas
-    __all__ = ["Room", "RoomCreate", "RoomJoin", "Player"]
\ No newline at end of file
+__all__ = ["Room", "RoomCreate", "RoomJoin", "RoomStatus", "Player", "GameState", "GamePhase", "PhaseConfig"]
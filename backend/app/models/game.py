@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, List
+from datetime import datetime
 from enum import Enum
 
 class GamePhase(str, Enum):
@@ -11,16 +12,19 @@ class GamePhase(str, Enum):
     RESULTS = "results"
     FINISHED = "finished"
 
+class PhaseConfig(BaseModel):
+    name: str  # "role_assignment", "question", "debate", "voting", "results"
+    duration: int = 60
+    started_at: Optional[datetime] = None
+
 class GameState(BaseModel):
-    room_code: str
-    current_phase: GamePhase = GamePhase.WAITING
-    current_round: int = 1
-    total_rounds: int = 5
-    impostor_id: Optional[str] = None
-    alive_players: list = []
-    voted_players: dict = {}
+    current_phase: str = "waiting"
+    phases: Dict[str, PhaseConfig] = {}
+    round: int = 1
+    questions: List[Dict] = []
+    votes: Dict[str, str] = {}  # voter_id -> voted_id
+    results: Optional[Dict] = None
+    phase_started_at: Optional[float] = None  # epoch, para retomar timers tras reinicio
     
     class Config:
         from_attributes = True
-
-# Si no tienes esta clase, créala con este contenido básico
\ No newline at end of file
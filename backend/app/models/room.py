@@ -1,7 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, root_validator
 from typing import List, Optional, Dict, Any
 from enum import Enum
 
+from app.core.catalog import card_catalog
+from .game import GameState
+
 class RoomStatus(str, Enum):
     WAITING = "waiting"
     PLAYING = "playing"
@@ -13,7 +16,32 @@ class Player(BaseModel):
     is_host: bool = False
     is_alive: bool = True
     is_impostor: bool = False
-    assigned_player: Optional[Dict[str, Any]] = None  # Jugador de fútbol asignado
+    card: Optional[int] = None  # Índice en card_catalog del jugador de fútbol asignado
+    is_ready: bool = False
+    is_connected: bool = True  # False cuando el latido detecta que su socket murió
+    
+    @root_validator(pre=True)
+    def _resolve_assigned_player(cls, values):
+        # Salas restauradas de un checkpoint traen la carta completa: se vuelve a guardar como índice
+        if "assigned_player" in values:
+            values = dict(values)
+            values["card"] = card_catalog.resolve(values.pop("assigned_player"))
+        return values
+    
+    @property
+    def assigned_player(self) -> Optional[Dict[str, Any]]:
+        return card_catalog.card(self.card) if self.card is not None else None
+    
+    def dict(self, **kwargs) -> Dict[str, Any]:
+        return _wire_player(super().dict(**kwargs))
+
+
+def _wire_player(data: Dict[str, Any]) -> Dict[str, Any]:
+    """La carta solo se materializa al salir por la red (o a un checkpoint)"""
+    if "card" in data:
+        card = data.pop("card")
+        data["assigned_player"] = card_catalog.card(card) if card is not None else None
+    return data
 
 class Room(BaseModel):
     code: str
@@ -23,10 +51,19 @@ class Room(BaseModel):
     current_round: int = 1
     total_rounds: int = 5
     debate_mode: bool = False
-    debate_time: int = 3  # minutos
+    debate_time: int = 5  # minutos
+    game_started: bool = False
+    current_phase: str = "waiting"
+    game_state: GameState = GameState()
     
     class Config:
         from_attributes = True
+    
+    def dict(self, **kwargs) -> Dict[str, Any]:
+        data = super().dict(**kwargs)
+        for player in data.get("players", ()):
+            _wire_player(player)
+        return data
 
 class RoomCreate(BaseModel):
     player_name: str
@@ -36,4 +73,4 @@ class RoomCreate(BaseModel):
 
 class RoomJoin(BaseModel):
     player_name: str
-    room_code: str
\ No newline at end of file
+    room_code: str
@@ -0,0 +1,268 @@
+# backend/app/router.py
+# Router frontal del modo multi-proceso: reenvía HTTP y WebSocket al shard dueño de cada sala
+import asyncio
+import itertools
+import json
+import re
+from typing import Callable, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs
+
+import aiohttp
+
+from app.core.sharding import shard_for_room
+
+# Rutas con código de sala en el path
+ROOM_PATH_PATTERNS = [
+    re.compile(r"^/api/ws/(?P<code>[^/]+)/?$"),
+    # /api/game/state/{code} antes que el genérico, que tomaría "state" como código
+    re.compile(r"^/api/game/state/(?P<code>[^/]+)/?$"),
+    re.compile(r"^/api/game/(?P<code>[^/]+)(/.*)?$"),
+    re.compile(r"^/api/rooms/(?P<code>(?!create$|join$)[^/]+)/?$"),
+]
+JOIN_PATH = "/api/rooms/join"
+# La cola de partida rápida vive en un único shard (crea salas con códigos propios)
+MATCHMAKING_PREFIX = "/api/matchmaking"
+# El listado de salas abiertas se compone en el router a partir del índice de cada shard
+LOBBY_PATHS = ("/api/rooms", "/api/rooms/")
+
+# Headers que no se deben reenviar entre saltos
+HOP_HEADERS = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+    "content-encoding", "sec-websocket-key", "sec-websocket-version",
+    "sec-websocket-extensions", "sec-websocket-accept",
+}
+
+
+def extract_room_code(path: str, body: bytes = b"") -> Optional[str]:
+    """Obtener el código de sala de una petición (path o body de /join)"""
+    for pattern in ROOM_PATH_PATTERNS:
+        match = pattern.match(path)
+        if match:
+            return match.group("code").upper()
+
+    if path == JOIN_PATH and body:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+        if isinstance(data, dict) and isinstance(data.get("room_code"), str):
+            return data["room_code"].upper()
+
+    return None
+
+
+def misrouted_paths(paths: List[str]) -> List[str]:
+    """Rutas montadas con {room_code} cuyo código no sale bien de la tabla de patrones"""
+    sample = "ABCDEF"
+    return [
+        path for path in paths
+        if "{room_code}" in path and extract_room_code(path.replace("{room_code}", sample)) != sample
+    ]
+
+
+def _forward_headers(raw_headers) -> List[tuple]:
+    return [
+        (name.decode("latin-1"), value.decode("latin-1"))
+        for name, value in raw_headers
+        if name.decode("latin-1").lower() not in HOP_HEADERS
+    ]
+
+
+class ShardRouter:
+    """App ASGI mínima que enruta por afinidad de sala a N workers locales"""
+
+    def __init__(self, socket_paths: List[str], on_startup: Sequence[Callable[[], None]] = ()):
+        self.socket_paths = socket_paths
+        self.on_startup = on_startup  # p. ej. el relevo de SIGTERM de app/cluster.py, que necesita el loop
+        self.sessions: List[aiohttp.ClientSession] = []
+        self.open_websockets = 0
+        # Las peticiones sin sala (crear sala, fútbol, health) se reparten en round-robin
+        self._round_robin = itertools.cycle(range(len(socket_paths)))
+
+    def pick_shard(self, path: str, body: bytes = b"") -> int:
+        if path.startswith(MATCHMAKING_PREFIX):
+            return 0
+        room_code = extract_room_code(path, body)
+        if room_code:
+            return shard_for_room(room_code, len(self.socket_paths))
+        return next(self._round_robin)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            if scope["path"] in LOBBY_PATHS and scope["method"] == "GET" and await self._lobby(scope, send):
+                return
+            await self._proxy_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._proxy_websocket(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.sessions = [
+                    aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=path))
+                    for path in self.socket_paths
+                ]
+                for hook in self.on_startup:
+                    hook()
+                print(f"🧭 [ROUTER] Enrutando a {len(self.sessions)} shards")
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for session in self.sessions:
+                    await session.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _upstream_url(self, scope, scheme: str = "http") -> str:
+        url = f"{scheme}://shard{scope.get('raw_path', scope['path'].encode()).decode('latin-1')}"
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+        return url
+
+    async def _lobby_page(self, shard: int, offset: int, limit: int) -> Dict:
+        async with self.sessions[shard].get(f"http://shard/api/rooms?offset={offset}&limit={limit}") as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def _lobby(self, scope, send) -> bool:
+        """GET /api/rooms sobre todos los shards: sus índices en orden de shard, como una sola lista.
+
+        Primero se pide a cada shard su total (página de 1) y luego solo los trozos
+        que caen en la ventana pedida, así que el coste sigue siendo O(limit).
+        Con parámetros no válidos devuelve False y la petición sigue al proxy normal (422).
+        """
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["20"])[0])
+        except ValueError:
+            return False
+        if offset < 0 or not 1 <= limit <= 50:
+            return False
+
+        try:
+            heads = await asyncio.gather(*(self._lobby_page(i, 0, 1) for i in range(len(self.sessions))))
+            totals = [head["total"] for head in heads]
+            rooms, start = [], 0
+            for shard, total in enumerate(totals):
+                local = max(0, offset - start)
+                if len(rooms) < limit and local < total:
+                    page = await self._lobby_page(shard, local, limit - len(rooms))
+                    rooms.extend(page["rooms"])
+                start += total
+        except (aiohttp.ClientError, KeyError) as e:
+            print(f"❌ [ROUTER] Listado de salas incompleto: {e}")
+            status, body = 502, {"detail": "Shard no disponible"}
+        else:
+            total = sum(totals)
+            next_offset = offset + len(rooms)
+            status, body = 200, {
+                "success": True,
+                "rooms": rooms,
+                "total": total,
+                "next_offset": next_offset if next_offset < total else None
+            }
+
+        payload = json.dumps(body).encode()
+        await send({"type": "http.response.start", "status": status, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": payload})
+        return True
+
+    async def _proxy_http(self, scope, receive, send):
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        shard = self.pick_shard(scope["path"], body)
+        try:
+            async with self.sessions[shard].request(
+                scope["method"],
+                self._upstream_url(scope),
+                headers=_forward_headers(scope["headers"]),
+                data=body or None,
+                allow_redirects=False,
+            ) as response:
+                status = response.status
+                payload = await response.read()
+                headers = [
+                    (name.encode("latin-1"), value.encode("latin-1"))
+                    for name, value in response.headers.items()
+                    if name.lower() not in HOP_HEADERS
+                ]
+        except aiohttp.ClientError as e:
+            print(f"❌ [ROUTER] Shard {shard} no disponible: {e}")
+            status = 502
+            payload = b'{"detail":"Shard no disponible"}'
+            headers = [(b"content-type", b"application/json")]
+
+        headers.append((b"content-length", str(len(payload)).encode()))
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": payload})
+
+    async def _proxy_websocket(self, scope, receive, send):
+        await receive()  # websocket.connect
+        shard = self.pick_shard(scope["path"])
+
+        try:
+            upstream = await self.sessions[shard].ws_connect(
+                self._upstream_url(scope),
+                headers=_forward_headers(scope["headers"]),
+            )
+        except aiohttp.ClientError as e:
+            print(f"❌ [ROUTER] WebSocket sin shard {shard}: {e}")
+            await send({"type": "websocket.close", "code": 1011})
+            return
+
+        await send({"type": "websocket.accept"})
+        self.open_websockets += 1
+
+        async def client_to_upstream():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("text") is not None:
+                    await upstream.send_str(message["text"])
+                elif message.get("bytes") is not None:
+                    await upstream.send_bytes(message["bytes"])
+
+        async def upstream_to_client():
+            async for message in upstream:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    await send({"type": "websocket.send", "text": message.data})
+                elif message.type == aiohttp.WSMsgType.BINARY:
+                    await send({"type": "websocket.send", "bytes": message.data})
+                else:
+                    break
+            try:
+                await send({"type": "websocket.close", "code": upstream.close_code or 1000})
+            except Exception:
+                pass  # El cliente ya se fue
+
+        tasks = [
+            asyncio.create_task(client_to_upstream()),
+            asyncio.create_task(upstream_to_client()),
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.open_websockets -= 1
+            await upstream.close()
+
+    async def drain_websockets(self, timeout: float) -> bool:
+        """Esperar a que se cierren los WebSockets reenviados; False si vence el plazo antes"""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while self.open_websockets and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+        return not self.open_websockets
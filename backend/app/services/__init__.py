@@ -1,5 +1,31 @@
-from .room_service import room_service
-from .game_service import game_service
-from .football_api import football_service
+# Importación diferida: cada servicio se carga la primera vez que se usa,
+# así importar un submódulo no arrastra httpx/SQLAlchemy al arrancar
+import importlib
 
-__all__ = ["room_service", "game_service", "football_service"]
\ No newline at end of file
+_SERVICES = {
+    "room_service": ".room_service",
+    "game_service": ".game_service",
+    "football_api_service": ".football_api",
+    "football_service": ".football_api",
+    "manager": ".connection_manager",
+    "phase_manager": ".phase_service",
+    "history_service": ".history_service",
+    "checkpoint_service": ".checkpoint_service",
+    "chat_service": ".chat_service",
+    "lobby_index": ".lobby_service",
+    "matchmaking_service": ".matchmaking_service",
+    "spectator_feed": ".spectator_service",
+    "player_index": ".search_index",
+    "question_bank": ".question_service",
+    "admission": ".admission_service",
+    "shutdown_coordinator": ".shutdown_service",
+    "room_janitor": ".room_janitor",
+}
+
+__all__ = list(_SERVICES)
+
+
+def __getattr__(name):
+    if name in _SERVICES:
+        return getattr(importlib.import_module(_SERVICES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
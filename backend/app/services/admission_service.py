@@ -0,0 +1,114 @@
+from fastapi import HTTPException, WebSocket
+from typing import Dict, Optional
+
+from app.core.admission import LoopLagMonitor
+from app.core.config import settings
+from app.services.connection_manager import manager
+from app.services.room_service import room_service
+from app.services.spectator_service import spectator_feed
+
+# Códigos de cierre WebSocket: "Try Again Later" y "Service Restart"
+WS_TRY_AGAIN_LATER = 1013
+WS_SERVICE_RESTART = 1012
+
+
+class AdmissionController:
+    """Control de admisión: con el servidor saturado se rechaza trabajo nuevo, no el que ya está en marcha.
+
+    Salas nuevas y sockets nuevos se rechazan (503 + Retry-After, o cierre 1013)
+    si hay demasiadas conexiones, demasiadas salas o el event loop va con
+    retraso. Las conexiones a partidas ya empezadas siempre entran: son
+    reconexiones de jugadores que no deben perder su partida.
+    """
+
+    def __init__(self):
+        self.lag_monitor = LoopLagMonitor(settings.ADMISSION_LAG_INTERVAL)
+        self.shed: Dict[str, int] = {}  # "tipo:motivo" -> rechazos
+        self.draining = False  # apagando: no entra nada, ni siquiera reconexiones
+
+    def start(self):
+        self.draining = False  # un lifespan nuevo vuelve a admitir (relevo anterior en el mismo proceso)
+        self.lag_monitor.start()
+
+    async def stop(self):
+        await self.lag_monitor.stop()
+
+    def begin_shutdown(self):
+        self.draining = True
+
+    def _overloaded(self) -> Optional[str]:
+        if self.lag_monitor.lag > settings.ADMISSION_MAX_LOOP_LAG:
+            return "loop_lag"
+        return None
+
+    def check_room(self) -> Optional[str]:
+        """Motivo para rechazar una sala nueva, o None si se admite"""
+        if self.draining:
+            return "shutting_down"
+        if room_service.live_rooms() >= settings.ADMISSION_MAX_ROOMS:
+            return "rooms"
+        return self._overloaded()
+
+    def check_connection(self, room_code: Optional[str] = None, kind: str = "sockets") -> Optional[str]:
+        """Motivo para rechazar un socket nuevo, o None si se admite"""
+        if self.draining:
+            return "shutting_down"
+        # Un jugador que vuelve a su partida siempre entra; los espectadores cuentan contra el límite
+        room = room_service.get_room(room_code) if room_code and kind == "sockets" else None
+        if room and room.game_started:
+            return None
+        if manager.total_connections() + spectator_feed.count() >= settings.ADMISSION_MAX_CONNECTIONS:
+            return "connections"
+        return self._overloaded()
+
+    def _count(self, kind: str, reason: str):
+        key = f"{kind}:{reason}"
+        self.shed[key] = self.shed.get(key, 0) + 1
+
+    def reject_http(self, kind: str, reason: str):
+        self._count(kind, reason)
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor saturado, inténtalo de nuevo en unos segundos",
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)}
+        )
+
+    async def reject_ws(self, websocket: WebSocket, kind: str, reason: str):
+        self._count(kind, reason)
+        await websocket.accept()
+        if reason == "shutting_down":
+            await websocket.close(code=WS_SERVICE_RESTART, reason="server moving")
+        else:
+            await websocket.close(code=WS_TRY_AGAIN_LATER, reason="Servidor saturado")
+
+    def admit_room(self):
+        """Lanzar 503 si no se admiten salas nuevas"""
+        reason = self.check_room()
+        if reason:
+            self.reject_http("rooms", reason)
+
+    async def admit_socket(self, websocket: WebSocket, kind: str, room_code: Optional[str] = None) -> bool:
+        """False (y el socket ya cerrado con 1013, o 1012 si se está apagando) si no se admite"""
+        reason = self.check_connection(room_code, kind)
+        if reason:
+            await self.reject_ws(websocket, kind, reason)
+            return False
+        return True
+
+    def stats(self) -> Dict:
+        return {
+            "draining": self.draining,
+            "loop_lag_ms": round(self.lag_monitor.lag * 1000, 1),
+            "max_loop_lag_ms": round(self.lag_monitor.max_lag * 1000, 1),
+            "limits": {
+                "connections": settings.ADMISSION_MAX_CONNECTIONS,
+                "rooms": settings.ADMISSION_MAX_ROOMS,
+                "loop_lag_ms": settings.ADMISSION_MAX_LOOP_LAG * 1000,
+            },
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values())
+        }
+
+
+# Instancia global
+admission = AdmissionController()
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional
+import asyncio
+
+from app.core.config import settings
+from app.services.search_index import normalize
+
+
+def similarity_matrix(answers: List[str], n: int = 3, dims: int = 1024):
+    """Similitud coseno entre respuestas con vectores de n-gramas de caracteres (hashing trick).
+
+    Todas las respuestas se concatenan en un único array de códigos y los
+    n-gramas de todas se calculan y cuentan de una vez: sin bucles por respuesta.
+    """
+    import numpy as np  # dependencia pesada: solo se carga si hay algo que analizar
+
+    texts = [f" {normalize(answer)} " for answer in answers]
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    codes = np.frombuffer("".join(texts).encode("utf-32-le"), dtype=np.uint32).astype(np.int64)
+    rows = np.repeat(np.arange(len(texts)), lengths)
+
+    # Hash polinómico de cada ventana de n caracteres; solo valen las que no cruzan de una respuesta a otra
+    size = len(codes) - n + 1
+    hashes = np.zeros(max(size, 0), dtype=np.int64)
+    for offset in range(n):
+        hashes = hashes * 1_000_003 + codes[offset:offset + size]
+    valid = rows[:size] == rows[n - 1:n - 1 + size]
+    buckets = rows[:size][valid] * dims + hashes[valid] % dims
+
+    vectors = np.bincount(buckets, minlength=len(texts) * dims).reshape(len(texts), dims).astype(np.float64)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1.0, norms)
+    return vectors @ vectors.T
+
+
+def analyze_round(answers: Dict[str, str]) -> Optional[Dict]:
+    """Parecido medio de cada respuesta con las demás y la más atípica (posible impostor)"""
+    if len(answers) < 3:
+        return None
+    import numpy as np
+
+    player_ids = list(answers)
+    matrix = similarity_matrix([answers[pid] or "" for pid in player_ids])
+    count = len(player_ids)
+    scores = (matrix.sum(axis=1) - matrix.diagonal()) / (count - 1)
+
+    lowest = int(scores.argmin())
+    others = np.delete(scores, lowest)
+    margin = float(others.mean() - scores[lowest])
+    # Suelo para la dispersión: con respuestas casi iguales una diferencia mínima no debe parecer enorme
+    gap = margin / max(float(others.std()), 0.05)
+    # Sin señal clara (todas iguales, vacías o una errata) no se señala a nadie ante la sala
+    flagged = margin >= settings.ANSWER_OUTLIER_MIN_MARGIN and gap >= settings.ANSWER_OUTLIER_MIN_GAP
+    return {
+        "scores": {pid: round(float(score), 3) for pid, score in zip(player_ids, scores)},
+        "outlier": player_ids[lowest] if flagged else None,
+        # Cuántas desviaciones por debajo del resto queda la respuesta menos parecida
+        "outlier_gap": round(gap, 2)
+    }
+
+
+async def analyze_answers(answers: Dict[str, str]) -> Optional[Dict]:
+    """En salas grandes el cálculo se hace en el pool de hilos para no bloquear el loop.
+
+    Corre dentro del cambio de fase: si falla devuelve None y la fase sigue adelante.
+    """
+    answers = {player_id: "" if answer is None else str(answer) for player_id, answer in answers.items()}
+    try:
+        if len(answers) >= settings.ANSWER_ANALYSIS_THREAD_MIN:
+            return await asyncio.to_thread(analyze_round, answers)
+        return analyze_round(answers)
+    except Exception as e:
+        print(f"❌ [ANALYSIS] Error analizando respuestas: {e}")
+        return None
@@ -0,0 +1,93 @@
+from typing import Callable, Dict, Iterable, List, Optional
+import asyncio
+import time
+
+# Entradas de plantilla que no son jugadores
+NON_PLAYER_POSITIONS = {"manager", "coach", "assistant manager", "assistant coach", "director"}
+
+
+def is_footballer(player: Dict) -> bool:
+    position = (player.get("strPosition") or "").strip().lower()
+    return bool(player.get("idPlayer") and (player.get("strPlayer") or "").strip()
+                and position and position not in NON_PLAYER_POSITIONS)
+
+
+class CatalogIngestor:
+    """Pipeline de carga del catálogo: ligas -> equipos -> plantillas.
+
+    Un productor mete en una cola acotada los equipos semilla y los de cada liga
+    según van llegando; un pool fijo de workers descarga plantillas, normaliza y
+    deduplica por idPlayer. Cada lote nuevo se entrega con `on_batch`, así que el
+    catálogo (y el índice de búsqueda) crecen mientras la carga sigue en marcha.
+    """
+
+    def __init__(self, api, workers: int = 4, max_players: int = 5000,
+                 on_batch: Optional[Callable[[List[Dict]], None]] = None):
+        self.api = api  # FootballAPIService (get_teams_by_league, get_team_players, format_player)
+        self.workers = workers
+        self.max_players = max_players
+        self.on_batch = on_batch
+        self.players: Dict[str, Dict] = {}  # idPlayer -> jugador ya formateado
+        self.stats = {"teams": 0, "duplicates": 0, "skipped": 0, "seconds": 0.0}
+
+    async def run(self, leagues: Iterable[str], seed_team_ids: Iterable[str] = ()) -> List[Dict]:
+        started = time.monotonic()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 4)
+        seen_teams = set()
+
+        async def enqueue(team_id):
+            if team_id and team_id not in seen_teams:
+                seen_teams.add(team_id)
+                await queue.put(team_id)
+
+        async def produce():
+            try:
+                # Primero los equipos populares, después las ligas en el orden en que respondan
+                for team_id in seed_team_ids:
+                    await enqueue(team_id)
+                for league_teams in asyncio.as_completed([self.api.get_teams_by_league(l) for l in leagues]):
+                    for team in await league_teams:
+                        await enqueue(team.get("idTeam"))
+            finally:
+                for _ in range(self.workers):
+                    await queue.put(None)
+
+        async def work():
+            while True:
+                team_id = await queue.get()
+                if team_id is None:
+                    return
+                if len(self.players) >= self.max_players:
+                    continue
+                try:
+                    roster = await self.api.get_team_players(team_id)
+                except Exception as e:
+                    print(f"Error obteniendo jugadores del equipo {team_id}: {e}")
+                    continue
+                self._ingest(roster)
+
+        await asyncio.gather(produce(), *(work() for _ in range(self.workers)))
+        self.stats["seconds"] = round(time.monotonic() - started, 3)
+        return list(self.players.values())
+
+    def _ingest(self, roster: List[Dict]):
+        self.stats["teams"] += 1
+        batch = []
+        for raw in roster:
+            if not is_footballer(raw):
+                self.stats["skipped"] += 1
+                continue
+            player_id = str(raw["idPlayer"])
+            if player_id in self.players:
+                self.stats["duplicates"] += 1
+                continue
+            if len(self.players) >= self.max_players:
+                break
+            player = self.api.format_player(raw)
+            player["id"] = player_id
+            player["name"] = player["name"].strip()
+            self.players[player_id] = player
+            batch.append(player)
+
+        if batch and self.on_batch:
+            self.on_batch(batch)
@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+import sys
+import time
+
+from app.core.config import settings
+
+# Entrada compacta: (seq, player_id, player_name, mensaje, timestamp)
+ChatEntry = Tuple[int, str, str, str, float]
+
+
+class RoomChat:
+    """Ring buffer de chat de una sala: capacidad fija y tope de memoria.
+
+    Los mensajes se numeran con una secuencia creciente, así que la posición de
+    un mensaje en el buffer sale de una resta y paginar no recorre nada.
+    """
+
+    __slots__ = ("capacity", "max_bytes", "entries", "next_seq", "first_seq", "size_bytes")
+
+    def __init__(self, capacity: int, max_bytes: int):
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.entries: List[Optional[ChatEntry]] = [None] * capacity
+        self.next_seq = 0   # secuencia que recibirá el próximo mensaje
+        self.first_seq = 0  # mensaje más antiguo todavía guardado
+        self.size_bytes = 0
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    def _evict_oldest(self):
+        slot = self.first_seq % self.capacity
+        self.size_bytes -= len(self.entries[slot][3])
+        self.entries[slot] = None
+        self.first_seq += 1
+
+    def append(self, player_id: str, player_name: str, message: str) -> ChatEntry:
+        # Ids y nombres se repiten en cada mensaje: internarlos comparte una sola copia
+        entry = (self.next_seq, sys.intern(player_id), sys.intern(player_name), message, time.time())
+
+        if len(self) == self.capacity:
+            self._evict_oldest()
+        self.entries[self.next_seq % self.capacity] = entry
+        self.next_seq += 1
+        self.size_bytes += len(message)
+
+        while self.size_bytes > self.max_bytes and len(self) > 1:
+            self._evict_oldest()
+        return entry
+
+    def page(self, before: Optional[int], limit: int) -> Tuple[List[ChatEntry], bool]:
+        """Hasta `limit` mensajes anteriores a la secuencia `before` (None = los últimos)"""
+        end = self.next_seq if before is None else max(self.first_seq, min(before, self.next_seq))
+        start = max(self.first_seq, end - limit)
+        entries = [self.entries[seq % self.capacity] for seq in range(start, end)]
+        return entries, start > self.first_seq
+
+
+class ChatService:
+    """Historial de chat acotado por sala para jugadores que llegan tarde o se reconectan"""
+
+    def __init__(self, capacity: int = None, max_bytes: int = None):
+        self.capacity = capacity or settings.CHAT_HISTORY_SIZE
+        self.max_bytes = max_bytes or settings.CHAT_HISTORY_MAX_BYTES
+        self.rooms: Dict[str, RoomChat] = {}
+
+    def add_message(self, room_code: str, player_id: str, player_name: str, message: str) -> Dict:
+        chat = self.rooms.get(room_code)
+        if chat is None:
+            chat = self.rooms[room_code] = RoomChat(self.capacity, self.max_bytes)
+        message = message[:settings.CHAT_MESSAGE_MAX_CHARS]
+        return self.to_dict(chat.append(str(player_id or ""), str(player_name or ""), message))
+
+    def get_page(self, room_code: str, before: Optional[int] = None, limit: int = None) -> Dict:
+        """Página de historial, de más antiguo a más reciente"""
+        limit = max(1, min(limit or settings.CHAT_PAGE_SIZE, settings.CHAT_PAGE_SIZE))
+        chat = self.rooms.get(room_code)
+        if chat is None:
+            return {"messages": [], "has_more": False, "next_before": None}
+
+        entries, has_more = chat.page(before, limit)
+        return {
+            "messages": [self.to_dict(entry) for entry in entries],
+            "has_more": has_more,
+            "next_before": entries[0][0] if has_more else None
+        }
+
+    def remove_room(self, room_code: str):
+        self.rooms.pop(room_code, None)
+
+    @staticmethod
+    def to_dict(entry: ChatEntry) -> Dict:
+        seq, player_id, player_name, message, timestamp = entry
+        return {
+            "id": seq,
+            "playerId": player_id,
+            "player_id": player_id,
+            "player_name": player_name,
+            "message": message,
+            "timestamp": datetime.fromtimestamp(timestamp).isoformat()
+        }
+
+# Instancia global
+chat_service = ChatService()
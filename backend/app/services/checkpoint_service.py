@@ -0,0 +1,140 @@
+# backend/app/services/checkpoint_service.py
+# Checkpoints incrementales del estado de las salas en un journal append-only
+import asyncio
+import json
+import os
+from typing import Any, Callable, Dict, Optional, Set
+
+from app.core.config import settings
+
+
+class CheckpointJournal:
+    """Journal JSONL de salas: una línea por cambio, la última gana.
+
+    Solo se escriben las salas marcadas como sucias desde el último flush, así que
+    el coste de cada checkpoint depende de los cambios y no del total de salas.
+    Cuando el journal crece demasiado respecto al estado vivo se compacta
+    reescribiendo solo la última versión de cada sala.
+    """
+
+    def __init__(self, path: str, interval: float = 2.0, compact_ratio: float = 4.0,
+                 min_compact_bytes: int = 1024 * 1024):
+        self.path = path
+        self.interval = interval
+        self.compact_ratio = compact_ratio
+        self.min_compact_bytes = min_compact_bytes
+        self.snapshot: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None
+        self._dirty: Set[str] = set()
+        self._live_bytes: Dict[str, int] = {}  # key -> tamaño de su último registro
+        self._journal_bytes = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # ========== MARCADO (llamado desde el event loop, O(1)) ==========
+    def mark_dirty(self, key: str):
+        self._dirty.add(key)
+
+    # ========== ESCRITURA ==========
+    async def flush(self) -> int:
+        """Escribir en el journal las salas cambiadas desde el último flush"""
+        if not self._dirty or not self.snapshot:
+            return 0
+
+        async with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            # El snapshot se toma en el loop para que sea consistente; el I/O va a un hilo
+            records = [(key, self.snapshot(key)) for key in dirty]
+            await asyncio.to_thread(self._append, records)
+
+            if (self._journal_bytes > self.min_compact_bytes and
+                    self._journal_bytes > self.compact_ratio * sum(self._live_bytes.values())):
+                await asyncio.to_thread(self._compact)
+
+        return len(records)
+
+    def _append(self, records):
+        lines = []
+        for key, state in records:
+            if state is None:
+                line = json.dumps({"key": key, "deleted": True}) + "\n"
+                self._live_bytes.pop(key, None)
+            else:
+                line = json.dumps({"key": key, "state": state}, default=str) + "\n"
+                self._live_bytes[key] = len(line)
+            lines.append(line)
+
+        data = "".join(lines).encode("utf-8")
+        with open(self.path, "ab") as journal:
+            journal.write(data)
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._journal_bytes += len(data)
+
+    def _compact(self):
+        live = self._read()
+        tmp_path = self.path + ".tmp"
+        size = 0
+        with open(tmp_path, "wb") as journal:
+            for key, state in live.items():
+                data = (json.dumps({"key": key, "state": state}, default=str) + "\n").encode("utf-8")
+                journal.write(data)
+                size += len(data)
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(tmp_path, self.path)
+        self._journal_bytes = size
+        print(f"🗜️ [CHECKPOINT] Journal compactado: {len(live)} salas, {size} bytes")
+
+    # ========== LECTURA ==========
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        live: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(self.path):
+            return live
+
+        with open(self.path, "r", encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Última línea a medio escribir tras un crash
+                    continue
+                if record.get("deleted"):
+                    live.pop(record["key"], None)
+                else:
+                    live[record["key"]] = record["state"]
+        return live
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Reproducir el journal y devolver el último estado de cada sala"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        live = self._read()
+        self._live_bytes = {key: len(json.dumps(state, default=str)) for key, state in live.items()}
+        self._journal_bytes = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        return live
+
+    # ========== TAREA PERIÓDICA ==========
+    def start(self, snapshot: Callable[[str], Optional[Dict[str, Any]]]):
+        self.snapshot = snapshot
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ [CHECKPOINT] Error escribiendo checkpoint: {e}")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+
+# Instancia global (un journal por shard)
+checkpoint_service = CheckpointJournal(
+    os.path.join(settings.CHECKPOINT_DIR, f"rooms-{settings.SHARD_INDEX}.jsonl"),
+    interval=settings.CHECKPOINT_INTERVAL
+)
@@ -0,0 +1,206 @@
+from fastapi import WebSocket
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import json
+
+from app.core.clock import real_clock
+from app.core.config import settings
+from app.services.room_service import room_service
+from app.services.spectator_service import spectator_feed
+
+class ConnectionManager:
+    """Dueño único de las conexiones WebSocket por sala"""
+
+    def __init__(self, clock=real_clock):
+        self.clock = clock  # latidos y drenado van con el reloj inyectable, como las fases
+        self.active_connections: Dict[str, List[WebSocket]] = {}
+        # Latido: última vez que se supo de cada socket, y a qué sala y jugador pertenece
+        self.last_seen: Dict[WebSocket, float] = {}
+        self.socket_rooms: Dict[WebSocket, str] = {}
+        self.socket_players: Dict[WebSocket, str] = {}
+        # (sala, jugador) -> sus sockets abiertos: los ids de jugador solo son únicos dentro de una sala
+        self.player_sockets: Dict[Tuple[str, str], Set[WebSocket]] = {}
+        self.reaped = 0  # sockets cerrados por no responder
+        self._inflight = 0  # broadcasts en curso (para drenarlos al apagar)
+        self._sweeper: Optional[asyncio.Task] = None
+
+    async def connect(self, websocket: WebSocket, room_code: str):
+        await websocket.accept()
+
+        if room_code not in self.active_connections:
+            self.active_connections[room_code] = []
+
+        self.active_connections[room_code].append(websocket)
+        self.last_seen[websocket] = self.clock.monotonic()
+        self.socket_rooms[websocket] = room_code
+        print(f"🔗 Cliente conectado en sala {room_code} ({len(self.active_connections[room_code])} conexiones).")
+
+        # Enviar estado actual de la sala solo al que se conecta
+        room = room_service.get_room(room_code)
+        if room:
+            await self.send_personal(websocket, {
+                "type": "room_state",
+                "room": room.dict(),
+                "message": "Conectado a la sala"
+            })
+
+    def disconnect(self, websocket: WebSocket, room_code: str):
+        self.last_seen.pop(websocket, None)
+        self.socket_rooms.pop(websocket, None)
+        self._unbind_player(websocket, room_code)
+        if room_code in self.active_connections:
+            try:
+                self.active_connections[room_code].remove(websocket)
+            except ValueError:
+                pass
+
+            if len(self.active_connections[room_code]) == 0:
+                del self.active_connections[room_code]
+
+        print(f"🔌 Cliente desconectado en sala {room_code}")
+
+    async def send_personal(self, websocket: WebSocket, message: dict):
+        try:
+            await websocket.send_json(message)
+        except Exception:
+            pass
+
+    async def broadcast_to_room(self, room_code: str, message: dict):
+        # Los espectadores van por su propio canal diferido (no bloquea)
+        spectator_feed.publish(room_code, message)
+
+        connections = self.active_connections.get(room_code)
+        if not connections:
+            return
+
+        # Serializar una sola vez para toda la sala
+        payload = json.dumps(message, separators=(",", ":"))
+
+        disconnected = []
+        self._inflight += 1
+        try:
+            for ws in list(connections):
+                try:
+                    await ws.send_text(payload)
+                except Exception:
+                    disconnected.append(ws)
+        finally:
+            self._inflight -= 1
+
+        # Limpiar desconectados
+        for ws in disconnected:
+            self.disconnect(ws, room_code)
+
+    def total_connections(self) -> int:
+        return sum(len(conns) for conns in self.active_connections.values())
+
+    def all_sockets(self) -> List[WebSocket]:
+        return [ws for conns in self.active_connections.values() for ws in conns]
+
+    async def drain(self, timeout: float) -> bool:
+        """Esperar a que terminen los broadcasts en curso; False si vence el plazo antes"""
+        deadline = self.clock.monotonic() + timeout
+        while self._inflight and self.clock.monotonic() < deadline:
+            await self.clock.sleep(0.05)
+        return not self._inflight
+
+    # ========== LATIDO ==========
+    def touch(self, websocket: WebSocket, player_id: Optional[str] = None):
+        """Cualquier mensaje del cliente (incluido el pong) cuenta como señal de vida"""
+        if websocket not in self.socket_rooms:
+            return
+        self.last_seen[websocket] = self.clock.monotonic()
+        if player_id and self.socket_players.get(websocket) != player_id:
+            room_code = self.socket_rooms[websocket]
+            self._unbind_player(websocket, room_code)
+            self.socket_players[websocket] = player_id
+            self.player_sockets.setdefault((room_code, player_id), set()).add(websocket)
+            self._set_connected(room_code, player_id, True)
+
+    def _unbind_player(self, websocket: WebSocket, room_code: Optional[str]):
+        player_id = self.socket_players.pop(websocket, None)
+        sockets = self.player_sockets.get((room_code, player_id))
+        if sockets is not None:
+            sockets.discard(websocket)
+            if not sockets:
+                del self.player_sockets[(room_code, player_id)]
+
+    def _set_connected(self, room_code: str, player_id: str, connected: bool) -> bool:
+        room = room_service.get_room(room_code)
+        player = next((p for p in room.players if p.id == player_id), None) if room else None
+        if player is None or player.is_connected == connected:
+            return False
+        player.is_connected = connected
+        return True
+
+    def start_heartbeat(self):
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_forever())
+
+    async def stop_heartbeat(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def _sweep_forever(self):
+        while True:
+            await self.clock.sleep(settings.HEARTBEAT_INTERVAL)
+            try:
+                await self.sweep()
+            except Exception as e:
+                print(f"❌ [HEARTBEAT] Error en el barrido: {e}")
+
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """Una pasada por todos los sockets: ping a los callados, cierre de los que no responden"""
+        now = self.clock.monotonic() if now is None else now
+        stale, quiet = [], []
+        for websocket, seen in self.last_seen.items():
+            idle = now - seen
+            if idle > settings.HEARTBEAT_TIMEOUT:
+                stale.append(websocket)
+            elif idle >= settings.HEARTBEAT_INTERVAL:
+                quiet.append(websocket)
+
+        if quiet:
+            payload = json.dumps({"type": "ping", "t": int(self.clock.now() * 1000)})
+            await asyncio.gather(*(self._ping(ws, payload) for ws in quiet))
+        for websocket in stale:
+            await self._reap(websocket)
+        return len(stale)
+
+    async def _ping(self, websocket: WebSocket, payload: str):
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), settings.HEARTBEAT_SEND_TIMEOUT)
+        except Exception:
+            pass  # si de verdad está muerto, el siguiente barrido lo cierra
+
+    async def _reap(self, websocket: WebSocket):
+        room_code = self.socket_rooms.get(websocket)
+        player_id = self.socket_players.get(websocket)
+        self.disconnect(websocket, room_code)
+        self.reaped += 1
+        try:
+            await asyncio.wait_for(websocket.close(code=1001, reason="Sin respuesta al ping"),
+                                   settings.HEARTBEAT_SEND_TIMEOUT)
+        except Exception:
+            pass
+
+        # Si no le queda otro socket abierto en la sala, el jugador pasa a desconectado
+        if player_id and (room_code, player_id) not in self.player_sockets:
+            if self._set_connected(room_code, player_id, False):
+                room = room_service.get_room(room_code)
+                await self.broadcast_to_room(room_code, {
+                    "type": "player_disconnected",
+                    "playerId": player_id,
+                    "room": room.dict() if room else None
+                })
+
+    def heartbeat_stats(self) -> Dict:
+        return {"tracked": len(self.last_seen), "reaped": self.reaped}
+
+# Instancia global
+manager = ConnectionManager()
@@ -1,92 +1,275 @@
 # backend/app/services/football_api.py
-import httpx
-import os
-from typing import List, Dict, Any, Optional
+import asyncio
+import time
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from app.core.catalog import card_catalog
+from app.core.config import settings
+from app.core.resilience import CircuitBreaker, RetryBudget, backoff_delay, hedged
+from app.core.singleflight import SingleFlight
+from app.services.catalog_ingest import CatalogIngestor
+from app.services.question_service import question_bank
+from app.services.search_index import player_index
+
+# IDs de equipos populares en The Sports DB (van primero en el catálogo)
+POPULAR_TEAM_IDS = [
+    "133602",  # Real Madrid
+    "133738",  # Barcelona
+    "134301",  # Manchester United
+    "133613",  # Manchester City
+    "134300",  # Liverpool
+    "134302",  # Bayern Munich
+    "133739",  # Paris Saint-Germain
+    "134503",  # Juventus
+    "133610",  # Chelsea
+    "133616",  # Arsenal
+]
+
+class UpstreamClientError(Exception):
+    """4xx de la API: responde bien, el problema es la petición (no se reintenta)"""
 
 class FootballAPIService:
-    def __init__(self):
-        self.base_url = "https://www.thesportsdb.com/api/v1/json"
-        self.api_key = os.getenv("SPORTSDB_API_KEY", "1")  # Clave gratuita
-        self.client = httpx.AsyncClient(timeout=30.0)
+    def __init__(self, base_url: str = None, api_key: str = None):
+        self.base_url = (base_url or settings.SPORTSDB_BASE_URL).rstrip("/")
+        self.api_key = api_key or settings.SPORTSDB_API_KEY
+        self._client = None
+        # Catálogo activo: tupla inmutable de índices en card_catalog, compartida por todas las partidas
+        self._catalog: Tuple[int, ...] = ()
+        self._catalog_expires_at = 0.0
+        self._ingestor: Optional[CatalogIngestor] = None  # ingesta en curso, si la hay
+        self._descriptions: "OrderedDict[str, str]" = OrderedDict()  # LRU de biografías pedidas
+        # Una sola petición en vuelo por URL y un tope de concurrencia por host
+        self._flights = SingleFlight()
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        # Resiliencia: fallar rápido con la API caída y reintentar con presupuesto
+        self.breaker = CircuitBreaker(settings.UPSTREAM_BREAKER_FAILURES, settings.UPSTREAM_BREAKER_RESET)
+        self.retry_budget = RetryBudget(settings.UPSTREAM_RETRY_RATIO)
+    
+    @property
+    def client(self):
+        """Cliente HTTP creado en el primer uso (httpx no se importa al arrancar)"""
+        if self._client is None:
+            import httpx
+            self._client = httpx.AsyncClient(
+                timeout=settings.UPSTREAM_TIMEOUT,
+                limits=httpx.Limits(max_connections=settings.UPSTREAM_MAX_CONCURRENCY * 4)
+            )
+        return self._client
+    
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def make_request(self, endpoint: str) -> Dict[str, Any]:
-        """Método genérico para hacer requests"""
+        """Método genérico para hacer requests (las peticiones iguales en vuelo se comparten)"""
         url = f"{self.base_url}/{self.api_key}{endpoint}"
-        try:
+        return await self._flights.do(url, lambda: self._fetch(url))
+    
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(settings.UPSTREAM_MAX_CONCURRENCY)
+        return limit
+    
+    async def _attempt(self, url: str) -> Dict[str, Any]:
+        async with self._host_limit(url):
             response = await self.client.get(url)
-            response.raise_for_status()
-            return response.json()
-        except Exception as e:
-            return {"error": str(e)}
+        if response.status_code == 429 or response.status_code >= 500:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        if response.status_code >= 400:
+            raise UpstreamClientError(f"HTTP {response.status_code}")
+        return response.json()
+    
+    async def _fetch(self, url: str) -> Dict[str, Any]:
+        """Una llamada lógica: circuito, intento (con hedge opcional) y reintentos con jitter"""
+        if not self.breaker.allow():
+            return {"error": "circuit_open"}
+        
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            try:
+                if settings.UPSTREAM_HEDGE_AFTER > 0:
+                    # La copia del hedge también sale del presupuesto de reintentos
+                    result = await hedged(lambda: self._attempt(url), settings.UPSTREAM_HEDGE_AFTER, self.retry_budget.try_spend)
+                else:
+                    result = await self._attempt(url)
+                self.breaker.record_success()
+                return result
+            except UpstreamClientError as e:
+                self.breaker.record_success()
+                return {"error": str(e)}
+            except Exception as e:
+                if attempt >= settings.UPSTREAM_MAX_RETRIES or not self.retry_budget.try_spend():
+                    self.breaker.record_failure()
+                    return {"error": str(e) or type(e).__name__}
+                attempt += 1
+                await asyncio.sleep(backoff_delay(attempt, settings.UPSTREAM_RETRY_BASE))
     
     # 1. Obtener jugadores de un equipo específico
     async def get_team_players(self, team_id: str) -> List[Dict[str, Any]]:
         """Obtener todos los jugadores de un equipo"""
         result = await self.make_request(f"/lookup_all_players.php?id={team_id}")
-        return result.get("player", [])
+        return result.get("player", []) or []
     
     # 2. Buscar equipos por nombre
     async def search_teams(self, team_name: str) -> List[Dict[str, Any]]:
         """Buscar equipos por nombre"""
         result = await self.make_request(f"/searchteams.php?t={team_name}")
-        return result.get("teams", [])
+        return result.get("teams", []) or []
     
     # 3. Obtener equipos de una liga
     async def get_teams_by_league(self, league_name: str) -> List[Dict[str, Any]]:
         """Obtener equipos de una liga específica"""
         result = await self.make_request(f"/search_all_teams.php?l={league_name}")
-        return result.get("teams", [])
+        return result.get("teams", []) or []
     
     # 4. Buscar jugadores por nombre
     async def search_players(self, player_name: str) -> List[Dict[str, Any]]:
-        """Buscar jugadores por nombre"""
+        """Buscar jugadores por nombre (primero en el índice local, la API solo si no hay nada)"""
+        local = player_index.search(player_name, fields=("name",))
+        if local:
+            return local
         result = await self.make_request(f"/searchplayers.php?p={player_name}")
-        return result.get("player", [])
+        return self.index_players(result.get("player", []) or [])
+    
+    @staticmethod
+    def format_player(player: Dict[str, Any]) -> Dict[str, Any]:
+        """Formato de jugador que usa el juego a partir de la respuesta de TheSportsDB"""
+        return {
+            "id": player.get("idPlayer"),
+            "name": player.get("strPlayer"),
+            "team": player.get("strTeam", "Desconocido"),
+            "position": player.get("strPosition", "Jugador"),
+            "nationality": player.get("strNationality", "Desconocida"),
+            "thumb": player.get("strThumb"),  # Foto
+            "birth_date": player.get("dateBorn", ""),
+            "birth_place": player.get("strBirthLocation", "")
+        }
+    
+    def index_players(self, players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Formatear jugadores traídos de la API y añadirlos al catálogo y al índice de búsqueda"""
+        formatted = [self.format_player(p) for p in players if p.get("strPlayer") and p.get("idPlayer")]
+        self._index_batch(formatted)
+        return formatted
+    
+    async def get_player_description(self, player_id: str) -> Optional[str]:
+        """Biografía de un jugador: no vive en el catálogo, se pide bajo demanda y se cachea (LRU)"""
+        if player_id in self._descriptions:
+            self._descriptions.move_to_end(player_id)
+            return self._descriptions[player_id]
+        
+        result = await self.make_request(f"/lookupplayer.php?id={player_id}")
+        if result.get("error"):
+            return None
+        players = result.get("players") or []
+        description = (players[0].get("strDescriptionEN") or "") if players else ""
+        self._descriptions[player_id] = description
+        if len(self._descriptions) > settings.CATALOG_DESCRIPTION_CACHE:
+            self._descriptions.popitem(last=False)
+        return description
     
     # 5. Obtener jugadores populares para el juego
     async def get_popular_players_for_game(self) -> List[Dict[str, Any]]:
-        """Obtener jugadores de equipos populares para el juego"""
-        
-        # IDs de equipos populares en The Sports DB
-        popular_team_ids = [
-            "133602",  # Real Madrid
-            "133738",  # Barcelona
-            "134301",  # Manchester United
-            "134300",  # Liverpool
-            "134302",  # Bayern Munich
-            "133739",  # Paris Saint-Germain
-            "134503",  # Juventus
-            "133610",  # Chelsea
-            "133616",  # Arsenal
-            "134301"   # Manchester City
-        ]
-        
-        all_players = []
-        
-        for team_id in popular_team_ids:
+        """Cargar el catálogo: equipos populares primero y luego ligas completas, deduplicado por idPlayer"""
+        ingestor = self._ingestor = CatalogIngestor(
+            self,
+            workers=settings.CATALOG_INGEST_WORKERS,
+            max_players=settings.CATALOG_MAX_PLAYERS,
+            on_batch=self._index_batch
+        )
+        try:
+            players = await ingestor.run(settings.CATALOG_LEAGUES, POPULAR_TEAM_IDS)
+        finally:
+            self._ingestor = None
+        print(f"📥 [CATALOG] Ingesta: {len(players)} jugadores, {ingestor.stats}")
+        return players
+    
+    @staticmethod
+    def _index_batch(batch: List[Dict[str, Any]]):
+        # Catálogo e índice crecen con cada plantilla, sin esperar al final de la ingesta
+        for player in batch:
+            card_catalog.add(player)
+            player_index.upsert(player)
+    
+    # 6. Método principal para el juego (con fallback)
+    async def get_players(self) -> List[Dict[str, Any]]:
+        """Obtener las cartas completas del catálogo activo (con respaldo si la API falla)"""
+        return [card_catalog.card(index) for index in await self.get_card_indices()]
+    
+    async def get_card_indices(self) -> Sequence[int]:
+        """Índices en card_catalog de las cartas disponibles para repartir (secuencia de solo lectura)"""
+        if time.monotonic() >= self._catalog_expires_at:
+            # Muchas partidas empezando a la vez comparten un solo refresco, que
+            # sigue en segundo plano si no acaba dentro del SLO
             try:
-                players = await self.get_team_players(team_id)
-                for player in players:
-                    # Filtrar y formatear jugadores para el juego
-                    if player.get("strPlayer") and player.get("strPosition"):
-                        formatted_player = {
-                            "id": player.get("idPlayer"),
-                            "name": player.get("strPlayer"),
-                            "team": player.get("strTeam", "Desconocido"),
-                            "position": player.get("strPosition", "Jugador"),
-                            "nationality": player.get("strNationality", "Desconocida"),
-                            "thumb": player.get("strThumb"),  # Foto
-                            "description": player.get("strDescriptionEN", ""),
-                            "birth_date": player.get("dateBorn", ""),
-                            "birth_place": player.get("strBirthLocation", "")
-                        }
-                        all_players.append(formatted_player)
-            except Exception as e:
-                print(f"Error obteniendo jugadores del equipo {team_id}: {e}")
-                continue
+                await asyncio.wait_for(self._flights.do("catalog", self._refresh_catalog), settings.CATALOG_SLO)
+            except asyncio.TimeoutError:
+                print(f"⏱️ Catálogo sin refrescar en {settings.CATALOG_SLO}s, sirviendo caché o carga parcial")
+                if self._catalog:
+                    return self._catalog
+                # Sin caché: lo ya ingerido sirve si da para una partida
+                partial = list(self._ingestor.players) if self._ingestor else []
+                if len(partial) > 5:
+                    return tuple(card_catalog.index_of(player_id) for player_id in partial)
+                return tuple(card_catalog.add(player) for player in self._get_fallback_players())
+        # Sin copia: las partidas muestrean sobre la tupla compartida (ver CardDealer)
+        return self._catalog
+    
+    async def _refresh_catalog(self):
+        try:
+            players = await self.get_popular_players_for_game()
+            if players and len(players) > 5:
+                print(f"✅ Obtenidos {len(players)} jugadores reales de la API")
+                self._set_catalog(players, settings.CATALOG_TTL)
+                return
+            else:
+                print("⚠️ Usando jugadores de fallback")
+        except Exception as e:
+            print(f"❌ Error obteniendo jugadores reales: {e}")
         
-        # Limitar a 50 jugadores máximo y eliminar duplicados
-        unique_players = {player["id"]: player for player in all_players}.values()
-        return list(unique_players)[:50]
+        # El respaldo se cachea poco tiempo para volver a probar la API pronto
+        players = self._get_fallback_players()
+        self._set_catalog(players, settings.CATALOG_FALLBACK_TTL)
+    
+    def _set_catalog(self, players: List[Dict[str, Any]], ttl: float):
+        # Solo se guardan índices; las columnas del catálogo se comparten entre refrescos
+        self._catalog = tuple(card_catalog.add(player) for player in players)
+        question_bank.build()
+        self._catalog_expires_at = time.monotonic() + ttl
+        changes = player_index.sync(players)
+        print(f"🔎 [SEARCH] Índice actualizado: {changes}")
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "catalog_size": len(self._catalog),
+            "catalog_cards": len(card_catalog),
+            "catalog_bytes": card_catalog.memory_bytes(),
+            "in_flight": len(self._flights),
+            "coalesced_calls": self._flights.shared,
+            "breaker": self.breaker.to_dict(),
+            "retry_budget": self.retry_budget.to_dict()
+        }
+    
+    def _get_fallback_players(self) -> List[Dict[str, Any]]:
+        """Jugadores de respaldo si la API falla"""
+        return [
+            {"id": "1", "name": "Lionel Messi", "team": "Inter Miami", "position": "Delantero", "nationality": "Argentina", "thumb": None},
+            {"id": "2", "name": "Cristiano Ronaldo", "team": "Al Nassr", "position": "Delantero", "nationality": "Portugal", "thumb": None},
+            {"id": "3", "name": "Kylian Mbappé", "team": "PSG", "position": "Delantero", "nationality": "Francia", "thumb": None},
+            {"id": "4", "name": "Kevin De Bruyne", "team": "Manchester City", "position": "Mediocampista", "nationality": "Bélgica", "thumb": None},
+            {"id": "5", "name": "Virgil van Dijk", "team": "Liverpool", "position": "Defensa", "nationality": "Holanda", "thumb": None},
+            {"id": "6", "name": "Robert Lewandowski", "team": "Barcelona", "position": "Delantero", "nationality": "Polonia", "thumb": None},
+            {"id": "7", "name": "Mohamed Salah", "team": "Liverpool", "position": "Delantero", "nationality": "Egipto", "thumb": None},
+            {"id": "8", "name": "Erling Haaland", "team": "Manchester City", "position": "Delantero", "nationality": "Noruega", "thumb": None},
+            {"id": "9", "name": "Neymar Jr", "team": "Al Hilal", "position": "Delantero", "nationality": "Brasil", "thumb": None},
+            {"id": "10", "name": "Luka Modric", "team": "Real Madrid", "position": "Mediocampista", "nationality": "Croacia", "thumb": None},
+        ]
 
-football_api_service = FootballAPIService()
\ No newline at end of file
+football_api_service = FootballAPIService()
+# Nombre usado por el resto de servicios
+football_service = football_api_service
\ No newline at end of file
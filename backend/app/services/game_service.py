@@ -1,212 +1,239 @@
-from typing import Dict, List, Optional
-import random
+from typing import Dict, List, Optional, Tuple
+import uuid
+from app.core import game_engine
+from app.core.catalog import card_catalog
+from app.core.clock import real_clock
+from app.core.config import settings
+from app.core.dealing import CardDealer
+from app.core.game_engine import EngineState, PHASE_DURATIONS
 from app.services.room_service import room_service
 from app.services.football_api import football_service
+from app.services.history_service import history_service
+from app.services.checkpoint_service import checkpoint_service
+from app.services.lobby_service import lobby_index
+from app.services.question_service import question_bank
+
+
+def _round_number(ref) -> Optional[int]:
+    """Número de ronda de una referencia del cliente: 3, "3" o "round_3" """
+    text = str(ref)
+    if text.startswith("round_"):
+        text = text[len("round_"):]
+    return int(text) if text.isdigit() else None
+
+
+def _targets_question(question: Dict, question_id, round_id) -> bool:
+    """¿La respuesta es para la pregunta en curso? Vale su id, la ronda en curso o no mandar ninguno"""
+    if question_id is not None and str(question_id) == question["id"]:
+        return True
+    refs = [ref for ref in (round_id, question_id) if ref not in (None, "")]
+    return not refs or any(_round_number(ref) == question["round"] for ref in refs)
 
 class GameService:
+    """Las reglas son las de app.core.game_engine; aquí se aplican a las salas.
+
+    Cada comando se sella con la hora del reloj, se registra y se aplica al
+    EngineState de la sala. El resultado se proyecta sobre el Room que ven los
+    clientes. Lo que no son reglas también vive aquí: cartas, preguntas,
+    corrección, historial y checkpoints.
+    """
+
     def __init__(self):
-        self.game_states: Dict[str, Dict] = {}  # room_code -> game_state
-        self.player_answers: Dict[str, Dict] = {}  # room_code -> {player_id: answers}
-        self.player_votes: Dict[str, Dict] = {}  # room_code -> {voter_id: voted_id}
-        self.ready_players: Dict[str, Dict] = {}  # room_code -> {phase: [player_ids]}
+        self.engines: Dict[str, EngineState] = {}  # room_code -> estado de las reglas
+        self.logs: Dict[str, Tuple[EngineState, List[Dict]]] = {}  # room_code -> (estado base, comandos aplicados)
+        self.game_states: Dict[str, Dict] = {}  # room_code -> datos de la partida que no son reglas
+        self.ready_players: Dict[str, Dict] = {}  # room_code -> {phase: [player_ids]} en la sala de espera
+        self.dealers: Dict[str, CardDealer] = {}  # room_code -> RNG y cartas ya repartidas
+        self.clock = real_clock
     
-    async def start_game(self, room_code: str) -> Dict:
-        """Iniciar un nuevo juego en la sala"""
+    async def start_game(self, room_code: str) -> List[Dict]:
+        """Iniciar un nuevo juego en la sala; devuelve los eventos del motor"""
         room = room_service.get_room(room_code)
         if not room:
             raise ValueError("Sala no encontrada")
-        
-        # Obtener jugadores de fútbol reales
-        football_players = await football_service.get_players()
-        
-        # Asignar roles y jugadores de fútbol
-        game_data = await self._assign_roles_and_players(room, football_players)
-        
-        # Inicializar estado del juego
-        self.game_states[room_code] = {
-            "status": "playing",
-            "current_phase": "role_assignment",
-            "current_round": 1,
-            "impostor_id": game_data["impostor_id"],
-            "football_players": game_data["assigned_players"],
-            "alive_players": [p.id for p in room.players],
-            "game_winner": None
-        }
-        
-        # Inicializar estructuras de datos
-        self.player_answers[room_code] = {}
-        self.player_votes[room_code] = {}
-        self.ready_players[room_code] = {}
-        
-        # Actualizar room
+        if room.game_started:
+            raise ValueError("El juego ya comenzó")
+        
+        # Índices de las cartas disponibles en el catálogo compartido
+        football_players = await football_service.get_card_indices()
+        
+        # Una carta por jugador, muestreada sin tocar el catálogo compartido. El impostor
+        # sale de la semilla del comando, así que reaplicar el log da la misma partida
+        dealer = self.dealer(room_code)
+        cards = dealer.deal(football_players, len(room.players))
+        commands = [{"type": "join", "player_id": p.id, "name": p.name} for p in room.players]
+        commands.append({
+            "type": "start",
+            "seed": dealer.rng.getrandbits(32),
+            "cards": {p.id: card for p, card in zip(room.players, cards)},
+            "total_rounds": room.total_rounds,
+            "now": self.clock.now()
+        })
+        base = EngineState()
+        state, events = game_engine.replay(commands, base)
+        error = next((e for e in events if e["type"] == "error"), None)
+        if error:
+            raise ValueError(error["message"])
+        
+        self.engines[room_code] = state
+        self.logs[room_code] = (base, commands)
+        self.game_states[room_code] = {"game_id": uuid.uuid4().hex, "started_at": self.clock.now()}
+        self.ready_players.pop(room_code, None)
+        
+        room.status = "playing"
         room.game_started = True
-        room.current_phase = "role_assignment"
-        room.current_round = 1
-        
-        return self.game_states[room_code]
+        lobby_index.remove(room_code)
+        self._project(room_code, base, state, events)
+        checkpoint_service.mark_dirty(room_code)
+        return events
     
-    async def _assign_roles_and_players(self, room, football_players: List) -> Dict:
-        """Asignar roles de impostor y jugadores de fútbol"""
-        players = room.players
-        
-        # Elegir impostor aleatorio
-        impostor = random.choice(players)
-        impostor.is_impostor = True
-        
-        # Mezclar jugadores de fútbol
-        random.shuffle(football_players)
-        
-        # Asignar jugadores de fútbol a cada jugador
-        assigned_players = {}
-        for i, player in enumerate(players):
-            if i < len(football_players):
-                assigned_player_data = football_players[i]
-                # El impostor NO recibe información del jugador asignado
-                if player.id != impostor.id:
-                    player.assigned_player = assigned_player_data
-                assigned_players[player.id] = assigned_player_data
-        
-        return {
-            "impostor_id": impostor.id,
-            "impostor_name": impostor.name,
-            "assigned_players": assigned_players
-        }
+    def dealer(self, room_code: str) -> CardDealer:
+        if room_code not in self.dealers:
+            self.dealers[room_code] = CardDealer(no_repeat=settings.DEAL_NO_REPEAT)
+        return self.dealers[room_code]
     
-    # ✅ MÉTODOS PARA PLAYER_READY - CORREGIDOS
-    async def mark_player_ready(self, room_code: str, player_id: str, phase: str, is_ready: bool = True) -> bool:
-        """Marcar jugador como listo para una fase"""
-        if room_code not in self.ready_players:
-            self.ready_players[room_code] = {}
-        
-        if phase not in self.ready_players[room_code]:
-            self.ready_players[room_code][phase] = []
-        
-        if is_ready:
-            if player_id not in self.ready_players[room_code][phase]:
-                self.ready_players[room_code][phase].append(player_id)
-        else:
-            if player_id in self.ready_players[room_code][phase]:
-                self.ready_players[room_code][phase].remove(player_id)
-        
-        print(f"✅ Player {player_id} ready for {phase}. Ready players: {self.ready_players[room_code][phase]}")
-        return True
+    # ✅ COMANDOS
+    def apply(self, room_code: str, command: Dict) -> List[Dict]:
+        """Sellar, registrar y aplicar un comando del motor; devuelve sus eventos"""
+        state = self.engines.get(room_code)
+        if state is None:
+            return [{"type": "error", "to": command.get("player_id"), "message": "La partida no ha comenzado"}]
+        
+        command = {**command, "now": self.clock.now()}
+        new_state, events = game_engine.apply(state, command)
+        if new_state is not state:
+            self.engines[room_code] = new_state
+            self.logs[room_code][1].append(command)
+            self._project(room_code, state, new_state, events)
+            checkpoint_service.mark_dirty(room_code)
+        return events
     
-    def get_ready_players(self, room_code: str, phase: str) -> List[str]:
-        """Obtener lista de jugadores listos para una fase"""
-        if (room_code in self.ready_players and 
-            phase in self.ready_players[room_code]):
-            return self.ready_players[room_code][phase]
-        return []
+    def replay(self, room_code: str) -> Optional[EngineState]:
+        """Estado que resulta de reaplicar el log de la sala (debe coincidir con engines[room_code])"""
+        if room_code not in self.logs:
+            return None
+        base, commands = self.logs[room_code]
+        return game_engine.replay(commands, base)[0]
     
-    async def all_players_ready(self, room_code: str, phase: str) -> bool:
-        """Verificar si todos los jugadores vivos están listos"""
+    def _project(self, room_code: str, old: EngineState, new: EngineState, events: List[Dict]):
+        """Reflejar el estado del motor en el Room y ejecutar lo que no son reglas"""
         room = room_service.get_room(room_code)
         if not room:
-            return False
-        
-        ready_players = self.get_ready_players(room_code, phase)
-        game_state = self.game_states.get(room_code, {})
-        alive_players = game_state.get("alive_players", [p.id for p in room.players])
-        
-        print(f"🔍 Ready check: {len(ready_players)}/{len(alive_players)} players ready for {phase}")
-        
-        return len(ready_players) >= len(alive_players)
+            return
+        
+        # Asignar en un modelo pydantic no es gratis: solo se toca lo que cambió
+        if new.round != old.round:
+            room.current_round = room.game_state.round = new.round
+        if new.phase != old.phase:
+            room.current_phase = room.game_state.current_phase = new.phase
+            room.game_state.phase_started_at = self.clock.now()
+        if new.ready is not old.ready:
+            changed = new.ready ^ old.ready
+            for player in room.players:
+                if player.id in changed:
+                    player.is_ready = player.id in new.ready
+        
+        for event in events:
+            kind = event["type"]
+            if kind == "game_started":
+                for player in room.players:
+                    player.is_alive = True
+                    player.is_impostor = player.id == event["impostor_id"]
+                    # El impostor NO recibe información del jugador asignado
+                    player.card = None if player.is_impostor else event["cards"].get(player.id)
+            elif kind == "phase_changed":
+                print(f"🚀 Avanzando de {event['previous']} a {event['phase']}. Ronda: {event['round']}")
+                if event["phase"] == "question":
+                    self.prepare_question(room_code)
+            elif kind == "voting_complete":
+                self._record_round(room_code, room, new, event)
+            elif kind == "game_over":
+                self._finish_game(room_code, room, new)
     
-    # ✅ MÉTODO NUEVO: AVANZAR FASE DEL JUEGO
-    async def advance_game_phase(self, room_code: str) -> Dict:
-        """Avanzar a la siguiente fase del juego automáticamente"""
-        game_state = self.game_states.get(room_code)
-        room = room_service.get_room(room_code)
-        
-        if not game_state or not room:
-            return {}
-        
-        current_phase = game_state["current_phase"]
-        current_round = game_state["current_round"]
-        
-        # Lógica de transición de fases
-        phase_sequence = {
-            "role_assignment": "question",
-            "question": "debate", 
-            "debate": "voting",
-            "voting": "results",
-            "results": self._determine_next_phase(room_code)
-        }
-        
-        next_phase = phase_sequence.get(current_phase, "waiting")
-        
-        # Actualizar estados
-        game_state["current_phase"] = next_phase
-        room.current_phase = next_phase
-        
-        # Si volvemos a question, es nueva ronda
-        if next_phase == "question":
-            game_state["current_round"] += 1
-            room.current_round += 1
-            
-            # Limpiar respuestas y votos de la ronda anterior
-            if room_code in self.player_answers:
-                self.player_answers[room_code] = {}
-            if room_code in self.player_votes:
-                self.player_votes[room_code] = {}
-        
-        # Limpiar ready players de la fase anterior
-        if room_code in self.ready_players and current_phase in self.ready_players[room_code]:
-            self.ready_players[room_code][current_phase] = []
-        
-        print(f"🚀 Avanzando de {current_phase} a {next_phase}. Ronda: {game_state['current_round']}")
-        
-        return game_state
+    def _record_round(self, room_code: str, room, state: EngineState, event: Dict):
+        eliminated = next((p for p in room.players if p.id == event["eliminated_id"]), None)
+        if eliminated:
+            eliminated.is_alive = False
+            print(f"💀 Jugador eliminado: {eliminated.name}")
+        
+        history_service.record_round(
+            game_id=self.game_states.get(room_code, {}).get("game_id"),
+            room_code=room_code,
+            round_number=event["round"],
+            votes=dict(event["votes"]),
+            vote_count=event["vote_count"],
+            answers=dict(state.answers),
+            eliminated_id=event["eliminated_id"],
+            was_impostor=event["was_impostor"]
+        )
     
-    def _determine_next_phase(self, room_code: str) -> str:
-        """Determinar qué sigue después de results"""
+    def _finish_game(self, room_code: str, room, state: EngineState):
+        """Marcar el fin de la partida y enviarla al historial"""
+        room_service.mark_finished(room_code)
         game_state = self.game_states.get(room_code, {})
-        room = room_service.get_room(room_code)
-        
-        if not game_state or not room:
-            return "finished"
-        
-        alive_players = game_state.get("alive_players", [])
-        impostors_alive = len([p for p in room.players if p.is_impostor and p.id in alive_players])
-        players_alive = len(alive_players) - impostors_alive
-        
-        # Condiciones de fin del juego
-        if impostors_alive == 0:
-            game_state["game_winner"] = "players"
-            room.current_phase = "finished"
-            return "finished"
-        elif impostors_alive >= players_alive:
-            game_state["game_winner"] = "impostor" 
-            room.current_phase = "finished"
-            return "finished"
-        elif game_state["current_round"] >= room.total_rounds:
-            game_state["game_winner"] = "impostor"
-            room.current_phase = "finished"
-            return "finished"
-        else:
-            # Continuar a siguiente ronda
-            return "question"
+        history_service.record_game(
+            game_id=game_state.get("game_id"),
+            room_code=room_code,
+            winner=state.winner,
+            impostor_id=state.impostor_id,
+            players=[{"id": p.id, "name": p.name, "is_alive": p.is_alive} for p in room.players],
+            rounds_played=state.round,
+            total_rounds=state.total_rounds,
+            started_at=game_state.get("started_at")
+        )
     
-    # ✅ MÉTODO NUEVO: ELIMINAR JUGADOR
-    async def eliminate_player(self, room_code: str, player_id: str) -> bool:
-        """Eliminar jugador (marcar como no vivo)"""
+    # ✅ MÉTODOS PARA PLAYER_READY
+    async def mark_player_ready(self, room_code: str, player_id: str, phase: str, is_ready: bool = True) -> List[Dict]:
+        """Marcar jugador como listo para una fase; con todos listos el motor avanza solo"""
+        is_ready = bool(is_ready)
+        if room_code in self.engines:
+            return self.apply(room_code, {"type": "ready", "player_id": player_id, "phase": phase, "ready": is_ready})
+        
+        # En la sala de espera el "listo" es solo informativo: no hay partida a la que aplicarlo
+        ready = self.ready_players.setdefault(room_code, {}).setdefault(phase, [])
+        if is_ready and player_id not in ready:
+            ready.append(player_id)
+        elif not is_ready and player_id in ready:
+            ready.remove(player_id)
         room = room_service.get_room(room_code)
-        if not room:
-            return False
-        
-        # Encontrar y marcar jugador como muerto
-        player = next((p for p in room.players if p.id == player_id), None)
-        if player:
-            player.is_alive = False
-            print(f"💀 Jugador eliminado: {player.name}")
-            return True
-        
-        return False
+        for player in room.players if room else ():
+            if player.id == player_id:
+                player.is_ready = is_ready
+        checkpoint_service.mark_dirty(room_code)
+        return []
+    
+    def get_ready_players(self, room_code: str, phase: str) -> List[str]:
+        """Obtener lista de jugadores listos para una fase"""
+        state = self.engines.get(room_code)
+        if state is not None:
+            return [pid for pid in state.players if pid in state.ready] if state.phase == phase else []
+        return self.ready_players.get(room_code, {}).get(phase, [])
+    
+    @staticmethod
+    def _wire_cards(state: EngineState) -> Dict[str, Dict]:
+        """Cartas materializadas (internamente son índices de card_catalog)"""
+        return {pid: card_catalog.card(card) for pid, card in state.cards.items()}
+    
+    def _wire_state(self, room_code: str) -> Dict:
+        """Estado de la partida tal como lo reciben los clientes"""
+        game_state = self.game_states.get(room_code, {})
+        state = self.engines.get(room_code)
+        if state is None:
+            return dict(game_state)
+        return {
+            **game_state,
+            "status": "finished" if state.phase == "finished" else "playing",
+            "current_phase": state.phase,
+            "current_round": state.round,
+            "impostor_id": state.impostor_id,
+            "football_players": self._wire_cards(state),
+            "alive_players": [pid for pid in state.players if pid in state.alive],
+            "game_winner": state.winner
+        }
     
     # ✅ MÉTODO NUEVO: OBTENER ESTADO DEL JUEGO
     async def get_game_state(self, room_code: str) -> Dict:
         """Obtener estado completo del juego para sincronización"""
-        game_state = self.game_states.get(room_code, {})
         room = room_service.get_room(room_code)
         
         if not room:
@@ -214,7 +241,7 @@ class GameService:
         
         # Combinar game_state con room data
         combined_state = {
-            **game_state,
+            **self._wire_state(room_code),
             "code": room.code,
             "players": [p.dict() for p in room.players],
             "max_players": room.max_players,
@@ -228,99 +255,130 @@ class GameService:
         
         return combined_state
     
-    # ✅ MÉTODOS EXISTENTES (MANTENER)
-    async def save_player_answer(self, room_code: str, player_id: str, question_id: str, answer: str):
-        """Guardar respuesta de jugador"""
-        if room_code not in self.player_answers:
-            self.player_answers[room_code] = {}
-        
-        if player_id not in self.player_answers[room_code]:
-            self.player_answers[room_code][player_id] = {}
-        
-        self.player_answers[room_code][player_id][question_id] = answer
-    
-    async def all_answers_received(self, room_code: str) -> bool:
-        """Verificar si todas las respuestas fueron recibidas"""
+    # ✅ PREGUNTAS
+    def prepare_question(self, room_code: str) -> Optional[Dict]:
+        """Elegir la pregunta de la ronda entre las precalculadas que todas las cartas vivas pueden responder"""
+        state = self.engines.get(room_code)
         room = room_service.get_room(room_code)
-        if not room:
-            return False
-        
-        game_state = self.game_states.get(room_code, {})
-        alive_players = game_state.get("alive_players", [])
-        
-        if room_code not in self.player_answers:
-            return False
-        
-        return len(self.player_answers[room_code]) >= len(alive_players)
+        if state is None or not room:
+            return None
+        
+        alive_cards = [state.cards[pid] for pid in state.players if pid in state.alive and state.cards.get(pid) is not None]
+        asked = [q["attribute"] for q in room.game_state.questions]
+        question = question_bank.draw(alive_cards, asked, self.dealer(room_code).rng)
+        game_state = self.game_states.setdefault(room_code, {})
+        if question is None:
+            game_state.pop("current_question", None)
+            return None
+        
+        entry = {
+            "id": f"{state.round}:{question.id}",
+            "round": state.round,
+            "attribute": question.attribute,
+            "text": question.text
+        }
+        room.game_state.questions.append(entry)
+        game_state["current_question"] = entry
+        checkpoint_service.mark_dirty(room_code)
+        return entry
     
-    async def cast_vote(self, room_code: str, voter_id: str, voted_player_id: str) -> bool:
-        """Registrar voto de un jugador"""
-        if room_code not in self.player_votes:
-            self.player_votes[room_code] = {}
-        
-        self.player_votes[room_code][voter_id] = voted_player_id
-        print(f"🗳️ Voto registrado: {voter_id} -> {voted_player_id}")
-        return True
+    def current_question(self, room_code: str) -> Optional[Dict]:
+        return self.game_states.get(room_code, {}).get("current_question")
     
-    async def all_votes_received(self, room_code: str) -> bool:
-        """Verificar si todos los votos fueron recibidos"""
-        game_state = self.game_states.get(room_code, {})
-        alive_players = game_state.get("alive_players", [])
-        
-        if room_code not in self.player_votes:
-            return False
-        
-        all_received = len(self.player_votes[room_code]) >= len(alive_players)
-        print(f"🔍 Votes check: {len(self.player_votes[room_code])}/{len(alive_players)} votes received")
-        return all_received
+    # ✅ RESPUESTAS Y VOTOS
+    async def submit_answer(self, room_code: str, player_id: str, question_id: Optional[str], answer: str,
+                            round_id: Optional[str] = None) -> Tuple[List[Dict], Optional[bool]]:
+        """Aplicar la respuesta de un jugador; devuelve los eventos y si es correcta (None si no se puede corregir)"""
+        answer = "" if answer is None else str(answer)
+        
+        # El cliente manda "round_N" y un id de pregunta propio: basta con que sea la ronda en curso
+        question = self.current_question(room_code)
+        if question and not _targets_question(question, question_id, round_id):
+            return [{"type": "error", "to": player_id, "message": "Esa pregunta ya terminó"}], None
+        events = self.apply(room_code, {"type": "answer", "player_id": player_id, "answer": answer})
+        if not question or any(e["type"] == "error" for e in events):
+            return events, None
+        
+        # Solo se corrige contra la pregunta en curso, y nunca al impostor (no conoce su carta)
+        state = self.engines[room_code]
+        card = state.cards.get(player_id)
+        if card is None or player_id == state.impostor_id:
+            return events, None
+        correct = question_bank.grade(card, question["attribute"], answer)
+        self.game_states[room_code].setdefault("answer_grades", {}).setdefault(question["id"], {})[player_id] = correct
+        return events, correct
+    
+    def round_answers(self, room_code: str) -> Dict[str, str]:
+        """Respuestas de los jugadores vivos a la pregunta de la ronda en curso"""
+        state = self.engines.get(room_code)
+        if state is None:
+            return {}
+        return {pid: answer for pid, answer in state.answers.items() if pid in state.alive}
+    
+    async def cast_vote(self, room_code: str, voter_id: str, voted_player_id: Optional[str]) -> List[Dict]:
+        """Registrar voto de un jugador; con todos los votos el motor resuelve la votación"""
+        return self.apply(room_code, {"type": "vote", "player_id": voter_id, "voted_id": voted_player_id})
     
     def get_current_votes(self, room_code: str) -> Dict:
         """Obtener votos actuales"""
-        return self.player_votes.get(room_code, {})
+        state = self.engines.get(room_code)
+        return dict(state.votes) if state is not None else {}
+
+    # ✅ CHECKPOINTS
+    def snapshot(self, room_code: str) -> Dict:
+        """Estado de juego serializable de una sala (el log de comandos no se guarda)"""
+        state = self.engines.get(room_code)
+        return {
+            "engine": {**state.to_dict(), "cards": self._wire_cards(state)} if state is not None else None,
+            "game_state": self.game_states.get(room_code),
+            "ready_players": self.ready_players.get(room_code)
+        }
     
-    async def calculate_voting_result(self, room_code: str) -> Dict:
-        """Calcular resultado de la votación"""
-        votes = self.player_votes.get(room_code, {})
+    def restore(self, room_code: str, data: Dict):
+        """Reconstruir el estado de juego de una sala desde un snapshot"""
+        if data.get("game_state") is not None:
+            self.game_states[room_code] = data["game_state"]
+        if data.get("ready_players") is not None:
+            self.ready_players[room_code] = data["ready_players"]
+        
+        engine = data.get("engine") or self._legacy_engine(room_code, data)
+        if engine:
+            # Las cartas del checkpoint vuelven al catálogo (tras reiniciar, este puede estar vacío)
+            cards = {pid: card_catalog.resolve(card) for pid, card in engine.get("cards", {}).items()}
+            state = EngineState.from_dict({**engine, "cards": cards})
+            self.engines[room_code] = state
+            self.logs[room_code] = (state, [])
+    
+    def _legacy_engine(self, room_code: str, data: Dict) -> Optional[Dict]:
+        """Estado del motor a partir de un snapshot anterior al motor (game_state suelto)"""
+        game_state = data.get("game_state") or {}
         room = room_service.get_room(room_code)
+        if not game_state.get("impostor_id") or not room:
+            return None
         
-        if not room:
-            return {"eliminated_player": None, "vote_count": {}}
-        
-        # Contar votos
-        vote_count = {}
-        for voted_id in votes.values():
-            if voted_id:  # Solo contar votos válidos (no nulos)
-                vote_count[voted_id] = vote_count.get(voted_id, 0) + 1
-        
-        # Encontrar jugador más votado
-        eliminated_player = None
-        was_impostor = False
-        
-        if vote_count:
-            eliminated_id = max(vote_count, key=vote_count.get)
-            eliminated_player = next(
-                (p for p in room.players if p.id == eliminated_id), None
-            )
-            
-            if eliminated_player:
-                was_impostor = eliminated_player.is_impostor
-                # Marcar como eliminado
-                eliminated_player.is_alive = False
-                
-                # Actualizar lista de jugadores vivos
-                if room_code in self.game_states:
-                    if eliminated_id in self.game_states[room_code]["alive_players"]:
-                        self.game_states[room_code]["alive_players"].remove(eliminated_id)
-            
-            # Reiniciar votos para la siguiente ronda
-            self.player_votes[room_code] = {}
-        
+        phase = game_state.get("current_phase", room.current_phase)
+        started_at = room.game_state.phase_started_at or self.clock.now()
+        answers = {pid: list(by_question.values())[-1]
+                   for pid, by_question in (data.get("player_answers") or {}).items() if by_question}
         return {
-            "eliminated_player": eliminated_player.dict() if eliminated_player else None,
-            "vote_count": vote_count,
-            "was_impostor": was_impostor,
-            "results": [{"playerId": pid, "votes": count} for pid, count in vote_count.items()]
+            "phase": phase,
+            "round": game_state.get("current_round", room.current_round),
+            "total_rounds": room.total_rounds,
+            "players": [p.id for p in room.players],
+            "names": {p.id: p.name for p in room.players},
+            "alive": game_state.get("alive_players", []),
+            "impostor_id": game_state["impostor_id"],
+            "cards": game_state.get("football_players", {}),
+            "ready": (data.get("ready_players") or {}).get(phase, []),
+            "answers": answers,
+            "votes": data.get("player_votes") or {},
+            "deadline": started_at + PHASE_DURATIONS[phase] if phase in PHASE_DURATIONS else None,
+            "winner": game_state.get("game_winner")
         }
+    
+    def remove_room(self, room_code: str):
+        for store in (self.engines, self.logs, self.game_states, self.ready_players, self.dealers):
+            store.pop(room_code, None)
 
 # Instancia global
 game_service = GameService()
\ No newline at end of file
@@ -0,0 +1,238 @@
+# backend/app/services/history_service.py
+# Historial persistente de partidas con escritura diferida (write-behind) por lotes
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+
+_STOP = object()
+_tables: Dict[str, Any] = {}
+
+
+def get_tables() -> Dict[str, Any]:
+    """Definir las tablas la primera vez (SQLAlchemy se importa solo al arrancar el escritor)"""
+    if _tables:
+        return _tables
+
+    from sqlalchemy import JSON, Boolean, Column, Float, Integer, MetaData, String, Table
+
+    metadata = MetaData()
+    _tables["metadata"] = metadata
+    _tables["games"] = Table(
+        "game_history",
+        metadata,
+        Column("game_id", String(32), primary_key=True),
+        Column("room_code", String(12), index=True),
+        Column("winner", String(16)),
+        Column("impostor_id", String(32)),
+        Column("player_count", Integer),
+        Column("rounds_played", Integer),
+        Column("total_rounds", Integer),
+        Column("players", JSON),
+        Column("started_at", Float),
+        Column("finished_at", Float, index=True),
+    )
+    _tables["rounds"] = Table(
+        "round_history",
+        metadata,
+        Column("id", Integer, primary_key=True, autoincrement=True),
+        Column("game_id", String(32), index=True),
+        Column("room_code", String(12)),
+        Column("round", Integer),
+        Column("eliminated_id", String(32), nullable=True),
+        Column("was_impostor", Boolean),
+        Column("vote_count", JSON),
+        Column("votes", JSON),
+        Column("answers", JSON),
+        Column("created_at", Float),
+    )
+    return _tables
+
+
+class HistoryService:
+    """Guarda resultados de rondas y partidas sin bloquear el event loop.
+
+    El juego solo hace un put_nowait() en una cola en memoria; un hilo aparte
+    agrupa las filas y las inserta en lotes (executemany) en la base de datos.
+    """
+
+    def __init__(self, database_url: str, batch_size: int = 200, flush_interval: float = 0.5,
+                 max_queue: int = 10000, max_retry_delay: float = 30.0):
+        self.database_url = database_url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retry_delay = max_retry_delay  # espera máxima entre intentos de conexión
+        self.engine = None
+        self.dropped = 0  # Filas descartadas por cola llena
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Arrancar el hilo escritor (el engine y las tablas se crean dentro del hilo)"""
+        if self._thread:
+            return
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        from sqlalchemy import create_engine
+
+        self.engine = create_engine(self.database_url, future=True)
+        get_tables()["metadata"].create_all(self.engine)
+        self._ready.set()
+        print(f"🗄️ [HISTORY] Escritor iniciado ({self.engine.url.get_backend_name()})")
+
+    def stop(self, timeout: float = 5.0):
+        """Vaciar la cola pendiente y detener el hilo"""
+        if not self._thread:
+            return
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass  # el hilo ve _stopping en cuanto vacía la cola (o mientras reintenta conectar)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ [HISTORY] Escritor sin terminar tras {timeout}s, {self._queue.qsize()} filas pendientes")
+        self._thread = None
+        self._ready.clear()
+        if self.engine:
+            self.engine.dispose()
+
+    # ========== ENCOLADO (llamado desde el event loop) ==========
+    def record_round(self, game_id: str, room_code: str, round_number: int, votes: Dict,
+                     vote_count: Dict, answers: Dict, eliminated_id: Optional[str], was_impostor: bool):
+        self._enqueue("rounds", {
+            "game_id": game_id,
+            "room_code": room_code,
+            "round": round_number,
+            "eliminated_id": eliminated_id,
+            "was_impostor": was_impostor,
+            "vote_count": vote_count,
+            "votes": votes,
+            "answers": answers,
+            "created_at": time.time(),
+        })
+
+    def record_game(self, game_id: str, room_code: str, winner: str, impostor_id: Optional[str],
+                    players: List[Dict[str, Any]], rounds_played: int, total_rounds: int,
+                    started_at: Optional[float]):
+        self._enqueue("games", {
+            "game_id": game_id,
+            "room_code": room_code,
+            "winner": winner,
+            "impostor_id": impostor_id,
+            "player_count": len(players),
+            "rounds_played": rounds_played,
+            "total_rounds": total_rounds,
+            "players": players,
+            "started_at": started_at,
+            "finished_at": time.time(),
+        })
+
+    def _enqueue(self, table: str, row: Dict[str, Any]):
+        if not self._thread:
+            return
+        try:
+            self._queue.put_nowait((table, row))
+        except queue.Full:
+            self.dropped += 1
+
+    # ========== HILO ESCRITOR ==========
+    def _connect_with_retry(self) -> bool:
+        """Reintentar la conexión con espera creciente; mientras tanto las filas esperan en la cola"""
+        delay = 1.0
+        while not self._stopping.is_set():
+            try:
+                self._connect()
+                return True
+            except Exception as e:
+                print(f"❌ [HISTORY] No se pudo conectar a la base de datos ({e}), reintento en {delay:.0f}s")
+                self._stopping.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
+        return False
+
+    def _run(self):
+        if not self._connect_with_retry():
+            return
+
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                stopping = self._stopping.is_set()
+                continue
+
+            batch = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch: List):
+        by_table: Dict[str, List[Dict]] = {}
+        for table, row in batch:
+            by_table.setdefault(table, []).append(row)
+
+        tables = get_tables()
+        try:
+            with self.engine.begin() as conn:
+                for table, rows in by_table.items():
+                    conn.execute(tables[table].insert(), rows)
+            self.written += len(batch)
+        except Exception as e:
+            print(f"❌ [HISTORY] Error guardando {len(batch)} filas: {e}")
+
+    # ========== CONSULTAS (ejecutar fuera del event loop) ==========
+    def list_games(self, limit: int = 20, offset: int = 0, room_code: Optional[str] = None) -> List[Dict]:
+        from sqlalchemy import select
+
+        self._wait_ready()
+        games_table = get_tables()["games"]
+        query = select(games_table).order_by(games_table.c.finished_at.desc()).limit(limit).offset(offset)
+        if room_code:
+            query = query.where(games_table.c.room_code == room_code)
+        with self.engine.connect() as conn:
+            return [dict(row._mapping) for row in conn.execute(query)]
+
+    def get_game(self, game_id: str) -> Optional[Dict]:
+        from sqlalchemy import select
+
+        self._wait_ready()
+        games_table, rounds_table = get_tables()["games"], get_tables()["rounds"]
+        with self.engine.connect() as conn:
+            game = conn.execute(select(games_table).where(games_table.c.game_id == game_id)).first()
+            if not game:
+                return None
+            rounds = conn.execute(
+                select(rounds_table).where(rounds_table.c.game_id == game_id).order_by(rounds_table.c.round)
+            )
+            return {**dict(game._mapping), "rounds": [dict(row._mapping) for row in rounds]}
+
+    def _wait_ready(self, timeout: float = 10.0):
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Historial no disponible")
+
+    def stats(self) -> Dict[str, int]:
+        return {"written": self.written, "pending": self._queue.qsize(), "dropped": self.dropped}
+
+
+# Instancia global
+history_service = HistoryService(settings.DATABASE_URL)
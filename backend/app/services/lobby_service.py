@@ -0,0 +1,75 @@
+from typing import Dict, List
+
+from app.models.room import Room, RoomStatus
+
+
+class LobbyIndex:
+    """Índice de salas abiertas (esperando y con plazas libres) para el listado público.
+
+    Se actualiza en cada cambio de sala en vez de recorrer room_service.rooms, así
+    que listar una página cuesta O(limit) aunque haya miles de salas.
+    """
+
+    def __init__(self):
+        self.order: List[str] = []  # códigos abiertos, en orden de listado
+        self.positions: Dict[str, int] = {}  # código -> índice en order
+        self.summaries: Dict[str, Dict] = {}  # código -> resumen ya serializable
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    @staticmethod
+    def is_open(room: Room) -> bool:
+        return (
+            room.status == RoomStatus.WAITING
+            and not room.game_started
+            and len(room.players) < room.max_players
+        )
+
+    @staticmethod
+    def summarize(room: Room) -> Dict:
+        host = next((p.name for p in room.players if p.is_host), None)
+        return {
+            "code": room.code,
+            "host": host,
+            "players": len(room.players),
+            "max_players": room.max_players,
+            "free_slots": room.max_players - len(room.players),
+            "total_rounds": room.total_rounds,
+            "debate_mode": room.debate_mode
+        }
+
+    def update(self, room: Room):
+        """Reindexar una sala tras crearla, unirse alguien o empezar la partida"""
+        if not self.is_open(room):
+            self.remove(room.code)
+            return
+
+        if room.code not in self.positions:
+            self.positions[room.code] = len(self.order)
+            self.order.append(room.code)
+        self.summaries[room.code] = self.summarize(room)
+
+    def remove(self, code: str):
+        """Quitar una sala en O(1): el último código ocupa su hueco"""
+        index = self.positions.pop(code, None)
+        if index is None:
+            return
+
+        last = self.order.pop()
+        if last != code:
+            self.order[index] = last
+            self.positions[last] = index
+        self.summaries.pop(code, None)
+
+    def page(self, offset: int, limit: int) -> Dict:
+        codes = self.order[offset:offset + limit]
+        next_offset = offset + len(codes)
+        return {
+            "rooms": [self.summaries[code] for code in codes],
+            "total": len(self.order),
+            "next_offset": next_offset if next_offset < len(self.order) else None
+        }
+
+# Instancia global
+lobby_index = LobbyIndex()
@@ -0,0 +1,230 @@
+from typing import Callable, Dict, List, Optional
+from collections import deque
+import asyncio
+import heapq
+import itertools
+import uuid
+
+from app.core.clock import real_clock
+from app.core.config import settings
+from app.models.room import RoomCreate
+from app.services.room_service import room_service
+
+
+class Ticket:
+    """Un jugador en la cola de partida rápida"""
+
+    __slots__ = ("id", "player_name", "clock", "enqueued_at", "status", "room_code", "player_id", "notify")
+
+    def __init__(self, player_name: str, clock=real_clock):
+        self.id = uuid.uuid4().hex
+        self.player_name = player_name
+        self.clock = clock
+        self.enqueued_at = clock.monotonic()
+        self.status = "queued"  # queued | matched | cancelled
+        self.room_code: Optional[str] = None
+        self.player_id: Optional[str] = None
+        self.notify: Optional[Callable] = None  # callback async del WebSocket que espera
+
+    def to_dict(self) -> Dict:
+        data = {"ticket_id": self.id, "status": self.status}
+        if self.status == "queued":
+            data["waited"] = round(self.clock.monotonic() - self.enqueued_at, 1)
+        elif self.status == "matched":
+            data["room_code"] = self.room_code
+            data["player_id"] = self.player_id
+        return data
+
+
+class MatchmakingService:
+    """Cola de partida rápida: agrupa jugadores sueltos en salas por lotes.
+
+    La cola es un heap por antigüedad (push/pop O(log n)); cancelar solo marca el
+    ticket y el heap lo descarta al llegar a él. Un bucle periódico forma en cada
+    pasada todas las salas completas posibles, y una sala parcial si el más
+    antiguo ya esperó más de `max_wait`.
+    """
+
+    def __init__(self, room_size: int = None, min_players: int = None, max_wait: float = None,
+                 interval: float = None, max_queue: int = None, ticket_ttl: float = 120.0, clock=real_clock):
+        self.room_size = room_size or settings.MATCHMAKING_ROOM_SIZE
+        self.min_players = min_players or settings.MATCHMAKING_MIN_PLAYERS
+        self.max_wait = max_wait or settings.MATCHMAKING_MAX_WAIT
+        self.interval = interval or settings.MATCHMAKING_INTERVAL
+        self.max_queue = max_queue or settings.MATCHMAKING_MAX_QUEUE
+        self.ticket_ttl = ticket_ttl
+        self.clock = clock  # esperas, caducidad de tickets y el bucle van con el reloj inyectable
+
+        self.tickets: Dict[str, Ticket] = {}
+        self._heap: List[tuple] = []  # (enqueued_at, seq, ticket_id)
+        self._seq = itertools.count()
+        self._queued = 0  # tickets vivos en la cola (el heap puede tener cancelados)
+        self._expiry: deque = deque()  # (expira_en, ticket_id) de tickets ya resueltos
+        self._task: Optional[asyncio.Task] = None
+        self.rooms_formed = 0
+        self.players_matched = 0
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    def enqueue(self, player_name: str) -> Ticket:
+        if self._queued >= self.max_queue:
+            raise OverflowError("Cola de partida rápida llena")
+
+        ticket = Ticket(player_name, self.clock)
+        self.tickets[ticket.id] = ticket
+        heapq.heappush(self._heap, (ticket.enqueued_at, next(self._seq), ticket.id))
+        self._queued += 1
+        return ticket
+
+    def cancel(self, ticket_id: str) -> bool:
+        ticket = self.tickets.get(ticket_id)
+        if not ticket or ticket.status != "queued":
+            return False
+
+        ticket.status = "cancelled"
+        ticket.notify = None
+        self._queued -= 1
+        self._expire_later(ticket)
+        return True
+
+    def get_ticket(self, ticket_id: str) -> Optional[Ticket]:
+        return self.tickets.get(ticket_id)
+
+    def _expire_later(self, ticket: Ticket):
+        self._expiry.append((self.clock.monotonic() + self.ticket_ttl, ticket.id))
+
+    def _purge_expired(self):
+        now = self.clock.monotonic()
+        while self._expiry and self._expiry[0][0] <= now:
+            self.tickets.pop(self._expiry.popleft()[1], None)
+
+    def _pop_live(self, count: int) -> List[Ticket]:
+        """Sacar hasta `count` tickets vivos, descartando los cancelados"""
+        batch = []
+        while self._heap and len(batch) < count:
+            ticket = self.tickets.get(heapq.heappop(self._heap)[2])
+            if ticket and ticket.status == "queued":
+                batch.append(ticket)
+        self._queued -= len(batch)
+        return batch
+
+    def _requeue(self, batch: List[Ticket]):
+        """Devolver a la cola un lote que no llegó a sala, conservando su antigüedad"""
+        for ticket in batch:
+            ticket.room_code = None
+            ticket.player_id = None
+            if ticket.status == "queued":
+                heapq.heappush(self._heap, (ticket.enqueued_at, next(self._seq), ticket.id))
+                self._queued += 1
+
+    def _oldest_wait(self) -> float:
+        while self._heap:
+            enqueued_at, _, ticket_id = self._heap[0]
+            ticket = self.tickets.get(ticket_id)
+            if ticket and ticket.status == "queued":
+                return self.clock.monotonic() - enqueued_at
+            heapq.heappop(self._heap)
+        return 0.0
+
+    def _next_batches(self) -> List[List[Ticket]]:
+        batches = []
+        while self._queued >= self.room_size:
+            batches.append(self._pop_live(self.room_size))
+        # Lo que queda no llena una sala: se agrupa igual si el más antiguo ya esperó demasiado
+        if self._queued >= self.min_players and self._oldest_wait() >= self.max_wait:
+            batches.append(self._pop_live(self._queued))
+        return batches
+
+    async def _form_room(self, batch: List[Ticket]):
+        """Crear la sala con el primero como host y unir al resto por el camino normal"""
+        code = room_service.generate_code()
+        host, guests = batch[0], batch[1:]
+        room = await room_service.create_room(code, RoomCreate(
+            player_name=host.player_name,
+            max_players=self.room_size
+        ))
+        try:
+            host.player_id = room.players[0].id
+
+            taken = {host.player_name.lower()}
+            for ticket in guests:
+                name = ticket.player_name
+                suffix = 2
+                while name.lower() in taken:
+                    name = f"{ticket.player_name} ({suffix})"
+                    suffix += 1
+                taken.add(name.lower())
+                ticket.player_id = (await room_service.add_player(code, name)).id
+        except Exception:
+            room_service.remove_room(code)  # sala a medias: nadie llegará a entrar
+            raise
+
+        for ticket in batch:
+            ticket.status = "matched"
+            ticket.room_code = code
+            self._expire_later(ticket)
+
+        self.rooms_formed += 1
+        self.players_matched += len(batch)
+        print(f"🎯 [MATCHMAKING] Sala {code} formada con {len(batch)} jugadores")
+        return code
+
+    async def run_once(self) -> int:
+        """Una pasada del matchmaker: forma todas las salas posibles y avisa a los que esperan"""
+        self._purge_expired()
+        batches = self._next_batches()
+        if not batches:
+            return 0
+
+        formed = []
+        for index, batch in enumerate(batches):
+            try:
+                await self._form_room(batch)
+            except Exception as e:
+                # Los lotes sin sala vuelven a la cola: sus jugadores siguen esperando, no se pierden
+                print(f"❌ [MATCHMAKING] Error formando sala, {len(batches) - index} lotes devueltos a la cola: {e}")
+                for pending in batches[index:]:
+                    self._requeue(pending)
+                break
+            formed.append(batch)
+
+        notifications = [
+            ticket.notify(ticket.to_dict())
+            for batch in formed for ticket in batch if ticket.notify
+        ]
+        if notifications:
+            await asyncio.gather(*notifications, return_exceptions=True)
+        return len(formed)
+
+    async def _loop(self):
+        while True:
+            await self.clock.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"❌ [MATCHMAKING] Error formando salas: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        return {
+            "queued": self._queued,
+            "rooms_formed": self.rooms_formed,
+            "players_matched": self.players_matched
+        }
+
+# Instancia global
+matchmaking_service = MatchmakingService()
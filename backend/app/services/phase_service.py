@@ -0,0 +1,160 @@
+from typing import Dict, List
+from datetime import datetime
+import asyncio
+
+from app.core.clock import real_clock
+from app.core.game_engine import PHASE_DURATIONS
+from app.services.answer_analysis import analyze_answers
+from app.services.room_service import room_service
+from app.services.game_service import game_service
+from app.services.connection_manager import manager
+
+# Mensaje específico para cada fase
+PHASE_MESSAGES = {
+    "role_assignment": "🎭 Asignando roles...",
+    "question": "❓ Responde la pregunta sobre tu jugador",
+    "debate": "💬 Debate - Encuentren al impostor!",
+    "voting": "🗳️ Voten por quien creen que es el impostor",
+    "results": "📊 Mostrando resultados..."
+}
+
+class PhaseManager:
+    """Traduce los eventos del motor a mensajes para la sala y programa el tick de cada fase"""
+
+    def __init__(self, clock=real_clock):
+        self.clock = clock  # RealClock en producción; VirtualClock en simulaciones
+        self.durations = PHASE_DURATIONS
+        self._timers: Dict[str, asyncio.Task] = {}  # room_code -> timer de la fase en curso
+
+    def use_clock(self, clock):
+        """Cambiar el reloj de fases y partidas (p. ej. un VirtualClock para simular sin esperas)"""
+        self.clock = clock
+        game_service.clock = clock
+
+    async def begin_game(self, room_code: str) -> List[Dict]:
+        """Iniciar partida, entrar en role_assignment y notificar a la sala"""
+        events = await game_service.start_game(room_code)
+        room = room_service.get_room(room_code)
+        print(f"🎮 [GAME] Juego iniciado en {room_code} con {len(room.players)} jugadores")
+        await self.publish(room_code, events)
+        return events
+
+    async def publish(self, room_code: str, events: List[Dict]):
+        """Enviar a la sala los cambios de partida de una lista de eventos del motor.
+
+        Los ecos de cada acción (player_ready, answer_submitted, vote_submitted) y
+        los errores personales los manda el handler que aplicó el comando.
+        """
+        for event in events:
+            kind = event["type"]
+            if kind == "game_started":
+                await self._game_started(room_code)
+            elif kind == "phase_changed":
+                await self._phase_changed(room_code, event)
+            elif kind == "voting_complete":
+                await self._voting_complete(room_code, event)
+            elif kind == "game_over":
+                self.cancel(room_code)
+                room = room_service.get_room(room_code)
+                await manager.broadcast_to_room(room_code, {
+                    "type": "game_over",
+                    "winner": event["winner"],
+                    "room": room.dict() if room else None,
+                    "gameState": game_service._wire_state(room_code)
+                })
+
+    async def _game_started(self, room_code: str):
+        room = room_service.get_room(room_code)
+        game_data = game_service._wire_state(room_code)
+        await manager.broadcast_to_room(room_code, {
+            "type": "game_started",
+            "message": "¡El juego ha comenzado!",
+            "room": room.dict(),
+            "gameState": game_data,
+            "impostor_id": game_data["impostor_id"],
+            "assigned_players": game_data["football_players"],
+            "football_players": list(game_data["football_players"].values()),
+            "current_phase": "role_assignment",
+            "currentPhase": "role_assignment",
+            "timestamp": datetime.fromtimestamp(self.clock.now()).isoformat()
+        })
+
+    async def _phase_changed(self, room_code: str, event: Dict):
+        room = room_service.get_room(room_code)
+        if not room:
+            return
+
+        phase_name = event["phase"]
+        question = game_service.current_question(room_code) if phase_name == "question" else None
+        analysis = await analyze_answers(game_service.round_answers(room_code)) if phase_name == "results" else None
+
+        print(f"🔄 [PHASE] Cambiando a fase {phase_name} en sala {room_code}")
+
+        await manager.broadcast_to_room(room_code, {
+            "type": "phase_changed",
+            "phase": phase_name,
+            "previousPhase": event["previous"],
+            "message": PHASE_MESSAGES.get(phase_name, "Nueva fase iniciada"),
+            "duration": self.durations.get(phase_name),
+            "room": room.dict(),
+            "game_state": room.game_state.dict(),
+            "question": question,
+            "answerAnalysis": analysis
+        })
+
+        # Programar el tick que cierra la fase
+        if event["deadline"] is not None:
+            self._schedule(room_code, event["deadline"])
+
+    async def _voting_complete(self, room_code: str, event: Dict):
+        room = room_service.get_room(room_code)
+        if not room:
+            return
+        eliminated = next((p for p in room.players if p.id == event["eliminated_id"]), None)
+        await manager.broadcast_to_room(room_code, {
+            "type": "voting_complete",
+            "votingResults": [{"playerId": pid, "votes": count} for pid, count in event["vote_count"].items()],
+            "eliminatedPlayer": eliminated.dict() if eliminated else None,
+            "wasImpostor": event["was_impostor"],
+            "nextPhase": "results",
+            "room": room.dict()
+        })
+
+    def _schedule(self, room_code: str, deadline: float):
+        self.cancel(room_code)
+        self._timers[room_code] = asyncio.create_task(self._expire(room_code, deadline))
+
+    async def _expire(self, room_code: str, deadline: float):
+        while True:
+            await self.clock.sleep(max(0.0, deadline - self.clock.now()))
+            state = game_service.engines.get(room_code)
+            # Ignorar timers de fases que ya terminaron antes de tiempo
+            if state is None or state.deadline != deadline:
+                return
+            expired = state.phase
+            events = game_service.apply(room_code, {"type": "tick"})
+            if events:
+                break
+            # El sleep puede despertar un poco antes del vencimiento: el motor aún no cierra la fase
+
+        self._timers.pop(room_code, None)
+        print(f"⏰ [PHASE] Tiempo agotado en {expired} para {room_code}")
+        await self.publish(room_code, events)
+
+    def cancel(self, room_code: str):
+        timer = self._timers.pop(room_code, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+    def resume_phase(self, room_code: str):
+        """Reprogramar el timer de la fase en curso tras un reinicio"""
+        state = game_service.engines.get(room_code)
+        if state is None or state.deadline is None:
+            return
+
+        remaining = max(0, state.deadline - self.clock.now())
+        print(f"♻️ [PHASE] Retomando {state.phase} en {room_code}, quedan {remaining:.0f}s")
+        self._schedule(room_code, state.deadline)
+
+# Instancia global
+phase_manager = PhaseManager()
\ No newline at end of file
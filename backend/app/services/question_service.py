@@ -0,0 +1,129 @@
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import random
+import re
+
+from app.core.catalog import card_catalog
+from app.services.search_index import normalize, _within_distance
+
+# Preguntas por atributo de la carta: varias formulaciones para no repetir siempre la misma
+QUESTION_TEMPLATES = {
+    "nationality": ["¿De qué país es tu jugador?", "¿Qué nacionalidad tiene tu jugador?"],
+    "position": ["¿En qué posición juega tu jugador?", "¿Dónde juega tu jugador en el campo?"],
+    "team": ["¿En qué equipo juega tu jugador?", "¿Qué camiseta lleva tu jugador?"],
+    "birth_place": ["¿Dónde nació tu jugador?", "¿Cuál es la ciudad natal de tu jugador?"],
+    "era": ["¿En qué década nació tu jugador?", "¿De qué generación es tu jugador (década)?"],
+}
+ATTRIBUTES = tuple(QUESTION_TEMPLATES)
+_ATTRIBUTE_BIT = {attribute: 1 << i for i, attribute in enumerate(ATTRIBUTES)}
+_COLUMNS = {
+    "nationality": "nationalities",
+    "position": "positions",
+    "team": "teams",
+    "birth_place": "birth_places",
+}
+_YEAR = re.compile(r"\d{4}|\d{2}")
+
+
+class Question(NamedTuple):
+    id: str
+    attribute: str
+    text: str
+
+
+def _decade(text: str) -> int:
+    """'1994-03-02' -> 1990, '90s' -> 1990; 0 si no hay año"""
+    match = _YEAR.search(text or "")
+    if not match:
+        return 0
+    year = int(match.group())
+    if len(match.group()) == 2:
+        year += 1900 if year >= 30 else 2000
+    return year - year % 10
+
+
+class QuestionBank:
+    """Banco de preguntas precalculado sobre card_catalog.
+
+    Al cargar el catálogo se normalizan una sola vez las strings internadas
+    (equipos, países, posiciones, lugares) y se calcula por carta la década de
+    nacimiento y una máscara con los atributos que se le pueden preguntar. En
+    cada ronda elegir pregunta es O(jugadores de la sala) y corregir una
+    respuesta es una comparación contra el valor ya normalizado.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.by_attribute: Dict[str, List[Question]] = {
+            attribute: [Question(f"{attribute}:{i}", attribute, text) for i, text in enumerate(texts)]
+            for attribute, texts in QUESTION_TEMPLATES.items()
+        }
+        self.questions: Dict[str, Question] = {
+            q.id: q for questions in self.by_attribute.values() for q in questions
+        }
+        self.normalized: List[str] = []  # paralela a card_catalog.strings.values
+        self.eras = array("H")  # década de nacimiento por carta (0 = desconocida)
+        self.askable = array("B")  # máscara de atributos con respuesta por carta
+        self.rng = random.Random(seed)
+
+    def build(self):
+        """Recalcular todo (al refrescar el catálogo, que puede actualizar cartas)"""
+        self.normalized = []
+        self.eras = array("H")
+        self.askable = array("B")
+        self.sync()
+
+    def sync(self):
+        """Precalcular solo lo que el catálogo ha añadido desde la última vez"""
+        strings = card_catalog.strings.values
+        for value in strings[len(self.normalized):]:
+            self.normalized.append(normalize(value) if value else "")
+
+        for index in range(len(self.eras), len(card_catalog)):
+            era = _decade(card_catalog.birth_dates[index])
+            mask = _ATTRIBUTE_BIT["era"] if era else 0
+            for attribute, column in _COLUMNS.items():
+                if getattr(card_catalog, column)[index]:
+                    mask |= _ATTRIBUTE_BIT[attribute]
+            self.eras.append(era)
+            self.askable.append(mask)
+
+    def draw(self, cards: Sequence[int], asked: Sequence[str] = (), rng: Optional[random.Random] = None) -> Optional[Question]:
+        """Pregunta que todas las cartas de la sala pueden responder, evitando atributos ya preguntados"""
+        self.sync()
+        mask = (1 << len(ATTRIBUTES)) - 1
+        for card in cards:
+            mask &= self.askable[card]
+        candidates = [a for a in ATTRIBUTES if mask & _ATTRIBUTE_BIT[a]]
+        if not candidates:
+            return None
+        fresh = [a for a in candidates if a not in asked]
+        rng = rng or self.rng
+        return rng.choice(self.by_attribute[rng.choice(fresh or candidates)])
+
+    def answer_for(self, card: int, attribute: str) -> str:
+        if attribute == "era":
+            return f"{self.eras[card]}s" if self.eras[card] else ""
+        return card_catalog.strings[getattr(card_catalog, _COLUMNS[attribute])[card]] or ""
+
+    def grade(self, card: int, attribute: str, answer: str) -> bool:
+        """¿La respuesta coincide con la carta? Tolera tildes, mayúsculas, respuestas parciales y una errata"""
+        self.sync()
+        if attribute == "era":
+            return bool(self.eras[card]) and _decade(answer) == self.eras[card]
+
+        expected = self.normalized[getattr(card_catalog, _COLUMNS[attribute])[card]]
+        given = normalize(answer)
+        if not expected or not given:
+            return False
+        if given == expected:
+            return True
+        # 'Madrid' vale para 'Real Madrid'; 'Centre Back' para 'Centre-Back'
+        expected_tokens = expected.split()
+        given_tokens = given.split()
+        if all(token in expected_tokens for token in given_tokens) and len(given) >= 4:
+            return True
+        return len(expected) >= 5 and _within_distance(given, expected, 1)
+
+
+# Instancia global
+question_bank = QuestionBank()
@@ -0,0 +1,93 @@
+from typing import Dict, List, Optional
+import asyncio
+
+from app.core.clock import real_clock
+from app.core.config import settings
+from app.models.room import RoomStatus
+from app.services.room_service import room_service
+from app.services.game_service import game_service
+from app.services.phase_service import phase_manager
+from app.services.chat_service import chat_service
+from app.services.connection_manager import manager
+from app.services.spectator_service import spectator_feed
+
+
+class RoomJanitor:
+    """Desaloja las salas abandonadas para que no cuenten como vivas ni vuelvan tras un reinicio.
+
+    Una sala queda ociosa cuando no tiene ningún socket (ni jugadores ni
+    espectadores). Si sigue así más de `idle_ttl` esperando jugadores, o más de
+    `finished_ttl` con la partida terminada, se borra: sala, lobby y journal
+    (room_service.remove_room deja la lápida), chat, estado de juego y timers.
+    Las partidas en curso no se tocan: sus timers las llevan hasta el final.
+    """
+
+    def __init__(self, idle_ttl: float = None, finished_ttl: float = None, interval: float = None, clock=real_clock):
+        self.idle_ttl = idle_ttl if idle_ttl is not None else settings.ROOM_IDLE_TTL
+        self.finished_ttl = finished_ttl if finished_ttl is not None else settings.ROOM_FINISHED_TTL
+        self.interval = interval or settings.ROOM_SWEEP_INTERVAL
+        self.clock = clock
+        self.idle_since: Dict[str, float] = {}  # sala -> desde cuándo no tiene sockets
+        self.evicted = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _ttl(self, room) -> Optional[float]:
+        if room.status == RoomStatus.FINISHED:
+            return self.finished_ttl
+        if not room.game_started:
+            return self.idle_ttl
+        return None
+
+    def sweep(self) -> List[str]:
+        """Una pasada: devuelve los códigos desalojados"""
+        now = self.clock.monotonic()
+        evicted = []
+        for code, room in list(room_service.rooms.items()):
+            if code in manager.active_connections or spectator_feed.count(code):
+                self.idle_since.pop(code, None)
+                continue
+            since = self.idle_since.setdefault(code, now)
+            ttl = self._ttl(room)
+            if ttl is not None and now - since >= ttl:
+                self.evict(code)
+                evicted.append(code)
+
+        # Salas que ya no existen (borradas por otro camino)
+        for code in [code for code in self.idle_since if code not in room_service.rooms]:
+            del self.idle_since[code]
+        if evicted:
+            print(f"🧹 [ROOMS] {len(evicted)} salas abandonadas desalojadas")
+        return evicted
+
+    def evict(self, code: str):
+        phase_manager.cancel(code)
+        game_service.remove_room(code)
+        chat_service.remove_room(code)
+        room_service.remove_room(code)
+        self.idle_since.pop(code, None)
+        self.evicted += 1
+
+    async def _loop(self):
+        while True:
+            await self.clock.sleep(self.interval)
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"❌ [ROOMS] Error desalojando salas: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Instancia global
+room_janitor = RoomJanitor()
@@ -1,15 +1,26 @@
-from app.models.room import Room, Player, RoomCreate
-from app.services.football_api import football_service
+from app.models.room import Room, Player, RoomCreate, RoomStatus
+from app.core.sharding import owns_room
+from app.services.checkpoint_service import checkpoint_service
+from app.services.lobby_service import lobby_index
 import random
+import string
 
 class RoomService:
     def __init__(self):
         self.rooms: dict[str, Room] = {}
+        self.finished: set[str] = set()  # salas terminadas (siguen en memoria, no cuentan como vivas)
+    
+    def generate_code(self) -> str:
+        """Generar código único (y que pertenezca a este shard en modo multi-proceso)"""
+        while True:
+            code = ''.join(random.choices(string.ascii_uppercase, k=6))
+            if code not in self.rooms and owns_room(code):
+                return code
     
     async def create_room(self, code: str, room_data: RoomCreate) -> Room:
         """Crear una nueva sala"""
         host_player = Player(
-            id=f"player-{random.randint(1000, 9999)}",
+            id=f"player_{random.randint(1000, 9999)}",
             name=room_data.player_name,
             is_host=True
         )
@@ -23,8 +34,20 @@ class RoomService:
         )
         
         self.rooms[code] = room
+        lobby_index.update(room)
+        checkpoint_service.mark_dirty(code)
         return room
     
+    def live_rooms(self) -> int:
+        """Salas esperando o en partida, en O(1): se consulta en cada alta de sala"""
+        return len(self.rooms) - len(self.finished)
+    
+    def mark_finished(self, code: str):
+        room = self.rooms.get(code)
+        if room:
+            room.status = RoomStatus.FINISHED
+            self.finished.add(code)
+    
     def get_room(self, code: str) -> Room:
         """Obtener sala por código"""
         return self.rooms.get(code)
@@ -36,10 +59,23 @@ class RoomService:
             raise ValueError("Sala no encontrada")
         
         new_player = Player(
-            id=f"player-{random.randint(1000, 9999)}",
+            id=f"player_{random.randint(1000, 9999)}",
             name=player_name,
             is_host=False
         )
         
         room.players.append(new_player)
-        return new_player
\ No newline at end of file
+        lobby_index.update(room)
+        checkpoint_service.mark_dirty(room_code)
+        return new_player
+    
+    def remove_room(self, code: str):
+        """Eliminar una sala (y sacarla del lobby)"""
+        if self.rooms.pop(code, None) is not None:
+            self.finished.discard(code)
+            lobby_index.remove(code)
+            checkpoint_service.mark_dirty(code)
+
+
+# Instancia global
+room_service = RoomService()
@@ -0,0 +1,202 @@
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import bisect
+import heapq
+import re
+import unicodedata
+
+from app.core.catalog import card_catalog
+
+SEARCH_FIELDS = ("name", "team", "nationality", "position")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sin tildes y sin signos: 'Mbappé' -> 'mbappe'"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(" ", stripped.casefold()).strip()
+
+
+def tokenize(text: str) -> List[str]:
+    return normalize(text).split()
+
+
+def _trigrams(token: str) -> Set[str]:
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _within_distance(a: str, b: str, limit: int) -> bool:
+    """Levenshtein acotado: corta en cuanto la fila supera el límite"""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+class FieldIndex:
+    """Índice invertido de un campo: token -> ids, tokens ordenados para prefijos y trigramas para fuzzy"""
+
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}
+        self.sorted_tokens: List[str] = []
+        self.trigrams: Dict[str, Set[str]] = {}
+
+    def add(self, token: str, doc_id: str):
+        ids = self.postings.get(token)
+        if ids is None:
+            ids = self.postings[token] = set()
+            bisect.insort(self.sorted_tokens, token)
+            for gram in _trigrams(token):
+                self.trigrams.setdefault(gram, set()).add(token)
+        ids.add(doc_id)
+
+    def discard(self, token: str, doc_id: str):
+        ids = self.postings.get(token)
+        if ids is None:
+            return
+        ids.discard(doc_id)
+        if not ids:
+            del self.postings[token]
+            del self.sorted_tokens[bisect.bisect_left(self.sorted_tokens, token)]
+            for gram in _trigrams(token):
+                tokens = self.trigrams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self.trigrams[gram]
+
+    def prefix(self, term: str) -> Iterable[str]:
+        start = bisect.bisect_left(self.sorted_tokens, term)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(term):
+                break
+            yield token
+
+    def fuzzy(self, term: str) -> List[str]:
+        """Tokens a distancia de edición 1 (2 para términos largos), preseleccionados por trigramas"""
+        limit = 1 if len(term) <= 5 else 2
+        shared: Dict[str, int] = {}
+        for gram in _trigrams(term):
+            for token in self.trigrams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        # Cada edición rompe como mucho 3 trigramas
+        min_shared = max(1, len(term) + 1 - 3 * limit)
+        return [
+            token for token, count in shared.items()
+            if count >= min_shared and _within_distance(term, token, limit)
+        ]
+
+
+class PlayerSearchIndex:
+    """Búsqueda local sobre el catálogo de jugadores (sin red).
+
+    Cada término de la consulta debe aparecer en algún campo: primero como token
+    exacto, luego como prefijo y, si no hay nada, con un error de escritura.
+    upsert/remove/sync solo tocan los tokens de los jugadores que cambian. El
+    índice no guarda los jugadores: `resolve` los materializa desde el catálogo.
+    """
+
+    EXACT, PREFIX, FUZZY = 3.0, 2.0, 1.0
+
+    def __init__(self, fields: Tuple[str, ...] = SEARCH_FIELDS, resolve: Callable[[str], Optional[Dict]] = None):
+        self.fields = fields
+        self.resolve = resolve or card_catalog.card_by_id
+        self.indexes: Dict[str, FieldIndex] = {field: FieldIndex() for field in fields}
+        self._tokens: Dict[str, Dict[str, Tuple[str, ...]]] = {}  # id -> campo -> tokens indexados
+        self._names: Dict[str, str] = {}  # id -> nombre normalizado, para desempatar
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def upsert(self, doc: Dict) -> bool:
+        """Indexar un jugador; devuelve True si cambió algún token"""
+        doc_id = str(doc.get("id") or "")
+        if not doc_id:
+            return False
+
+        tokens = {field: tuple(tokenize(str(doc.get(field) or ""))) for field in self.fields}
+        previous = self._tokens.get(doc_id)
+        if previous == tokens:
+            return False
+        previous = previous or {}
+        for field in self.fields:
+            old, new = previous.get(field, ()), tokens[field]
+            if old == new:
+                continue
+            index = self.indexes[field]
+            for token in set(old) - set(new):
+                index.discard(token, doc_id)
+            for token in set(new) - set(old):
+                index.add(token, doc_id)
+
+        self._tokens[doc_id] = tokens
+        self._names[doc_id] = " ".join(tokens.get("name", ()))
+        return True
+
+    def remove(self, doc_id: str):
+        tokens = self._tokens.pop(doc_id, None)
+        self._names.pop(doc_id, None)
+        if tokens:
+            for field, field_tokens in tokens.items():
+                for token in set(field_tokens):
+                    self.indexes[field].discard(token, doc_id)
+
+    def sync(self, docs: Iterable[Dict]) -> Dict[str, int]:
+        """Dejar el índice igual que el catálogo, reindexando solo lo que cambió"""
+        incoming = {str(doc["id"]): doc for doc in docs if doc.get("id")}
+        removed = [doc_id for doc_id in self._tokens if doc_id not in incoming]
+        for doc_id in removed:
+            self.remove(doc_id)
+
+        changed = sum(self.upsert(doc) for doc in incoming.values())
+        return {"removed": len(removed), "changed": changed, "total": len(self._tokens)}
+
+    def _term_hits(self, term: str, fields: Tuple[str, ...]) -> Dict[str, float]:
+        hits: Dict[str, float] = {}
+        for field in fields:
+            index = self.indexes[field]
+            for token in index.prefix(term):
+                weight = self.EXACT if token == term else self.PREFIX
+                for doc_id in index.postings[token]:
+                    if hits.get(doc_id, 0) < weight:
+                        hits[doc_id] = weight
+        if hits or len(term) < 3:
+            return hits
+
+        for field in fields:
+            index = self.indexes[field]
+            for token in index.fuzzy(term):
+                for doc_id in index.postings[token]:
+                    hits.setdefault(doc_id, self.FUZZY)
+        return hits
+
+    def search(self, query: str, fields: Optional[Iterable[str]] = None, limit: int = 20) -> List[Dict]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+        fields = tuple(f for f in (fields or self.fields) if f in self.indexes)
+
+        scores: Optional[Dict[str, float]] = None
+        # Empezar por el término más largo: suele ser el más selectivo
+        for term in sorted(set(terms), key=len, reverse=True):
+            hits = self._term_hits(term, fields)
+            if scores is None:
+                scores = hits
+            else:
+                scores = {doc_id: score + hits[doc_id] for doc_id, score in scores.items() if doc_id in hits}
+            if not scores:
+                return []
+
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda item: (-item[1], self._names.get(item[0], "")))
+        return [doc for doc in (self.resolve(doc_id) for doc_id, _ in ranked) if doc]
+
+# Instancia global: la mantiene FootballAPIService al refrescar el catálogo (resuelve contra card_catalog)
+player_index = PlayerSearchIndex()
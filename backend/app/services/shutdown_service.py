@@ -0,0 +1,109 @@
+from typing import Optional
+import asyncio
+import random
+import signal
+import time
+
+from app.core.config import settings
+from app.services.admission_service import admission
+from app.services.checkpoint_service import checkpoint_service
+from app.services.connection_manager import manager
+from app.services.spectator_service import spectator_feed
+
+# Código de cierre WebSocket "Service Restart": el cliente debe reconectar, no abandonar
+SERVER_MOVING_CLOSE_CODE = 1012
+
+
+class ShutdownCoordinator:
+    """Apagado ordenado al recibir SIGTERM (redeploy de Render).
+
+    uvicorn, al apagarse, corta todos los WebSockets con 1012 a la vez y solo
+    después ejecuta el shutdown del lifespan; para entonces ya no hay a quién
+    avisar. Por eso el relevo se engancha a SIGTERM: primero se deja de admitir
+    trabajo nuevo, se esperan los broadcasts en curso (con plazo), se guarda el
+    checkpoint y se cierra cada socket con `server_moving` y un retraso de
+    reconexión aleatorio distinto para cada cliente. Solo entonces sigue el
+    apagado normal de uvicorn, que se relanza con SIGINT (uvicorn atiende
+    SIGINT y SIGTERM con el mismo handler, y SIGINT sigue siendo suyo).
+    """
+
+    def __init__(self):
+        self.started_at: Optional[float] = None
+        self._done: Optional[asyncio.Event] = None
+        self._installed = False
+        self._task: Optional[asyncio.Task] = None
+
+    def install(self):
+        """Anteponerse al handler de SIGTERM de uvicorn (llamar desde el arranque del lifespan)"""
+        self.started_at = None
+        self._done = None  # cada arranque del lifespan admite un relevo nuevo
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, self._on_sigterm)
+            self._installed = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            pass  # Windows o fuera del hilo principal: solo queda el relevo del lifespan
+
+    def _on_sigterm(self):
+        if self._done is not None:
+            return  # relevo ya en marcha
+        print("🛑 [SHUTDOWN] SIGTERM recibido, iniciando relevo")
+        self._task = asyncio.get_running_loop().create_task(self._handoff_then_exit())
+
+    async def _handoff_then_exit(self):
+        try:
+            await self.handoff()
+        finally:
+            signal.raise_signal(signal.SIGINT)  # devolver el control al apagado de uvicorn
+
+    async def handoff(self):
+        """Relevo idempotente: la segunda llamada (shutdown del lifespan) espera a la primera"""
+        if self._done is not None:
+            await self._done.wait()
+            return
+        self._done = asyncio.Event()
+        self.started_at = time.monotonic()
+        try:
+            # 1. Nada nuevo: salas y sockets se rechazan desde ya
+            admission.begin_shutdown()
+
+            # 2. Dejar terminar los broadcasts en curso, con plazo
+            drained = await manager.drain(settings.SHUTDOWN_DRAIN_TIMEOUT)
+            if not drained:
+                print("⚠️ [SHUTDOWN] Plazo agotado con broadcasts todavía en curso")
+
+            # 3. Checkpoint con el estado final de las salas
+            written = await checkpoint_service.flush()
+            print(f"💾 [SHUTDOWN] Checkpoint: {written} salas guardadas")
+
+            # 4. Avisar y cerrar: cada cliente reconecta en un momento distinto
+            closed = await asyncio.gather(
+                *(self._move(ws) for ws in manager.all_sockets()),
+                *(self._move(ws, close_only=True) for ws in spectator_feed.all_sockets())
+            )
+            print(f"👋 [SHUTDOWN] {len(closed)} sockets cerrados en "
+                  f"{time.monotonic() - self.started_at:.2f}s")
+        finally:
+            self._done.set()
+
+    async def _move(self, websocket, close_only: bool = False):
+        reconnect_after_ms = random.randint(settings.SHUTDOWN_RECONNECT_MIN_MS, settings.SHUTDOWN_RECONNECT_MAX_MS)
+        try:
+            if not close_only:
+                await asyncio.wait_for(websocket.send_json({
+                    "type": "server_moving",
+                    "message": "El servidor se está reiniciando, reconectando...",
+                    "reconnect_after_ms": reconnect_after_ms
+                }), settings.HEARTBEAT_SEND_TIMEOUT)
+            await asyncio.wait_for(
+                websocket.close(code=SERVER_MOVING_CLOSE_CODE, reason=f"server moving; retry {reconnect_after_ms}ms"),
+                settings.HEARTBEAT_SEND_TIMEOUT
+            )
+        except Exception:
+            pass
+
+    def stats(self):
+        return {"sigterm_hook": self._installed, "shutting_down": self._done is not None}
+
+
+# Instancia global
+shutdown_coordinator = ShutdownCoordinator()
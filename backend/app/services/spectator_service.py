@@ -0,0 +1,133 @@
+from fastapi import WebSocket
+from typing import Dict, List, Optional
+import asyncio
+import json
+
+from app.core.config import settings
+
+# Datos que delatan al impostor o las cartas: nunca llegan a los espectadores
+SECRET_KEYS = {
+    "impostor_id", "is_impostor", "assigned_player", "assigned_players",
+    "football_players", "gameState", "answers", "player_answers", "answer_grades",
+}
+# Eventos que se acumulan (hasta un tope) en vez de quedarse solo con el último
+STACKED_TYPES = {"chat_message", "player_joined", "player_left"}
+
+
+def redact(value):
+    """Copia del mensaje sin las claves secretas, a cualquier profundidad"""
+    if isinstance(value, dict):
+        return {k: redact(v) for k, v in value.items() if k not in SECRET_KEYS}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+class SpectatorFeed:
+    """Canal de baja prioridad para espectadores de una sala.
+
+    broadcast_to_room solo deja el mensaje aquí (O(1), sin await). Cada sala con
+    espectadores tiene un flush diferido que agrupa lo acumulado en una sola
+    trama, redacta una vez, serializa una vez y la reparte. Así la entrega a los
+    jugadores no espera nunca a los espectadores, y un espectador lento solo se
+    pierde frames propios.
+    """
+
+    def __init__(self, delay: float = None, max_per_room: int = None, send_timeout: float = 2.0):
+        self.delay = delay if delay is not None else settings.SPECTATOR_DELAY
+        self.max_per_room = max_per_room or settings.SPECTATOR_MAX_PER_ROOM
+        self.send_timeout = send_timeout
+        self.spectators: Dict[str, List[WebSocket]] = {}
+        self._pending: Dict[str, Dict[str, object]] = {}  # sala -> tipo -> último mensaje (o lista)
+        self._flushes: Dict[str, asyncio.Task] = {}
+
+    def count(self, room_code: Optional[str] = None) -> int:
+        if room_code is not None:
+            return len(self.spectators.get(room_code, ()))
+        return sum(len(conns) for conns in self.spectators.values())
+
+    def all_sockets(self) -> List[WebSocket]:
+        return [ws for sockets in self.spectators.values() for ws in sockets]
+
+    async def connect(self, websocket: WebSocket, room_code: str, room_state: Optional[Dict]) -> bool:
+        await websocket.accept()
+        if self.count(room_code) >= self.max_per_room:
+            await websocket.close(code=1013, reason="Demasiados espectadores")
+            return False
+
+        self.spectators.setdefault(room_code, []).append(websocket)
+        print(f"👀 Espectador conectado en sala {room_code} ({self.count(room_code)} mirando)")
+        if room_state is not None:
+            await self._send(websocket, json.dumps({
+                "type": "room_state",
+                "spectator": True,
+                "room": redact(room_state),
+                "message": "Conectado como espectador"
+            }, separators=(",", ":")))
+        return True
+
+    def disconnect(self, websocket: WebSocket, room_code: str):
+        conns = self.spectators.get(room_code)
+        if not conns:
+            return
+        try:
+            conns.remove(websocket)
+        except ValueError:
+            pass
+        if not conns:
+            del self.spectators[room_code]
+            self._pending.pop(room_code, None)
+            flush = self._flushes.pop(room_code, None)
+            if flush:
+                flush.cancel()
+
+    def publish(self, room_code: str, message: Dict):
+        """Encolar un mensaje para los espectadores (no bloquea)"""
+        if room_code not in self.spectators:
+            return
+
+        pending = self._pending.setdefault(room_code, {})
+        msg_type = message.get("type", "unknown")
+        if msg_type in STACKED_TYPES:
+            stacked = pending.setdefault(msg_type, [])
+            stacked.append(message)
+            del stacked[:-settings.SPECTATOR_MAX_STACKED]
+        else:
+            # Del resto solo interesa el estado más reciente
+            pending.pop(msg_type, None)
+            pending[msg_type] = message
+
+        if room_code not in self._flushes:
+            self._flushes[room_code] = asyncio.create_task(self._flush_later(room_code))
+
+    async def _flush_later(self, room_code: str):
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self._flushes.pop(room_code, None)
+
+        pending = self._pending.pop(room_code, None)
+        conns = self.spectators.get(room_code)
+        if not pending or not conns:
+            return
+
+        events = []
+        for value in pending.values():
+            events.extend(value if isinstance(value, list) else [value])
+        payload = json.dumps({"type": "spectator_update", "events": redact(events)}, separators=(",", ":"))
+
+        targets = list(conns)
+        results = await asyncio.gather(*(self._send(ws, payload) for ws in targets))
+        for ws, ok in zip(targets, results):
+            if not ok:
+                self.disconnect(ws, room_code)
+
+    async def _send(self, websocket: WebSocket, payload: str) -> bool:
+        try:
+            await asyncio.wait_for(websocket.send_text(payload), self.send_timeout)
+            return True
+        except Exception:
+            return False
+
+# Instancia global
+spectator_feed = SpectatorFeed()
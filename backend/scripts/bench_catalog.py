@@ -0,0 +1,96 @@
+# backend/scripts/bench_catalog.py
+# Benchmark del catálogo de fútbol contra el mock local de TheSportsDB (sin red, reproducible).
+# Mide la carga en frío, la lectura cacheada, los arranques de partida simultáneos y la búsqueda local.
+#
+#   cd backend && python scripts/bench_catalog.py
+#   cd backend && python scripts/bench_catalog.py --latency-ms 150 --error-rate 0.2 --starts 500
+#   cd backend && python scripts/bench_catalog.py --payload-scale 10   # catálogo de miles de jugadores
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+from mock_sportsdb import MockConfig, start_mock  # noqa: E402
+
+SEARCH_QUERIES = ["madrid", "garcia", "alvaro", "centre back", "germany", "kimich", "arsenal winger", "man"]
+
+
+def _quiet():
+    return contextlib.redirect_stdout(open(os.devnull, "w"))
+
+
+async def run(args) -> dict:
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.payload_scale, seed=args.seed)
+    runner, base_url = await start_mock(config=config)
+
+    from app.services.football_api import FootballAPIService
+    from app.services.search_index import player_index
+
+    results = {}
+    try:
+        service = FootballAPIService(base_url=base_url)
+
+        started = time.perf_counter()
+        with _quiet():
+            players = await service.get_players()
+        results["carga en frío (ms)"] = (time.perf_counter() - started) * 1000
+        results["jugadores en catálogo"] = len(players)
+
+        started = time.perf_counter()
+        for _ in range(args.reads):
+            await service.get_card_indices()
+        results["lectura cacheada (op/s)"] = args.reads / (time.perf_counter() - started)
+
+        # Muchas partidas empiezan justo cuando caduca el catálogo
+        service._catalog_expires_at = 0
+        before = config.requests
+        started = time.perf_counter()
+        with _quiet():
+            await asyncio.gather(*(service.get_card_indices() for _ in range(args.starts)))
+        results[f"{args.starts} arranques simultáneos (ms)"] = (time.perf_counter() - started) * 1000
+        results["peticiones al upstream por refresco"] = config.requests - before
+
+        samples = []
+        for _ in range(args.search_rounds):
+            for query in SEARCH_QUERIES:
+                started = time.perf_counter()
+                player_index.search(query)
+                samples.append((time.perf_counter() - started) * 1e6)
+        samples.sort()
+        results["búsqueda local p50 (µs)"] = statistics.median(samples)
+        results["búsqueda local p99 (µs)"] = samples[int(len(samples) * 0.99) - 1]
+
+        results["errores del upstream"] = config.errors
+        await service.aclose()
+    finally:
+        await runner.cleanup()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del catálogo contra el mock de TheSportsDB")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--jitter-ms", type=float, default=20)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--payload-scale", type=int, default=1, help="multiplica las plantillas del mock")
+    parser.add_argument("--starts", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=10000)
+    parser.add_argument("--search-rounds", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"mock: latencia {args.latency_ms}±{args.jitter_ms} ms, errores {args.error_rate:.0%}")
+    for name, value in results.items():
+        print(f"{name:<40}{value:>14,.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+# backend/scripts/bench_hot_paths.py
+# Benchmark en proceso (sin red) de las rutas calientes: crear/unirse/consultar sala y fan-out por WebSocket.
+# Compara la app actual contra el main.py monolítico de una revisión anterior de git.
+#
+#   cd backend && python scripts/bench_hot_paths.py
+#   cd backend && python scripts/bench_hot_paths.py --baseline-ref e4cfbd4 --rooms 200
+import argparse
+import asyncio
+import contextlib
+import importlib
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+# ========== DRIVER ASGI ==========
+def _scope(kind: str, path: str, method: str = "GET") -> dict:
+    scope = {
+        "type": kind,
+        "asgi": {"version": "3.0"},
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+        "scheme": "http" if kind == "http" else "ws",
+    }
+    if kind == "http":
+        scope["method"] = method
+        scope["http_version"] = "1.1"
+    else:
+        scope["subprotocols"] = []
+    return scope
+
+
+async def http_request(app, method: str, path: str, body: dict = None):
+    payload = json.dumps(body).encode() if body is not None else b""
+    sent = False
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(_scope("http", path, method), receive, send)
+    return response["status"], json.loads(response["body"] or b"null")
+
+
+class Deliveries:
+    """Contador compartido de mensajes recibidos por los clientes falsos"""
+
+    def __init__(self):
+        self.count = 0
+        self.target = None
+        self.done = asyncio.Event()
+
+    def expect(self, target: int):
+        self.count = 0
+        self.target = target
+        self.done.clear()
+
+    def add(self):
+        self.count += 1
+        if self.target is not None and self.count >= self.target:
+            self.done.set()
+
+
+class FakeWebSocket:
+    def __init__(self, app, path: str, deliveries: Deliveries):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.accepted = asyncio.Event()
+        self.deliveries = deliveries
+        self.inbox.put_nowait({"type": "websocket.connect"})
+        self.task = asyncio.create_task(app(_scope("websocket", path), self.inbox.get, self._send))
+
+    async def _send(self, message):
+        if message["type"] == "websocket.accept":
+            self.accepted.set()
+        elif message["type"] == "websocket.send":
+            self.deliveries.add()
+
+    def send(self, data: dict):
+        self.inbox.put_nowait({"type": "websocket.receive", "text": json.dumps(data)})
+
+    async def close(self):
+        self.inbox.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(self.task, 5)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    inbox: asyncio.Queue = asyncio.Queue()
+    outbox: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(app({"type": "lifespan", "asgi": {"version": "3.0"}}, inbox.get, outbox.put))
+    await inbox.put({"type": "lifespan.startup"})
+    await outbox.get()
+    try:
+        yield
+    finally:
+        await inbox.put({"type": "lifespan.shutdown"})
+        await outbox.get()
+        await task
+
+
+# ========== ESCENARIOS ==========
+async def post_ok(app, path: str, body: dict) -> dict:
+    """POST que tiene que salir bien: una sala rechazada (p. ej. por admisión) invalida la medida"""
+    status, data = await http_request(app, "POST", path, body)
+    if status != 200:
+        raise RuntimeError(f"POST {path} -> {status}: {data}")
+    return data
+
+
+async def run_scenarios(app, rooms: int, players: int, messages: int) -> dict:
+    results = {}
+    codes = []
+
+    # Calentamiento: las primeras peticiones pagan imports y cachés internas de FastAPI
+    for i in range(10):
+        await post_ok(app, "/api/rooms/create", {"player_name": f"warmup{i}"})
+
+    started = time.perf_counter()
+    for i in range(rooms):
+        data = await post_ok(app, "/api/rooms/create", {"player_name": f"host{i}"})
+        codes.append(data["room_code"])
+    results["crear sala"] = rooms / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    player_ids = {code: [] for code in codes}
+    for code in codes:
+        for p in range(players - 1):
+            data = await post_ok(app, "/api/rooms/join", {"player_name": f"p{p}", "room_code": code})
+            player_ids[code].append(data["player_id"])
+    results["unirse a sala"] = rooms * (players - 1) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for code in codes:
+        await http_request(app, "GET", f"/api/rooms/{code}")
+    results["consultar sala"] = rooms / (time.perf_counter() - started)
+
+    deliveries = Deliveries()
+    sockets = {code: [FakeWebSocket(app, f"/api/ws/{code}", deliveries) for _ in range(players)] for code in codes}
+    for room_sockets in sockets.values():
+        for ws in room_sockets:
+            await ws.accepted.wait()
+    await asyncio.sleep(0.05)  # Dejar pasar los mensajes de bienvenida
+
+    deliveries.expect(rooms * messages * players)
+    started = time.perf_counter()
+    for _ in range(messages):
+        for code in codes:
+            sockets[code][0].send({"type": "chat_message", "player_id": "x", "player_name": "x", "message": "hola"})
+    await asyncio.wait_for(deliveries.done.wait(), 120)
+    results["chat (mensajes entregados)"] = deliveries.count / (time.perf_counter() - started)
+
+    deliveries.expect(rooms * messages * players)
+    started = time.perf_counter()
+    for m in range(messages):
+        for code in codes:
+            sockets[code][1].send({
+                "type": "player_ready", "player_id": player_ids[code][0],
+                "is_ready": m % 2 == 0, "phase": "lobby",
+            })
+    await asyncio.wait_for(deliveries.done.wait(), 120)
+    results["player_ready (mensajes entregados)"] = deliveries.count / (time.perf_counter() - started)
+
+    for room_sockets in sockets.values():
+        for ws in room_sockets:
+            await ws.close()
+
+    return results
+
+
+async def bench_app(app, args) -> dict:
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        async with lifespan(app):
+            return await run_scenarios(app, args.rooms, args.players, args.messages)
+
+
+def best_of(app, args) -> dict:
+    """Mejor resultado de varias ejecuciones por escenario (reduce el ruido de la máquina)"""
+    best = {}
+    for _ in range(args.repeat):
+        for name, value in asyncio.run(bench_app(app, args)).items():
+            best[name] = max(best.get(name, 0), value)
+    return best
+
+
+def load_baseline(ref: str):
+    """Cargar el main.py de una revisión anterior como módulo independiente"""
+    source = subprocess.run(
+        ["git", "show", f"{ref}:backend/app/main.py"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    path = os.path.join(tempfile.mkdtemp(), "baseline_main.py")
+    with open(path, "w") as f:
+        f.write(source)
+    spec = importlib.util.spec_from_file_location("baseline_main", path)
+    module = importlib.util.module_from_spec(spec)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        spec.loader.exec_module(module)
+    return module.app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de rutas calientes del backend")
+    parser.add_argument("--baseline-ref", default="e4cfbd4", help="revisión de git con el main.py a comparar ('' para omitir)")
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument("--messages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Journal e historial temporales para no tocar los datos locales
+    workdir = tempfile.mkdtemp()
+    os.environ.setdefault("CHECKPOINT_DIR", workdir)
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    # El benchmark inunda a propósito: sin límites de entrada por conexión
+    for name in ("WS_RATE_PER_SECOND", "WS_RATE_BURST", "WS_CHAT_RATE", "WS_CHAT_BURST", "WS_READY_RATE", "WS_READY_BURST"):
+        os.environ.setdefault(name, "1e9")
+    # ...ni control de admisión: el propio benchmark satura el loop y sus salas no se pueden rechazar
+    for name, value in (("ADMISSION_MAX_LOOP_LAG", "1e9"), ("ADMISSION_MAX_ROOMS", "1000000000"),
+                        ("ADMISSION_MAX_CONNECTIONS", "1000000000")):
+        os.environ.setdefault(name, value)
+
+    current = best_of(importlib.import_module("app.main").app, args)
+    baseline = best_of(load_baseline(args.baseline_ref), args) if args.baseline_ref else {}
+
+    print(f"{args.rooms} salas x {args.players} jugadores, {args.messages} mensajes por sala")
+    print(f"{'escenario':<36}{'actual (op/s)':>15}{'base (op/s)':>15}{'ratio':>8}")
+    for name, value in current.items():
+        base = baseline.get(name)
+        ratio = f"{value / base:.2f}x" if base else "-"
+        base_text = f"{base:,.0f}" if base else "-"
+        print(f"{name:<36}{value:>15,.0f}{base_text:>15}{ratio:>8}")
+
+
+if __name__ == "__main__":
+    main()
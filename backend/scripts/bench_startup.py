@@ -0,0 +1,88 @@
+# backend/scripts/bench_startup.py
+# Benchmark de arranque en frío: tiempo de import por módulo y tiempo hasta el primer /api/health
+#
+#   cd backend && python scripts/bench_startup.py --runs 5 --top 20
+#   cd backend && python scripts/bench_startup.py --serve
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times(module: str) -> dict:
+    """Importar el módulo en un proceso limpio y devolver {módulo: (self_us, cumulative_us)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def bench_imports(module: str, runs: int, top: int):
+    samples = [import_times(module) for _ in range(runs)]
+    modules = set().union(*samples)
+    cumulative = {
+        name: statistics.median(sample[name][1] for sample in samples if name in sample)
+        for name in modules
+    }
+
+    print(f"📦 Import de {module}: mediana {cumulative.get(module, 0) / 1000:.1f} ms en {runs} ejecuciones")
+    print(f"{'acumulado (ms)':>15}  módulo")
+    for name, us in sorted(cumulative.items(), key=lambda item: -item[1])[:top]:
+        print(f"{us / 1000:>15.1f}  {name}")
+
+
+def bench_serve(app: str, port: int, runs: int):
+    """Medir desde el lanzamiento de uvicorn hasta la primera respuesta de /api/health"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", app, "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+        )
+        try:
+            while True:
+                try:
+                    urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1).read()
+                    break
+                except OSError:
+                    if server.poll() is not None:
+                        raise RuntimeError("El servidor terminó antes de responder")
+                    time.sleep(0.01)
+            timings.append(time.perf_counter() - started)
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"🚀 Primer /api/health: mediana {statistics.median(timings) * 1000:.0f} ms, "
+          f"mín {min(timings) * 1000:.0f} ms ({runs} arranques)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque del backend")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--serve", action="store_true", help="medir también el tiempo hasta el primer request")
+    parser.add_argument("--port", type=int, default=18765)
+    args = parser.parse_args()
+
+    bench_imports(args.module, args.runs, args.top)
+    if args.serve:
+        bench_serve(f"{args.module}:app", args.port, args.runs)
+
+
+if __name__ == "__main__":
+    main()
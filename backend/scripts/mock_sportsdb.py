@@ -0,0 +1,208 @@
+# backend/scripts/mock_sportsdb.py
+# Servidor local que imita los endpoints de TheSportsDB que usa el backend, a partir de fixtures.
+# Sirve para medir catálogo, caché y resiliencia sin red y de forma reproducible.
+#
+#   cd backend && python scripts/mock_sportsdb.py --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.05
+#   SPORTSDB_BASE_URL=http://127.0.0.1:8765/api/v1/json uvicorn app.main:app
+#
+# Las fixtures (scripts/fixtures/sportsdb.json) tienen el formato de respuesta de TheSportsDB;
+# con --record se regeneran desde la API real para los equipos que ya contienen.
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+from aiohttp import web
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_PATH = os.path.join(BACKEND_DIR, "scripts", "fixtures", "sportsdb.json")
+REAL_BASE_URL = "https://www.thesportsdb.com/api/v1/json/1"
+
+
+class MockConfig:
+    """Comportamiento del servidor, modificable en caliente vía POST /_config"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0,
+                 payload_scale: int = 1, description_bytes: int = 0, seed: int = None):
+        self.update({
+            "latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate,
+            "payload_scale": payload_scale, "description_bytes": description_bytes,
+        })
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+    FIELDS = {"latency_ms": float, "jitter_ms": float, "error_rate": float, "payload_scale": int, "description_bytes": int}
+
+    def update(self, values: dict):
+        for name, cast in self.FIELDS.items():
+            if name in values:
+                setattr(self, name, cast(values[name]))
+
+    def to_dict(self) -> dict:
+        return {
+            "latency_ms": self.latency_ms, "jitter_ms": self.jitter_ms, "error_rate": self.error_rate,
+            "payload_scale": self.payload_scale, "description_bytes": self.description_bytes,
+            "requests": self.requests, "errors": self.errors,
+        }
+
+
+def _matches(value: str, query: str) -> bool:
+    return query.lower() in (value or "").lower()
+
+
+class MockSportsDB:
+    def __init__(self, fixtures: dict, config: MockConfig):
+        self.config = config
+        self.teams = fixtures["teams"]
+        self.players = fixtures["players"]  # idTeam -> plantilla
+
+    def _scaled(self, players: list) -> list:
+        """Inflar la respuesta: más jugadores (ids derivados) y descripciones más largas"""
+        cfg = self.config
+        if cfg.payload_scale <= 1 and not cfg.description_bytes:
+            return players
+
+        result = []
+        for copy in range(max(1, cfg.payload_scale)):
+            for player in players:
+                item = dict(player)
+                if copy:
+                    item["idPlayer"] = f"{player['idPlayer']}{copy:02d}"
+                    item["strPlayer"] = f"{player['strPlayer']} {copy + 1}"
+                if cfg.description_bytes:
+                    text = item.get("strDescriptionEN") or ""
+                    item["strDescriptionEN"] = (text + " ") * (cfg.description_bytes // max(1, len(text) + 1) + 1)
+                result.append(item)
+        return result
+
+    # ========== ENDPOINTS DE TheSportsDB ==========
+    def lookup_all_players(self, query) -> dict:
+        roster = self.players.get(query.get("id", ""))
+        return {"player": self._scaled(roster) if roster else None}
+
+    def search_teams(self, query) -> dict:
+        name = query.get("t", "")
+        teams = [team for team in self.teams if _matches(team["strTeam"], name)]
+        return {"teams": teams or None}
+
+    def search_all_teams(self, query) -> dict:
+        league = query.get("l", "")
+        teams = [team for team in self.teams if (team["strLeague"] or "").lower() == league.lower()]
+        return {"teams": teams or None}
+
+    def search_players(self, query) -> dict:
+        name = query.get("p", "")
+        found = [p for roster in self.players.values() for p in roster if _matches(p["strPlayer"], name)]
+        return {"player": self._scaled(found) if found else None}
+
+    def lookup_player(self, query) -> dict:
+        player_id = query.get("id", "")
+        found = [p for roster in self.players.values() for p in self._scaled(roster) if p["idPlayer"] == player_id]
+        return {"players": found[:1] or None}
+
+    # ========== SERVIDOR ==========
+    async def handle(self, request: web.Request) -> web.Response:
+        cfg = self.config
+        cfg.requests += 1
+
+        delay = cfg.latency_ms + cfg.rng.uniform(-cfg.jitter_ms, cfg.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if cfg.rng.random() < cfg.error_rate:
+            cfg.errors += 1
+            return web.json_response({"error": "mock upstream error"}, status=cfg.rng.choice([500, 502, 503]))
+
+        handler = {
+            "lookup_all_players.php": self.lookup_all_players,
+            "searchteams.php": self.search_teams,
+            "search_all_teams.php": self.search_all_teams,
+            "searchplayers.php": self.search_players,
+            "lookupplayer.php": self.lookup_player,
+        }.get(request.match_info["endpoint"])
+        if handler is None:
+            return web.json_response({"error": "endpoint no soportado"}, status=404)
+        return web.json_response(handler(request.query))
+
+    async def get_config(self, request: web.Request) -> web.Response:
+        return web.json_response(self.config.to_dict())
+
+    async def set_config(self, request: web.Request) -> web.Response:
+        self.config.update(await request.json())
+        return web.json_response(self.config.to_dict())
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v1/json/{api_key}/{endpoint}", self.handle)
+        app.router.add_get("/_config", self.get_config)
+        app.router.add_post("/_config", self.set_config)
+        return app
+
+
+def load_fixtures(path: str = FIXTURES_PATH) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+async def start_mock(port: int = 0, config: MockConfig = None, host: str = "127.0.0.1"):
+    """Arrancar el mock dentro del loop actual; devuelve (runner, base_url) para SPORTSDB_BASE_URL"""
+    mock = MockSportsDB(load_fixtures(), config or MockConfig())
+    runner = web.AppRunner(mock.app(), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}/api/v1/json"
+
+
+def record(path: str = FIXTURES_PATH):
+    """Regenerar las fixtures desde TheSportsDB real (equipos y plantillas ya presentes)"""
+    import urllib.request
+
+    def fetch(endpoint: str) -> dict:
+        with urllib.request.urlopen(f"{REAL_BASE_URL}/{endpoint}", timeout=15) as response:
+            return json.load(response)
+
+    fixtures = load_fixtures(path)
+    for team in fixtures["teams"]:
+        found = (fetch(f"searchteams.php?t={team['strTeam']}").get("teams") or [None])[0]
+        if found:
+            team.update(found)
+        roster = fetch(f"lookup_all_players.php?id={team['idTeam']}").get("player")
+        if roster:
+            fixtures["players"][team["idTeam"]] = roster
+        print(f"📼 {team['strTeam']}: {len(fixtures['players'].get(team['idTeam']) or [])} jugadores")
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixtures, f, ensure_ascii=False, indent=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock local de TheSportsDB")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0, help="fracción de respuestas 5xx (0-1)")
+    parser.add_argument("--payload-scale", type=int, default=1, help="multiplica el número de jugadores por respuesta")
+    parser.add_argument("--description-bytes", type=int, default=0, help="tamaño mínimo de strDescriptionEN")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--record", action="store_true", help="regenerar fixtures desde la API real y salir")
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+        return
+
+    config = MockConfig(args.latency_ms, args.jitter_ms, args.error_rate,
+                        args.payload_scale, args.description_bytes, args.seed)
+    mock = MockSportsDB(load_fixtures(), config)
+    print(f"🧪 Mock de TheSportsDB en http://{args.host}:{args.port}/api/v1/json ({len(mock.teams)} equipos)",
+          file=sys.stderr)
+    web.run_app(mock.app(), host=args.host, port=args.port, access_log=None, print=None)
+
+
+if __name__ == "__main__":
+    main()
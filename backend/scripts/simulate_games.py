@@ -0,0 +1,306 @@
+# backend/scripts/simulate_games.py
+# Simulador sin cabeza: bots que juegan partidas completas contra GameService (y su motor de reglas), sin sockets.
+# Sirve de benchmark de CPU del núcleo del juego y de datos de balance (quién gana según sala y rondas).
+#
+#   cd backend && python scripts/simulate_games.py
+#   cd backend && python scripts/simulate_games.py --games 20000 --sizes 4,6,8,10,15 --rounds 3,5 --strategy analysis
+#   cd backend && python scripts/simulate_games.py --timers   # fases con sus timers reales sobre un VirtualClock
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+STRATEGIES = ("random", "analysis")
+
+
+def _quiet():
+    return contextlib.redirect_stdout(open(os.devnull, "w"))
+
+
+# ========== BOTS ==========
+class Bots:
+    """Decisiones de los bots de una partida.
+
+    Los honestos responden con el dato real de su carta y el impostor con el de
+    una carta al azar del catálogo. Con `random` se vota a cualquiera; con
+    `analysis` los honestos votan a la respuesta más atípica de la ronda.
+    """
+
+    def __init__(self, strategy: str, rng: random.Random):
+        from app.services.answer_analysis import analyze_round
+        from app.services.football_api import football_service
+        from app.services.question_service import question_bank
+
+        self.strategy = strategy
+        self.rng = rng
+        self.analyze_round = analyze_round
+        self.question_bank = question_bank
+        self.catalog = football_service._catalog
+
+    def answer(self, card, attribute: str, is_impostor: bool) -> str:
+        if is_impostor or card is None:
+            card = self.rng.choice(self.catalog)
+        return self.question_bank.answer_for(card, attribute)
+
+    def votes(self, alive, impostor_id: str, answers) -> dict:
+        suspect = None
+        if self.strategy == "analysis":
+            analysis = self.analyze_round(answers)
+            suspect = analysis["outlier"] if analysis else None
+
+        votes = {}
+        for voter in alive:
+            candidates = [pid for pid in alive if pid != voter]
+            if suspect and voter != impostor_id and suspect != voter:
+                votes[voter] = suspect
+            else:
+                votes[voter] = self.rng.choice(candidates)
+        return votes
+
+
+# ========== PARTIDA ==========
+async def _create_room(code: str, size: int, total_rounds: int, seed: int):
+    """Sala con `size` bots; None si dos bots salieron con el mismo id (ids aleatorios de 4 cifras)"""
+    from app.core.dealing import CardDealer
+    from app.models.room import RoomCreate
+    from app.services.game_service import game_service
+    from app.services.room_service import room_service
+
+    room = await room_service.create_room(code, RoomCreate(player_name="bot0", total_rounds=total_rounds))
+    for i in range(1, size):
+        await room_service.add_player(code, f"bot{i}")
+    game_service.dealers[code] = CardDealer(seed=seed)
+    return room if len({p.id for p in room.players}) == size else None
+
+
+async def _answer_round(code: str, bots: Bots) -> list:
+    from app.services.game_service import game_service
+
+    state = game_service.engines[code]
+    question = game_service.current_question(code)
+    events = []
+    for pid in state.players:
+        if pid in state.alive:
+            answer = bots.answer(state.cards.get(pid), question["attribute"], pid == state.impostor_id)
+            events += (await game_service.submit_answer(code, pid, None, answer))[0]
+    return events
+
+
+async def _vote_round(code: str, bots: Bots) -> list:
+    from app.services.game_service import game_service
+
+    state = game_service.engines[code]
+    alive = [pid for pid in state.players if pid in state.alive]
+    events = []
+    for voter, voted in bots.votes(alive, state.impostor_id, game_service.round_answers(code)).items():
+        events += await game_service.cast_vote(code, voter, voted)
+    return events
+
+
+async def _ready_round(code: str) -> list:
+    from app.services.game_service import game_service
+
+    state = game_service.engines[code]
+    events = []
+    for pid in state.players:
+        if pid in state.alive:
+            events += await game_service.mark_player_ready(code, pid, state.phase)
+    return events
+
+
+async def play_game(code: str, size: int, total_rounds: int, bots: Bots, seed: int):
+    """Una partida completa; devuelve (ganador, rondas jugadas) o None si la sala salió inválida.
+
+    Como los clientes: responden en question, votan en voting (con todos los votos
+    el motor pasa solo a results) y en el resto de fases pulsan "listo".
+    """
+    from app.services.game_service import game_service
+    from app.services.room_service import room_service
+
+    room = await _create_room(code, size, total_rounds, seed)
+    try:
+        if room is None:
+            return None
+
+        await game_service.start_game(code)
+        while game_service.engines[code].phase != "finished":
+            phase = game_service.engines[code].phase
+            if phase == "question":
+                await _answer_round(code, bots)
+            if phase == "voting":
+                await _vote_round(code, bots)
+            else:
+                await _ready_round(code)
+
+        state = game_service.engines[code]
+        return state.winner, state.round
+    finally:
+        room_service.remove_room(code)
+        game_service.remove_room(code)
+
+
+async def play_timed_game(code: str, size: int, total_rounds: int, bots: Bots, seed: int):
+    """Como play_game, pero nadie pulsa "listo": las fases las cierran los timers de PhaseManager sobre un VirtualClock"""
+    from app.services.game_service import game_service
+    from app.services.phase_service import phase_manager
+    from app.services.room_service import room_service
+
+    clock = phase_manager.clock
+    room = await _create_room(code, size, total_rounds, seed)
+    try:
+        if room is None:
+            return None
+
+        await phase_manager.begin_game(code)
+        done = set()
+        while game_service.engines[code].phase != "finished":
+            state = game_service.engines[code]
+            step = (state.phase, state.round)
+            if step not in done and step[0] in ("question", "voting"):
+                done.add(step)
+                events = await (_answer_round if step[0] == "question" else _vote_round)(code, bots)
+                await phase_manager.publish(code, events)
+            elif not await clock.advance():
+                raise RuntimeError(f"Partida {code} parada en {state.phase} sin timers pendientes")
+
+        state = game_service.engines[code]
+        return state.winner, state.round
+    finally:
+        phase_manager.cancel(code)
+        room_service.remove_room(code)
+        game_service.remove_room(code)
+
+
+PLAYERS = {"service": play_game, "timers": play_timed_game}
+
+
+async def _run_games(jobs, strategy: str, seed: int, mode: str = "service"):
+    from app.services.checkpoint_service import checkpoint_service
+
+    rng = random.Random(seed)
+    random.seed(seed)
+    bots = Bots(strategy, rng)
+    play = PLAYERS[mode]
+    if mode == "timers":
+        from app.core.clock import VirtualClock
+        from app.services.phase_service import phase_manager
+
+        phase_manager.use_clock(VirtualClock())
+    results = defaultdict(lambda: [0, 0, 0, 0])  # (tamaño, rondas) -> [partidas, gana impostor, rondas, inválidas]
+    for n, (size, total_rounds) in enumerate(jobs):
+        outcome = await play(f"SIM{seed}-{n}", size, total_rounds, bots, rng.getrandbits(32))
+        row = results[(size, total_rounds)]
+        if outcome is None:
+            row[3] += 1
+            continue
+        winner, rounds_played = outcome
+        row[0] += 1
+        row[1] += winner == "impostor"
+        row[2] += rounds_played
+    checkpoint_service._dirty.clear()  # sin journal: no hay nadie que lo vacíe
+    return dict(results)
+
+
+def _load_catalog():
+    """Catálogo de respaldo en memoria: nada de red ni de base de datos"""
+    from app.services.football_api import football_service
+
+    football_service._set_catalog(football_service._get_fallback_players(), float("inf"))
+
+
+def run_batch(args) -> dict:
+    """Punto de entrada de cada proceso del pool"""
+    jobs, strategy, seed, mode = args
+    with _quiet():
+        _load_catalog()
+        return asyncio.run(_run_games(jobs, strategy, seed, mode))
+
+
+def measure_allocations(jobs, strategy: str, seed: int, mode: str = "service") -> dict:
+    """Memoria asignada por partida (tracemalloc) en este proceso, con una muestra pequeña"""
+    with _quiet():
+        _load_catalog()
+        asyncio.run(_run_games(jobs[:20], strategy, seed, mode))  # calentar imports y cachés
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        blocks_before = sys.getallocatedblocks()
+        asyncio.run(_run_games(jobs, strategy, seed + 1, mode))
+        blocks_after = sys.getallocatedblocks()
+        after = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, "lineno")
+    allocated = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+    return {
+        "bloques asignados netos/partida": allocated / len(jobs),
+        "bloques retenidos/partida": (blocks_after - blocks_before) / len(jobs),
+        "pico de memoria (KiB)": peak / 1024,
+    }
+
+
+# ========== INFORME ==========
+def main():
+    parser = argparse.ArgumentParser(description="Simulador de partidas para benchmark y balance")
+    parser.add_argument("--games", type=int, default=5000)
+    parser.add_argument("--sizes", default="4,6,8,10", help="tamaños de sala separados por comas")
+    parser.add_argument("--rounds", default="3,5", help="valores de total_rounds separados por comas")
+    parser.add_argument("--strategy", choices=STRATEGIES, default="random")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=250, help="partidas por tarea del pool")
+    parser.add_argument("--alloc-sample", type=int, default=200, help="partidas medidas con tracemalloc (0 = no medir)")
+    parser.add_argument("--timers", action="store_true", help="mover las fases con PhaseManager y un VirtualClock")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    mode = "timers" if args.timers else "service"
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    rounds = [int(r) for r in args.rounds.split(",")]
+    combos = [(size, r) for size in sizes for r in rounds]
+    jobs = [combos[i % len(combos)] for i in range(args.games)]
+    chunks = [(jobs[i:i + args.chunk], args.strategy, args.seed + i, mode)
+              for i in range(0, len(jobs), args.chunk)]
+
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for partial in pool.map(run_batch, chunks):
+            for key, row in partial.items():
+                totals[key] = [a + b for a, b in zip(totals[key], row)]
+    elapsed = time.perf_counter() - started
+
+    played = sum(row[0] for row in totals.values())
+    print(f"estrategia {args.strategy}, {args.workers} procesos, modo {mode}")
+    print(f"{'partidas jugadas':<34}{played:>12,}")
+    print(f"{'partidas/s':<34}{played / elapsed:>12,.0f}")
+    print(f"{'partidas/s por proceso':<34}{played / elapsed / args.workers:>12,.0f}")
+    invalid = sum(row[3] for row in totals.values())
+    if invalid:
+        print(f"{'descartadas (ids repetidos)':<34}{invalid:>12,}")
+
+    if args.alloc_sample:
+        sample = [combos[i % len(combos)] for i in range(args.alloc_sample)]
+        for name, value in measure_allocations(sample, args.strategy, args.seed, mode).items():
+            print(f"{name:<34}{value:>12,.1f}")
+
+    print()
+    print(f"{'jugadores':>9} {'rondas':>6} {'partidas':>9} {'gana impostor':>14} {'gana grupo':>11} {'rondas medias':>14}")
+    for (size, total_rounds), (games, impostor_wins, rounds_played, _) in sorted(totals.items()):
+        if not games:
+            continue
+        print(f"{size:>9} {total_rounds:>6} {games:>9,} {impostor_wins / games:>14.1%} "
+              f"{1 - impostor_wins / games:>11.1%} {rounds_played / games:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,7 @@ export const useWebSocket = (roomCode: string | null): WebSocketHook => {
   const reconnectTimeoutRef = useRef<number | null>(null);
   const messageQueueRef = useRef<WebSocketMessage[]>([]);
   const reconnectAttemptsRef = useRef(0);
+  const reconnectHintRef = useRef<number | null>(null); // retraso pedido por el servidor al reiniciarse
   const maxReconnectAttempts = 5;
 
   const getWebSocketUrl = useCallback((roomCode: string) => {
@@ -126,6 +127,17 @@ export const useWebSocket = (roomCode: string | null): WebSocketHook => {
               }]);
               break;
               
+            case 'ping':
+              // Latido del servidor: sin respuesta, cierra el socket por muerto
+              ws.send(JSON.stringify({ type: 'pong', t: data.t }));
+              break;
+
+            case 'server_moving':
+              // El servidor se reinicia: reconectar tras el retraso que nos asigna (distinto por cliente)
+              console.log('🚚 Servidor reiniciándose, reconexión en', data.reconnect_after_ms, 'ms');
+              reconnectHintRef.current = data.reconnect_after_ms ?? null;
+              break;
+
             case 'error':
               console.error('❌ Error del servidor:', data.message);
               break;
@@ -143,8 +155,14 @@ export const useWebSocket = (roomCode: string | null): WebSocketHook => {
         setIsConnected(false);
         setConnectionStatus('disconnected');
         
+        // 1012 = reinicio del servidor: no cuenta como intento fallido
+        if (event.code === 1012) {
+          reconnectAttemptsRef.current = 0;
+        }
+
         if (event.code !== 1000 && roomCode && reconnectAttemptsRef.current < maxReconnectAttempts) {
-          const delay = Math.min(3000 * (reconnectAttemptsRef.current + 1), 15000);
+          const delay = reconnectHintRef.current ?? Math.min(3000 * (reconnectAttemptsRef.current + 1), 15000);
+          reconnectHintRef.current = null;
           reconnectAttemptsRef.current++;
           
           console.log(`🔄 Intentando reconexión ${reconnectAttemptsRef.current}/${maxReconnectAttempts} en ${delay}ms...`);
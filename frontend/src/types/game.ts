@@ -5,6 +5,7 @@ export interface Player {
     is_alive: boolean;
     is_impostor: boolean;
     is_ready: boolean;
+    is_connected?: boolean;
     assigned_player?: FootballPlayer;
 }
 